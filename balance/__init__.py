@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""성경 인물 MBTI 질문 세트 균형 분석 도구 (manual_biblical_balance.py 보조 모듈)"""
@@ -0,0 +1,5 @@
+import sys
+
+from balance.cli import main
+
+sys.exit(main())
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""판정이 통계적으로 확정될 때까지 청크 단위로 시행을 늘리는 적응형 시뮬레이션
+
+main 의 표와 같은 판정을 캐릭터별 신뢰구간으로 내린다.
+- 타겟 캐릭터: 비율 >= TARGET_MIN_PERCENT 이면 ✅, 아니면 ❌
+- 나머지: REASONABLE_PERCENT 범위 안이면 ✅, 밖이면 🔶
+신뢰구간이 기준선을 걸치지 않으면 그 판정은 확정이다.
+
+중간에 여러 번 들여다보므로 k 번째 확인에는 alpha * 6 / (pi^2 k^2) 만 쓰고
+캐릭터 수로 다시 나눈다(본페로니). 전체 오판 확률은 alpha 이하로 유지된다.
+확인 시점은 initial_trials 부터 growth 배씩 늘어난다.
+"""
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from balance.engine import compile_questions, simulate
+from manual_biblical_balance import REASONABLE_PERCENT, TARGET_CHARS, TARGET_MIN_PERCENT
+
+INITIAL_TRIALS = 1 << 14
+MAX_TRIALS = 1 << 26
+ALPHA = 0.05
+
+
+class Decision:
+    """캐릭터 하나의 판정 상태"""
+
+    def __init__(self, character, target, low, high, count, trials):
+        self.character = character
+        self.target = target
+        self.low = low    # 신뢰구간 하한 (비율)
+        self.high = high  # 신뢰구간 상한 (비율)
+        self.count = count
+        self.trials = trials
+        self.thresholds = _thresholds(target)
+
+    @property
+    def rate(self):
+        return self.count / self.trials if self.trials else 0.0
+
+    @property
+    def settled(self):
+        """신뢰구간이 어떤 기준선도 걸치지 않으면 확정"""
+        return not any(self.low < t < self.high for t in self.thresholds)
+
+    @property
+    def status(self):
+        percentage = self.rate * 100
+        if self.target:
+            return "✅" if percentage >= TARGET_MIN_PERCENT else "❌"
+        low, high = REASONABLE_PERCENT
+        return "✅" if low <= percentage <= high else "🔶"
+
+
+class AdaptiveResult:
+    """적응형 시뮬레이션 결과"""
+
+    def __init__(self, characters, counts, trials, decisions, looks, settled):
+        self.characters = characters
+        self.counts = counts
+        self.trials = trials
+        self.decisions = decisions
+        self.looks = looks
+        self.settled = settled
+
+    @property
+    def max_half_width(self):
+        """가장 넓은 신뢰구간의 반폭 (비율)"""
+        return max(((d.high - d.low) / 2 for d in self.decisions), default=0.0)
+
+
+def _thresholds(target):
+    if target:
+        return (TARGET_MIN_PERCENT / 100,)
+    low, high = REASONABLE_PERCENT
+    return (low / 100, high / 100)
+
+
+def wilson_interval(count, trials, z):
+    """윌슨 점수 구간 (하한, 상한), count 가 배열이면 칸마다 구간 배열"""
+    count = np.asarray(count, dtype=np.float64)
+    if trials == 0:
+        return np.zeros_like(count)[()], np.ones_like(count)[()]
+    p = count / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z / denom * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials))
+    return np.clip(center - half, 0.0, 1.0)[()], np.clip(center + half, 0.0, 1.0)[()]
+
+
+def look_z(look, num_characters, alpha=ALPHA):
+    """k 번째 확인에 쓸 양측 z 값"""
+    spent = alpha * 6 / (math.pi ** 2 * look * look) / max(num_characters, 1)
+    return NormalDist().inv_cdf(1 - spent / 2)
+
+
+def decide(characters, counts, trials, z, targets=TARGET_CHARS):
+    """현재 카운트로 캐릭터별 판정 목록"""
+    decisions = []
+    for character, count in zip(characters, counts):
+        low, high = wilson_interval(int(count), trials, z)
+        decisions.append(Decision(character, character in targets, low, high, int(count), trials))
+    return decisions
+
+
+def simulate_until_settled(compiled, seed=None, initial_trials=INITIAL_TRIALS, max_trials=MAX_TRIALS,
+                           growth=2, alpha=ALPHA, targets=TARGET_CHARS):
+    """모든 판정이 확정되거나 max_trials 에 닿을 때까지 시뮬레이션"""
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(compiled.num_characters, dtype=np.int64)
+    trials = 0
+    look = 0
+    goal = initial_trials
+    while True:
+        n = min(goal, max_trials) - trials
+        counts += simulate(compiled, n, rng)
+        trials += n
+        look += 1
+
+        z = look_z(look, compiled.num_characters, alpha)
+        decisions = decide(compiled.characters, counts, trials, z, targets)
+        settled = all(d.settled for d in decisions)
+        if settled or trials >= max_trials:
+            return AdaptiveResult(compiled.characters, counts, trials, decisions, look, settled)
+        goal = int(math.ceil(trials * growth))
+
+
+def print_report(result):
+    """main 과 같은 형식의 표에 신뢰구간을 덧붙여 출력"""
+    state = "확정" if result.settled else "상한 도달"
+    print(f"\n📊 적응형 시뮬레이션 ({result.trials:,}번 테스트, {result.looks}회 확인, {state}):")
+    print(f"{'캐릭터':^15} | {'매칭수':^9} | {'비율(%)':^8} | {'신뢰구간(%)':^17} | {'목표달성':^8}")
+    print("-" * 75)
+    for d in sorted(result.decisions, key=lambda d: d.count, reverse=True):
+        interval = f"{d.low * 100:.2f} ~ {d.high * 100:.2f}"
+        mark = d.status if d.settled else d.status + "?"
+        print(f"{d.character:^15} | {d.count:^9} | {d.rate * 100:^8.2f} | {interval:^17} | {mark:^8}")
+    print(f"\n📏 최대 신뢰구간 반폭: ±{result.max_half_width * 100:.3f}%p")
+
+
+def main():
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    compiled = compile_questions(create_biblically_balanced_questions())
+    print_report(simulate_until_settled(compiled))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""밸런스 엔진 벤치마크
+
+기준선인 test_balanced_distribution(파이썬 루프)과 numpy/스트리밍/병렬 엔진을
+배포용 20문항 세트와 합성 대형 세트(기본 200문항 × 100명)에서 돌려 초당 시행 수와
+메모리 최고치를 잰다. exact 모드는 배포 세트 앞쪽 EXACT_QUESTIONS 문항의 벽시계 시간을 잰다.
+
+결과를 JSON 으로 저장해 두고 --baseline 으로 비교하면 허용 오차보다 느려진 항목이 있을 때
+종료 코드 1 로 실패한다.
+
+    python -m balance.benchmark --save bench.json
+    python -m balance.benchmark --baseline bench.json
+"""
+
+import random
+import time
+import tracemalloc
+
+SYNTHETIC_SHAPE = (200, 100)  # (질문 수, 캐릭터 수)
+EXACT_QUESTIONS = 12          # exact 벤치마크에 쓰는 앞쪽 문항 수 (4^12 경로)
+TOLERANCE = 0.2               # 기준선 대비 허용 성능 저하 비율
+
+# 엔진별 (배포 세트 시행 수, 합성 세트 시행 수)
+TRIALS = {
+    "python": (20000, 2000),
+    "numpy": (1 << 20, 1 << 17),
+    "streaming": (1 << 20, 1 << 17),
+    "parallel": (1 << 22, 1 << 18),
+}
+
+
+def synthetic_questions(num_questions, num_characters, seed=0, options=4, per_option=5, score_range=(1, 5)):
+    """같은 seed 면 항상 같은 합성 질문 세트"""
+    rng = random.Random(seed)
+    characters = [f"c{i}" for i in range(num_characters)]
+    questions = []
+    for qi in range(num_questions):
+        question = {"id": qi + 1, "text": f"합성 질문 {qi + 1}", "options": []}
+        for oi in range(options):
+            picked = rng.sample(characters, min(per_option, num_characters))
+            scores = {c: rng.randint(*score_range) for c in picked}
+            question["options"].append({"text": f"선택지 {oi + 1}", "scores": scores})
+        questions.append(question)
+    return questions
+
+
+def _runner(engine, questions, workers):
+    """엔진별로 (trials, seed) 를 받아 한 번 실행하는 함수"""
+    if engine == "python":
+        from manual_biblical_balance import test_balanced_distribution
+        return lambda trials, seed: test_balanced_distribution(questions, trials)
+
+    import numpy as np
+    from balance.engine import compile_questions, simulate
+    compiled = compile_questions(questions)
+    if engine == "numpy":
+        return lambda trials, seed: simulate(compiled, trials, np.random.default_rng(seed))
+    if engine == "streaming":
+        from balance.streaming import simulate_streaming
+        return lambda trials, seed: simulate_streaming(compiled, trials, seed)
+    if engine == "parallel":
+        from balance.parallel import simulate_sharded
+        return lambda trials, seed: simulate_sharded(compiled, trials, seed, workers)
+    raise ValueError(f"알 수 없는 엔진: {engine}")
+
+
+def _measure(run, trials, track_memory):
+    """(초당 시행 수, 메모리 최고치 바이트) 측정, 메모리는 따로 한 번 더 돌려 잰다"""
+    run(min(trials, 1000), 0)  # 워밍업
+    start = time.perf_counter()
+    run(trials, 1)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            run(min(trials, 1 << 16), 2)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return trials / elapsed, peak
+
+
+def run_benchmarks(engines=tuple(TRIALS), synthetic_shape=SYNTHETIC_SHAPE, exact_questions=EXACT_QUESTIONS,
+                   workers=None, scale=1.0, progress=None):
+    """벤치마크 결과 {항목 이름: {지표: 값}}
+
+    scale 로 시행 수를 일괄 조정한다 (빠른 확인용 0.1 등).
+    """
+    from balance.data import load_questions
+
+    sets = {"shipped": load_questions()}
+    if synthetic_shape:
+        sets["synthetic{}x{}".format(*synthetic_shape)] = synthetic_questions(*synthetic_shape)
+
+    results = {}
+    for set_index, (set_name, questions) in enumerate(sets.items()):
+        for engine in engines:
+            name = f"{engine}/{set_name}"
+            if progress:
+                progress(name)
+            trials = max(1000, int(TRIALS[engine][set_index] * scale))
+            run = _runner(engine, questions, workers)
+            rate, peak = _measure(run, trials, track_memory=engine != "parallel")
+            results[name] = {"trials": trials, "trials_per_second": rate, "peak_bytes": peak}
+
+    if exact_questions:
+        from balance.engine import compile_questions
+        from balance.exact import exact_counts
+        name = f"exact/shipped[:{exact_questions}]"
+        if progress:
+            progress(name)
+        compiled = compile_questions(sets["shipped"][:exact_questions])
+        start = time.perf_counter()
+        _, paths = exact_counts(compiled, workers or 1)
+        wall = time.perf_counter() - start
+        results[name] = {"paths": paths, "wall_seconds": wall, "paths_per_second": paths / wall}
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """기준선보다 tolerance 이상 나빠진 항목 목록 [(항목, 지표, 기준값, 현재값)]"""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, higher_is_better in (("trials_per_second", True), ("paths_per_second", True),
+                                         ("wall_seconds", False), ("peak_bytes", False)):
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            worse = new < old * (1 - tolerance) if higher_is_better else new > old * (1 + tolerance)
+            if worse:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"\n{'항목':^32} | {'처리량(/초)':^14} | {'메모리':^10} | {'기준선 대비':^10}")
+    print("-" * 76)
+    for name, m in results.items():
+        rate = m.get("trials_per_second", m.get("paths_per_second"))
+        memory = "-" if m.get("peak_bytes") is None else f"{m['peak_bytes'] / (1 << 20):.1f}MB"
+        change = "-"
+        base = (baseline or {}).get(name)
+        if base:
+            old = base.get("trials_per_second", base.get("paths_per_second"))
+            if old:
+                change = f"{(rate / old - 1) * 100:+.1f}%"
+        print(f"{name:^32} | {rate:^14,.0f} | {memory:^10} | {change:^10}")
+        if "wall_seconds" in m:
+            print(f"{'':^32}   ⏱️  {m['paths']:,} 경로, {m['wall_seconds']:.2f}초")
+
+
+def main(argv=None):
+    import argparse
+    from balance.data import load_json, save_json
+
+    parser = argparse.ArgumentParser(prog="python -m balance.benchmark", description="밸런스 엔진 벤치마크")
+    parser.add_argument("--engines", default=",".join(TRIALS), help="쉼표로 구분한 엔진 목록")
+    parser.add_argument("--scale", type=float, default=1.0, help="시행 수 배율")
+    parser.add_argument("--workers", type=int, help="parallel/exact 프로세스 수")
+    parser.add_argument("--no-synthetic", action="store_true", help="합성 대형 세트 생략")
+    parser.add_argument("--exact-questions", type=int, default=EXACT_QUESTIONS, help="0 이면 exact 생략")
+    parser.add_argument("--save", help="결과를 기준선 JSON 으로 저장")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        engines=[e for e in args.engines.split(",") if e],
+        synthetic_shape=None if args.no_synthetic else SYNTHETIC_SHAPE,
+        exact_questions=args.exact_questions, workers=args.workers, scale=args.scale,
+        progress=lambda name: print(f"⏳ {name}", flush=True),
+    )
+    baseline = load_json(args.baseline) if args.baseline else None
+    print_results(results, baseline)
+    if args.save:
+        save_json(results, args.save)
+        print(f"\n💾 기준선 저장: {args.save}")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 성능 저하 {len(regressions)}건 (허용 {args.tolerance * 100:.0f}%):")
+            for name, metric, old, new in regressions:
+                print(f"  {name} {metric}: {old:,.0f} → {new:,.0f}")
+            return 1
+        print("\n✅ 기준선 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""질문 세트 내용 해시로 찾는 디스크 결과 캐시
+
+CI 와 리뷰에서 바뀌지 않은 질문 파일로 같은 계산을 반복하지 않도록, 결과를
+(질문 세트, 응답자 모델, 엔진, seed, 시행 수, 채점 규칙 버전) 의 정규화 해시로 저장한다.
+
+- 질문 세트는 결과에 영향을 주는 것만 해시한다: 질문 id 와 선택지별 (캐릭터, 점수) 목록.
+  동점 규칙이 점수 딕셔너리 순서에 달려 있으므로 scores 는 정렬하지 않고 순서를 그대로 둔다.
+  질문/선택지 문구만 고친 경우에는 캐시가 그대로 맞는다.
+- 엔트리 하나가 파일 하나 (<해시>.json) 이고 임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 저장한다.
+- 읽을 때 파일 수정 시각을 갱신하고, 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 것부터 지운다 (LRU).
+- 채점 규칙(엔진의 승자 판정, 동점 규칙, 난수 스트림 등)이 바뀌면 SCORING_VERSION 을 올린다.
+  키가 달라져 이전 결과는 맞지 않고, prune() 이 이전 버전 파일을 지운다.
+
+seed 가 없는 시뮬레이션은 재현되지 않으므로 캐시하지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from balance.data import ROOT
+
+SCORING_VERSION = 1
+CACHE_DIR = os.environ.get("BALANCE_CACHE_DIR") or os.path.join(ROOT, ".balance_cache")
+MAX_BYTES = 64 << 20  # 캐시 디렉터리 크기 상한
+
+
+def canonical_questions(questions):
+    """결과에 영향을 주는 부분만 남긴 질문 세트 (점수 순서 유지)"""
+    return [{"id": q.get('id', i + 1),
+             "options": [[[c, v] for c, v in option['scores'].items()] for option in q['options']]}
+            for i, q in enumerate(questions)]
+
+
+def digest(value):
+    """JSON 정규화 후 sha256 (딕셔너리 키는 정렬, 목록 순서는 유지)"""
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def cache_key(kind, questions, **params):
+    """캐시 키 딕셔너리, params 는 engine/seed/trials/model 등 JSON 으로 쓸 수 있는 값"""
+    return {
+        "kind": kind,
+        "version": SCORING_VERSION,
+        "questions": digest(canonical_questions(questions)),
+        **params,
+    }
+
+
+class ResultCache:
+    """디렉터리 하나에 엔트리를 파일로 두는 LRU 캐시"""
+
+    def __init__(self, path=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, key):
+        return os.path.join(self.path, digest(key) + ".json")
+
+    def get(self, key):
+        """키에 맞는 결과, 없으면 None"""
+        path = self._file(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if entry.get("key") != key:  # 해시 충돌이나 손상된 파일
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU 순서 갱신
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["result"]
+
+    def put(self, key, result):
+        """결과 저장 후 크기 상한을 넘으면 오래 안 쓴 엔트리부터 삭제"""
+        os.makedirs(self.path, exist_ok=True)
+        path = self._file(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"key": key, "created": time.time(), "result": result}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.evict()
+
+    def entries(self):
+        """[(수정 시각, 크기, 경로)] 오래된 순"""
+        if not os.path.isdir(self.path):
+            return []
+        found = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        found.sort()
+        return found
+
+    def evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 엔트리 삭제, 지운 수"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def prune(self):
+        """현재 SCORING_VERSION 이 아닌 엔트리 삭제, 지운 수"""
+        removed = 0
+        for _, _, path in self.entries():
+            try:
+                with open(path, encoding='utf-8') as f:
+                    version = json.load(f)["key"].get("version")
+            except (OSError, ValueError, KeyError, AttributeError):
+                version = None
+            if version != SCORING_VERSION:
+                _remove(path)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """모든 엔트리 삭제, 지운 수"""
+        entries = self.entries()
+        for _, _, path in entries:
+            _remove(path)
+        return len(entries)
+
+    def stats(self):
+        entries = self.entries()
+        return {
+            "path": self.path,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def cached(cache, key, compute):
+    """cache 가 있으면 key 로 찾고, 없으면 compute() 결과를 저장해 반환, (결과, 적중 여부)"""
+    if cache is None:
+        return compute(), False
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+    result = compute()
+    cache.put(key, result)
+    return result, False
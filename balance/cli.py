@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+"""질문 세트 밸런스 도구 명령줄 진입점
+
+    python -m balance simulate --trials 1000000 --engine numpy
+    python -m balance simulate --trials 1000000 --seed 0 --mbti
+    python -m balance exact --workers 32 --output exact.json
+    python -m balance optimize --output assets/data/biblical_questions_tuned.json
+    python -m balance reach
+    python -m balance marginals
+    python -m balance early --trials 200000
+    python -m balance serve --port 8765
+    python -m balance ingest logs/results.jsonl.gz --trials 1000000
+    python -m balance sweep sweeps/variants.json --workers 8
+    python -m balance subset -k 10 --require 1 --output assets/data/biblical_questions_quick10.json
+    python -m balance validate assets/data/biblical_questions.json
+    python -m balance cache prune
+
+질문 세트는 위치 인자로 받은 JSON 을 읽는다 (기본 assets/data/biblical_questions.json).
+seed 를 준 simulate 와 exact 결과는 .balance_cache/ 에 캐시한다 (balance.cache, --no-cache 로 끔).
+numpy 와 무거운 모듈은 하위 명령 안에서만 불러오므로 --help 와 validate 는 바로 끝난다.
+"""
+
+import argparse
+import os
+import sys
+
+from balance import data
+
+ENGINES = ("python", "numpy", "parallel", "streaming")
+# balance.engine.TIE_POLICIES 와 같아야 한다 (--help 가 numpy 를 불러오지 않도록 따로 둔다)
+TIE_POLICIES = ("first", "app", "split", "random")
+
+
+def _read(loader, path):
+    """JSON 읽기, 파일이 없거나 깨졌으면 경로와 오류를 알리고 종료 코드 1"""
+    try:
+        return loader(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {path} 을(를) 읽을 수 없습니다: {e}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+def _load(args):
+    return _read(data.load_questions, args.questions)
+
+
+def _write(result, path):
+    if path:
+        data.save_json(result, path)
+        print(f"💾 저장: {path}")
+
+
+def _metrics(args):
+    """--metrics/--progress 가 있을 때만 측정 객체 생성"""
+    from balance.metrics import NULL_METRICS, Metrics
+
+    if not args.metrics and not args.progress:
+        return NULL_METRICS
+
+    def progress(m):
+        done, total = m.counters.get("done", 0), m.counters.get("total") or 1
+        print(f"\r⏳ {done:,}/{total:,} ({done / total * 100:.1f}%), {m.rate():,.0f}회/초",
+              end="", flush=True)
+
+    return Metrics(progress if args.progress else None, args.progress or 5.0)
+
+
+def _simulate_counts(args, questions, metrics, counter):
+    """simulate 옵션대로 엔진을 골라 돌린 {캐릭터: 승리 횟수}"""
+    from manual_biblical_balance import test_balanced_distribution
+
+    if args.engine == "python" and args.model is None and args.tie_policy == "first":
+        with metrics.stage("simulate"):
+            results = dict(test_balanced_distribution(questions, args.trials, seed=args.seed))
+        metrics.add("trials", args.trials)
+        return results
+
+    import numpy as np
+    from balance.engine import compile_questions
+
+    with metrics.stage("compile"):
+        compiled = compile_questions(questions)
+    model = None
+    if args.model:
+        from balance.respondents import load_model
+        model = _read(load_model, args.model)
+    if args.tie_policy != "first" and counter:
+        from balance.streams import simulate_counter_ties
+        counts = simulate_counter_ties(compiled, args.trials, args.seed, args.tie_policy).counts
+    elif args.tie_policy != "first":
+        from balance.engine import simulate_with_ties
+        counts = simulate_with_ties(compiled, args.trials, np.random.default_rng(args.seed),
+                                    args.tie_policy).counts
+    elif model is not None:
+        from balance.respondents import simulate_model
+        counts = simulate_model(compiled, model, args.trials, np.random.default_rng(args.seed))
+    elif args.engine == "parallel":
+        from balance.parallel import simulate_sharded
+        seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+        counts = simulate_sharded(compiled, args.trials, seed, args.workers, metrics=metrics, counter=counter)
+    elif args.engine == "streaming":
+        from balance.streaming import simulate_streaming
+        counts = simulate_streaming(compiled, args.trials, args.seed, metrics=metrics, counter=counter).counts
+    elif counter:
+        from balance.streams import simulate_counter
+        counts = simulate_counter(compiled, args.trials, args.seed, metrics=metrics)
+    else:
+        from balance.engine import simulate
+        counts = simulate(compiled, args.trials, np.random.default_rng(args.seed), metrics=metrics)
+    return {c: n for c, n in zip(compiled.characters, counts.tolist()) if n}
+
+
+def cmd_simulate(args):
+    from manual_biblical_balance import print_report
+
+    if args.engine != "numpy" and (args.model or args.tie_policy != "first"):
+        args.parser.error("--model 과 --tie-policy 는 numpy 엔진에서만 쓸 수 있습니다")
+    questions = _load(args)
+    metrics = _metrics(args)
+    # seed 가 있으면 모든 엔진과 동점 규칙이 카운터 기반 스트림을 써서 같은 seed 면 엔진과 상관없이 결과가 같다
+    counter = args.seed is not None and args.model is None
+    if args.seed is None or args.no_cache:
+        results = _simulate_counts(args, questions, metrics, counter)
+    else:
+        # seed 를 준 실행만 재현되므로 캐시한다. 카운터 스트림이면 엔진이 달라도 같은 결과를 쓴다.
+        from balance.cache import ResultCache, cache_key, cached
+        cache = ResultCache()
+        key = cache_key("simulate", questions, engine="counter" if counter else args.engine,
+                        seed=args.seed, trials=args.trials, tie_policy=args.tie_policy,
+                        model=_read(data.load_json, args.model) if args.model else None)
+        results, hit = cached(cache, key, lambda: _simulate_counts(args, questions, metrics, counter))
+        if hit:
+            print(f"♻️  캐시 결과 사용 ({cache.path})")
+
+    if args.progress:
+        print()
+    with metrics.stage("report"):
+        success = print_report(results, args.trials)
+        output = {"trials": args.trials, "seed": args.seed, "counts": results}
+        if args.mbti:
+            from balance.mbti import aggregate, load_lookup
+            from balance.mbti import print_report as print_mbti
+
+            characters = data.load_character_ids()
+            characters += [c for c in results if c not in characters]
+            mbti = aggregate(load_lookup(characters), [results.get(c, 0) for c in characters], args.trials)
+            print_mbti(mbti)
+            output["mbti"] = mbti.to_dict()
+        _write(output, args.output)
+    if args.metrics:
+        metrics.save(args.metrics)
+        print(f"📈 측정값 저장: {args.metrics}")
+    return 0 if success >= 3 else 1
+
+
+def cmd_exact(args):
+    from balance.exact import exact_distribution
+
+    def progress(done, total):
+        print(f"\r⏳ {done}/{total} 구간 완료", end="", flush=True)
+
+    questions = _load(args)
+    if args.no_cache:
+        result = exact_distribution(questions, args.workers, progress)
+    else:
+        from balance.cache import ResultCache, cache_key, cached
+        cache = ResultCache()
+        result, hit = cached(cache, cache_key("exact", questions),
+                             lambda: exact_distribution(questions, args.workers, progress))
+        if hit:
+            print(f"♻️  캐시 결과 사용 ({cache.path})", end="")
+    print(f"\n\n📊 정확한 승리 확률 (균등 응답, workers={args.workers}):")
+    print(f"{'캐릭터':^15} | {'비율(%)':^10}")
+    print("-" * 30)
+    for char_id, prob in sorted(result.items(), key=lambda x: x[1], reverse=True):
+        print(f"{char_id:^15} | {prob * 100:^10.4f}")
+    _write(result, args.output)
+    return 0
+
+
+def cmd_optimize(args):
+    from balance.optimize import optimize, uniform_target, validate
+
+    if args.max_edits_per_option is not None and args.max_edits_per_option < 1:
+        args.parser.error("--max-edits-per-option 은 1 이상이어야 합니다")
+    questions = _load(args)
+    target = _read(data.load_json, args.target) if args.target else uniform_target(data.load_character_ids())
+
+    def progress(iteration, loss):
+        print(f"\r🔧 {iteration}회 편집, 오차 {loss:.5f}", end="", flush=True)
+
+    result = optimize(questions, target, trials=args.trials, seed=args.seed,
+                      max_edits_per_option=args.max_edits_per_option, max_iterations=args.max_iterations,
+                      allow_add=args.allow_add, progress=progress)
+    print(f"\n📝 변경 내역 ({len(result.diff)}칸):")
+    for d in result.diff:
+        before = "-" if d['before'] is None else d['before']
+        print(f"  Q{d['question']} 선택지{d['option'] + 1} {d['character']}: {before} → {d['after']}")
+
+    fresh = validate(result.questions, result.characters, seed=args.seed + 1)
+    print(f"\n{'캐릭터':^15} | {'목표(%)':^8} | {'검증(%)':^8}")
+    print("-" * 40)
+    for i, c in enumerate(result.characters):
+        print(f"{c:^15} | {result.target[i] * 100:^8.2f} | {fresh[i] * 100:^8.2f}")
+    _write(result.questions, args.output)
+    return 0
+
+
+def cmd_reach(args):
+    import time
+    from balance.reach import print_report, solve
+
+    questions = _load(args)
+    start = time.perf_counter()
+    results = solve(questions, _read(data.load_character_ids, args.characters))
+    elapsed = time.perf_counter() - start
+    print_report(results, questions)
+    print(f"\n⏱️  {elapsed:.2f}초")
+    _write([{"character": r.character, "reachable": r.reachable, "witness": r.witness,
+             "fixed": None if r.fixed is None else {str(q): o for q, o in sorted(r.fixed.items())},
+             "fixed_optimal": r.fixed_optimal} for r in results], args.output)
+    return 0 if all(r.reachable for r in results) else 1
+
+
+def cmd_marginals(args):
+    import time
+    from balance.engine import collect_characters
+    from balance.marginals import marginals_asset, print_report, save_asset, score_marginals
+
+    questions = _load(args)
+    characters = _read(data.load_character_ids, args.characters)
+    characters += [c for c in collect_characters(questions) if c not in characters]
+    start = time.perf_counter()
+    marginals = score_marginals(questions, characters)
+    elapsed = time.perf_counter() - start
+    print_report(marginals)
+    print(f"\n⏱️  {elapsed * 1000:.1f}ms")
+    save_asset(marginals_asset(questions, marginals), args.output)
+    print(f"💾 저장: {args.output}")
+    return 0
+
+
+def cmd_early(args):
+    import numpy as np
+    from balance.early import print_report, simulate_decisions
+    from balance.engine import compile_questions
+
+    compiled = compile_questions(_load(args))
+    model = None
+    if args.model:
+        from balance.respondents import load_model
+        model = _read(load_model, args.model)
+    result = simulate_decisions(compiled, args.trials, np.random.default_rng(args.seed), model)
+    print_report(result)
+    _write(result.to_dict(), args.output)
+    return 0
+
+
+def cmd_subset(args):
+    import time
+    from balance.subset import count_candidates, select_subsets
+
+    questions = _load(args)
+    index_of = {q.get('id', i + 1): i for i, q in enumerate(questions)}
+    unknown = [i for i in args.require + args.forbid if i not in index_of]
+    if unknown:
+        args.parser.error(f"질문 세트에 없는 질문 id: {' '.join(map(str, unknown))}")
+    required = [index_of[i] for i in args.require]
+    forbidden = [index_of[i] for i in args.forbid]
+    target = _read(data.load_json, args.target) if args.target else None
+    total = count_candidates(len(questions), args.k, required, forbidden)
+    print(f"🔎 {len(questions)}문항 중 {args.k}문항, 후보 {total:,}개")
+    start = time.perf_counter()
+    results, characters, target_vec = select_subsets(questions, args.k, target, required, forbidden,
+                                                     seed=args.seed, top=args.top)
+    print(f"⏱️  {time.perf_counter() - start:.1f}초\n")
+    for rank, r in enumerate(results, 1):
+        ids = " ".join(str(questions[q].get('id', q + 1)) for q in r.indices)
+        print(f"{rank}위 오차 {r.error:.5f} (선별 {r.screen_error:.5f}): Q {ids}")
+    if results:
+        _write([questions[q] for q in results[0].indices], args.output)
+    return 0 if results else 1
+
+
+def cmd_serve(args):
+    from balance.engine import compile_questions
+    from balance.service import Scorer, serve_http, serve_stdin
+
+    scorer = Scorer(compile_questions(_load(args)), args.cache_size)
+    if args.stdin:
+        serve_stdin(scorer, sys.stdin, sys.stdout, args.batch)
+    else:
+        serve_http(scorer, args.host, args.port)
+    return 0
+
+
+def cmd_ingest(args):
+    import time
+    from balance.engine import compile_questions
+    from balance.ingest import compare, ingest, open_log, print_report
+
+    compiled = compile_questions(_read(data.load_questions, args.questions))
+
+    def progress(stats):
+        print(f"\r⏳ {stats.lines:,}줄 처리", end="", flush=True)
+
+    start = time.perf_counter()
+    log = open_log(args.log)
+    try:
+        stats = ingest(compiled, log, progress=progress)
+    finally:
+        if log is not sys.stdin:
+            log.close()
+    elapsed = time.perf_counter() - start
+    comparison = compare(compiled, stats, args.trials, args.seed)
+    print_report(stats, comparison)
+    print(f"⏱️  로그 {elapsed:.1f}초 ({stats.lines / elapsed if elapsed else 0:,.0f}줄/초)")
+    result = stats.to_dict()
+    result["simulated"] = {name: compiled.to_dict(rates) for name, rates in comparison.expected.items()}
+    _write(result, args.output)
+    return 0 if stats.scored else 1
+
+
+def cmd_sweep(args):
+    import time
+    from balance.sweep import load_sweep, print_report, sweep
+
+    variants, models, trials, seed = load_sweep(args.spec)
+    trials = args.trials or trials
+    seed = seed if args.seed is None else args.seed
+
+    def progress(done, total):
+        print(f"\r⏳ {done}/{total} 칸 완료", end="", flush=True)
+
+    start = time.perf_counter()
+    result = sweep(variants, models, trials, seed, args.workers, progress)
+    print(f"\n⏱️  {time.perf_counter() - start:.1f}초")
+    print_report(result)
+    _write(result.rows(), args.output)
+    return 0
+
+
+def cmd_validate(args):
+    from balance.validate import ERROR, check_questions
+
+    import time
+
+    questions = _load(args)
+    characters = None if args.no_characters else _read(data.load_character_ids, args.characters)
+    start = time.perf_counter()
+    issues = check_questions(questions, characters)
+    elapsed = (time.perf_counter() - start) * 1000
+    for issue in issues:
+        print(issue)
+    errors = sum(issue.severity == ERROR for issue in issues)
+    if errors:
+        print(f"❌ 오류 {errors}개, 경고 {len(issues) - errors}개 ({elapsed:.1f}ms)")
+        return 1
+    print(f"✅ 질문 {len(questions)}개 검사 통과 (경고 {len(issues)}개, {elapsed:.1f}ms)")
+    return 0
+
+
+def cmd_cache(args):
+    from balance.cache import SCORING_VERSION, ResultCache
+
+    cache = ResultCache()
+    if args.action == "prune":
+        print(f"🧹 이전 채점 규칙 엔트리 {cache.prune()}개 삭제")
+    elif args.action == "clear":
+        print(f"🧹 엔트리 {cache.clear()}개 삭제")
+    if args.max_bytes is not None:
+        cache.max_bytes = args.max_bytes
+        print(f"🧹 크기 상한 {args.max_bytes:,}B 에 맞춰 {cache.evict()}개 삭제")
+    stats = cache.stats()
+    print(f"📦 {stats['path']}: 엔트리 {stats['entries']}개, {stats['bytes']:,}B "
+          f"(상한 {stats['max_bytes']:,}B, 채점 규칙 버전 {SCORING_VERSION})")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m balance", description="질문 세트 밸런스 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("questions", nargs="?", default=data.QUESTIONS_PATH, help="질문 세트 JSON 경로")
+        p.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+
+    p = sub.add_parser("simulate", help="몬테카를로 분포 시뮬레이션")
+    common(p)
+    p.add_argument("-n", "--trials", type=int, default=10000)
+    p.add_argument("--seed", type=int)
+    p.add_argument("--engine", choices=ENGINES, default="numpy")
+    p.add_argument("--workers", type=int, help="parallel 엔진 프로세스 수 (기본: CPU 수)")
+    p.add_argument("--model", help="응답자 모델 JSON (balance.respondents, numpy 엔진만)")
+    p.add_argument("--tie-policy", choices=TIE_POLICIES, default="first",
+                   help="동점 규칙 (numpy 엔진만): first, app, split, random")
+    p.add_argument("--metrics", help="단계별 측정값 저장 경로 (.json, .prom 이면 Prometheus 형식)")
+    p.add_argument("--progress", type=float, metavar="SECONDS", help="진행 상황 출력 간격 (초)")
+    p.add_argument("--mbti", action="store_true", help="승자를 MBTI 유형/축(E/I, S/N, T/F, J/P)으로 집계")
+    p.add_argument("--no-cache", action="store_true", help="결과 캐시를 읽거나 쓰지 않음 (seed 를 준 실행만 캐시)")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("exact", help="균등 응답 정확한 승리 확률")
+    common(p)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (기본: CPU 수)")
+    p.add_argument("--no-cache", action="store_true", help="결과 캐시를 읽거나 쓰지 않음")
+    p.set_defaults(func=cmd_exact)
+
+    p = sub.add_parser("optimize", help="목표 분포에 맞춰 점수 조정")
+    common(p)
+    p.add_argument("--target", help="{캐릭터: 비율} JSON (기본: 캐릭터 균등)")
+    p.add_argument("-n", "--trials", type=int, default=1 << 15, help="공통 표본 크기")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--max-iterations", type=int, default=200)
+    p.add_argument("--max-edits-per-option", type=int, help="선택지 하나에서 바꿀 수 있는 캐릭터 수 (기본: 제한 없음)")
+    p.add_argument("--allow-add", action="store_true", help="점수 없는 칸에 캐릭터 추가 허용")
+    p.set_defaults(func=cmd_optimize)
+
+    p = sub.add_parser("reach", help="캐릭터별 도달 가능성과 최소 확정 응답 수")
+    common(p)
+    p.add_argument("--characters", default=data.CHARACTERS_PATH, help="캐릭터 JSON 경로")
+    p.set_defaults(func=cmd_reach)
+
+    p = sub.add_parser("marginals", help="캐릭터별 총점의 정확한 분포와 백분위 (앱 번들 JSON)")
+    p.add_argument("questions", nargs="?", default=data.QUESTIONS_PATH, help="질문 세트 JSON 경로")
+    p.add_argument("--characters", default=data.CHARACTERS_PATH, help="캐릭터 JSON 경로")
+    p.add_argument("-o", "--output", default=data.MARGINALS_PATH, help="자산 JSON 저장 경로")
+    p.set_defaults(func=cmd_marginals)
+
+    p = sub.add_parser("early", help="승자 확정까지 필요한 질문 수 분포")
+    common(p)
+    p.add_argument("-n", "--trials", type=int, default=100000)
+    p.add_argument("--seed", type=int)
+    p.add_argument("--model", help="응답자 모델 JSON (balance.respondents)")
+    p.set_defaults(func=cmd_early)
+
+    p = sub.add_parser("subset", help="짧은 퀴즈용 k 문항 부분 집합 선택")
+    common(p)
+    p.add_argument("-k", type=int, default=10, help="고를 질문 수")
+    p.add_argument("--target", help="{캐릭터: 비율} JSON (기본: 등장 캐릭터 균등)")
+    p.add_argument("--require", type=int, nargs="*", default=[], help="반드시 넣을 질문 id")
+    p.add_argument("--forbid", type=int, nargs="*", default=[], help="넣지 않을 질문 id")
+    p.add_argument("--top", type=int, default=5)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_subset)
+
+    p = sub.add_parser("serve", help="응답 벡터 채점 서비스 (HTTP 또는 표준 입출력 JSONL)")
+    p.add_argument("questions", nargs="?", default=data.QUESTIONS_PATH, help="질문 세트 JSON 경로")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--stdin", action="store_true", help="HTTP 대신 표준 입력 JSONL 을 읽어 표준 출력으로 채점")
+    p.add_argument("--batch", type=int, default=1024, help="표준 입력 모드에서 한 번에 채점하는 줄 수")
+    p.add_argument("--cache-size", type=int, default=1 << 16, help="LRU 캐시에 담는 응답 벡터 수")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("ingest", help="실제 응답 로그(JSONL) 집계와 시뮬레이션 비교")
+    p.add_argument("log", help="응답 로그 JSONL 경로 (.gz 가능, - 는 표준 입력)")
+    p.add_argument("--questions", default=data.QUESTIONS_PATH, help="질문 세트 JSON 경로")
+    p.add_argument("-n", "--trials", type=int, default=1 << 20, help="비교용 시뮬레이션 시행 수")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("sweep", help="질문 세트 변형 × 응답자 모델 격자 병렬 실행")
+    p.add_argument("spec", help="스윕 JSON 경로 (balance.sweep 참고)")
+    p.add_argument("-n", "--trials", type=int, help="칸마다 시행 수 (기본: 스윕 JSON 의 trials)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--workers", type=int, help="프로세스 수 (기본: CPU 수)")
+    p.add_argument("-o", "--output", help="결과 표 JSON 저장 경로")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("cache", help="결과 캐시 상태 보기/정리")
+    p.add_argument("action", nargs="?", choices=("stats", "prune", "clear"), default="stats",
+                   help="prune: 현재 채점 규칙 버전이 아닌 엔트리 삭제, clear: 전부 삭제")
+    p.add_argument("--max-bytes", type=int, help="이 크기에 맞춰 오래 안 쓴 엔트리 삭제")
+    p.set_defaults(func=cmd_cache)
+
+    p = sub.add_parser("validate", help="질문 세트 형식/캐릭터 ID/밸런스 검사")
+    p.add_argument("questions", nargs="?", default=data.QUESTIONS_PATH, help="질문 세트 JSON 경로")
+    p.add_argument("--characters", default=data.CHARACTERS_PATH, help="캐릭터 JSON 경로")
+    p.add_argument("--no-characters", action="store_true", help="캐릭터 ID 검사 생략")
+    p.set_defaults(func=cmd_validate)
+
+    for p in sub.choices.values():
+        p.set_defaults(parser=p)  # 하위 명령 안에서 잘못된 입력을 사용법 오류로 알릴 때
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
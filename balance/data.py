@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""assets/data 의 질문/캐릭터 JSON 경로와 로더"""
+
+import json
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "assets", "data")
+QUESTIONS_PATH = os.path.join(DATA_DIR, "biblical_questions.json")
+CHARACTERS_PATH = os.path.join(DATA_DIR, "biblical_characters.json")
+MARGINALS_PATH = os.path.join(DATA_DIR, "biblical_score_marginals.json")
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_questions(path=QUESTIONS_PATH):
+    """질문 세트 JSON 로드"""
+    return load_json(path)
+
+
+def character_id(english_name):
+    """영문 이름을 점수 딕셔너리의 캐릭터 ID 로 변환 ("Prodigal Son" -> "prodigalson")"""
+    return english_name.lower().replace(" ", "")
+
+
+def load_characters(path=CHARACTERS_PATH):
+    """캐릭터 JSON 로드"""
+    return load_json(path)
+
+
+def load_character_ids(path=CHARACTERS_PATH):
+    """캐릭터 JSON 순서대로 캐릭터 ID 목록"""
+    return [character_id(c['englishName']) for c in load_characters(path)]
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""몇 번째 질문에서 승자가 이미 확정되는지 분석 (조기 종료 검토용)
+
+캐릭터 X 와 경쟁자 r 의 점수차 X - r 은 질문마다 독립적으로 더해지므로, 남은 질문에서
+X 가 r 에게 가장 불리한 선택지만 고른 점수차(질문별 최솟값의 합)가 곧 최악의 경우다.
+모든 경쟁자에 대해 (지금까지 점수차 + 남은 최악 점수차) 가 1 이상이거나, 0 이어도 동점 규칙
+(먼저 등장한 캐릭터 우선) 으로 X 가 이기면 남은 답과 상관없이 X 가 승자다.
+"모든 경쟁자에 대해, 모든 남은 답에 대해" 는 순서를 바꿔도 같으므로 이 판정은 상한이 아니라 정확하다.
+
+응답 접두(prefix)마다 확정 여부는 decided_winner 로, 시뮬레이션 표본 전체의
+"필요한 질문 수" 분포는 simulate_decisions 로 같은 배치에서 승자 집계와 함께 계산한다.
+"""
+
+import numpy as np
+
+from balance.engine import DEFAULT_BATCH_SIZE, count_winners, sample_answers, score_answers, winners
+
+
+class DecisionResult:
+    """승리 횟수와 승자 확정까지 필요한 질문 수 분포"""
+
+    def __init__(self, characters, counts, needed, needed_by_character, trials):
+        self.characters = characters
+        self.counts = counts                            # (C,) 승리 횟수
+        self.needed = needed                            # (Q + 1,) 필요한 질문 수별 시행 수
+        self.needed_by_character = needed_by_character  # (C,) 캐릭터별 필요한 질문 수 합
+        self.trials = trials
+
+    @property
+    def num_questions(self):
+        return len(self.needed) - 1
+
+    def mean_needed(self):
+        total = self.needed.sum()
+        return float((self.needed * np.arange(len(self.needed))).sum() / total) if total else 0.0
+
+    def decided_by(self):
+        """(Q + 1,) q 번째 질문까지 답했을 때 승자가 확정된 시행 비율"""
+        total = self.needed.sum()
+        return np.cumsum(self.needed) / total if total else np.zeros(len(self.needed))
+
+    def percentile(self, p):
+        """필요한 질문 수의 p 분위수 (0 ~ 1)"""
+        reached = np.nonzero(self.decided_by() >= p)[0]
+        return int(reached[0]) if len(reached) else self.num_questions
+
+    def to_dict(self):
+        return {
+            "trials": self.trials,
+            "counts": {c: int(n) for c, n in zip(self.characters, self.counts) if n},
+            "needed": self.needed.tolist(),
+            "mean_needed": self.mean_needed(),
+            "mean_needed_by_character": {c: float(s / n) for c, s, n in
+                                         zip(self.characters, self.needed_by_character, self.counts) if n},
+        }
+
+
+def worst_margins(compiled):
+    """(Q + 1, C, C) 질문 t 부터 끝까지 X - r 점수차가 가장 작게 되는 선택의 합"""
+    num_q, max_options, num_c = compiled.scores.shape
+    scores = compiled.scores.astype(np.int64)
+    diff = scores[:, :, :, None] - scores[:, :, None, :]  # (Q, O, X, r)
+    valid = np.arange(max_options)[None, :] < compiled.option_counts[:, None]
+    low = np.where(valid[:, :, None, None], diff, np.iinfo(np.int64).max).min(axis=1)
+    suffix = np.zeros((num_q + 1, num_c, num_c), dtype=np.int64)
+    suffix[:num_q] = np.cumsum(low[::-1], axis=0)[::-1]
+    return suffix
+
+
+def _secured(margin, first_x, first):
+    """최악의 경우에도 X 가 r 을 이기는지 (1점 이상 앞서거나, 동점이어도 X 가 먼저 등장)"""
+    return (margin > 0) | ((margin == 0) & (first_x < first))
+
+
+def decided_winner(compiled, prefix, margins=None):
+    """앞 len(prefix) 문항 답 (선택지 번호 목록) 만으로 확정된 승자 인덱스, 아직 모르면 None"""
+    if margins is None:
+        margins = worst_margins(compiled)
+    t = len(prefix)
+    q = np.arange(t)
+    answers = np.asarray(prefix, dtype=np.int64)
+    totals = compiled.scores[q, answers].astype(np.int64).sum(axis=0)
+    first = compiled.first[q, answers].min(axis=0) if t else np.full(compiled.num_characters, compiled.not_seen)
+    for x in range(compiled.num_characters):
+        ok = _secured(totals[x] - totals + margins[t, x], first[x], first)
+        ok[x] = True
+        if ok.all():
+            return x
+    return None
+
+
+def decision_points(compiled, answers, margins=None):
+    """(N, Q) 응답 행렬의 시행별 (승자 인덱스, 승자가 확정된 가장 이른 질문 수)
+
+    승자가 없는 시행(-1)의 질문 수는 Q 로 둔다.
+    """
+    if margins is None:
+        margins = worst_margins(compiled)
+    n, num_q = answers.shape
+    win = winners(compiled, score_answers(compiled, answers))
+    q = np.arange(num_q)
+    totals = np.zeros((n, num_q + 1, compiled.num_characters), dtype=np.int32)
+    np.cumsum(compiled.scores[q, answers], axis=1, out=totals[:, 1:])
+    first = np.full((n, num_q + 1, compiled.num_characters), compiled.not_seen, dtype=np.int32)
+    np.minimum.accumulate(compiled.first[q, answers], axis=1, out=first[:, 1:])
+
+    rows = np.arange(n)
+    x = np.maximum(win, 0)
+    # 접두 t 마다 승자 X 기준 경쟁자별 최악 점수차 (N, Q + 1, C)
+    margin = totals[rows, :, x][:, :, None] - totals + margins[:, x, :].transpose(1, 0, 2)
+    ok = _secured(margin, first[rows, :, x][:, :, None], first)
+    ok[rows, :, x] = True
+    decided = ok.all(axis=2)
+    decided[:, num_q] = True  # 마지막 질문까지 답하면 승자는 정해져 있다
+    needed = decided.argmax(axis=1)
+    needed[win < 0] = num_q
+    return win, needed
+
+
+def simulate_decisions(compiled, trials, rng=None, model=None, batch_size=DEFAULT_BATCH_SIZE // 4):
+    """승리 횟수와 필요한 질문 수 분포를 같은 표본에서 함께 집계 (DecisionResult)"""
+    if rng is None:
+        rng = np.random.default_rng()
+    margins = worst_margins(compiled)
+    num_q, num_c = compiled.num_questions, compiled.num_characters
+    counts = np.zeros(num_c, dtype=np.int64)
+    needed = np.zeros(num_q + 1, dtype=np.int64)
+    by_character = np.zeros(num_c, dtype=np.int64)
+    done = 0
+    while done < trials:
+        n = min(batch_size, trials - done)
+        answers = model.sample(compiled, n, rng) if model is not None else sample_answers(compiled, n, rng)
+        win, need = decision_points(compiled, answers, margins)
+        counts += count_winners(compiled, win)
+        needed += np.bincount(need, minlength=num_q + 1)
+        valid = win >= 0
+        by_character += np.bincount(win[valid], weights=need[valid], minlength=num_c).astype(np.int64)
+        done += n
+    return DecisionResult(compiled.characters, counts, needed, by_character, trials)
+
+
+def print_report(result):
+    num_q = result.num_questions
+    decided = result.decided_by()
+    print(f"\n⏩ 승자 확정까지 필요한 질문 수 ({result.trials:,}회):")
+    print(f"   평균 {result.mean_needed():.2f}문항, 중앙값 {result.percentile(0.5)}문항, "
+          f"90% {result.percentile(0.9)}문항, 99% {result.percentile(0.99)}문항")
+    print(f"{'질문 수':^8} | {'확정(%)':^8} | {'누적(%)':^8}")
+    print("-" * 32)
+    for q in range(num_q + 1):
+        if result.needed[q]:
+            print(f"{q:^8} | {result.needed[q] / result.trials * 100:^8.2f} | {decided[q] * 100:^8.2f}")
+
+    print(f"\n{'캐릭터':^15} | {'비율(%)':^8} | {'평균 질문 수':^10}")
+    print("-" * 42)
+    order = np.argsort(-result.counts, kind="stable")
+    for i in order:
+        if result.counts[i]:
+            mean = result.needed_by_character[i] / result.counts[i]
+            print(f"{result.characters[i]:^15} | {result.counts[i] / result.trials * 100:^8.2f} | {mean:^10.2f}")
+
+
+def main():
+    import sys
+    from balance.cli import main as cli_main
+
+    sys.exit(cli_main(["early", *sys.argv[1:]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""질문 세트를 (질문 × 선택지 × 캐릭터) 점수 텐서로 컴파일해 배치로 시뮬레이션하는 엔진
+
+승자 규칙은 test_balanced_distribution 의 max(scores.items()) 와 같다.
+동점이면 그 응답 경로에서 scores 딕셔너리에 먼저 들어간 캐릭터가 이긴다.
+
+연속된 질문을 블록으로 묶어 블록 안의 모든 응답 조합에 대한 정렬 키를 미리 계산한다.
+정렬 키는 (총점, 최초 등장 우선순위, 캐릭터 번호) 를 한 정수에 담은 값이고
+블록끼리 더하기만 하면 되므로, 한 시행은 블록 수만큼의 take 와 max 한 번으로 끝난다.
+"""
+
+import numpy as np
+
+from balance.metrics import NULL_METRICS
+
+DEFAULT_BATCH_SIZE = 1 << 14
+# first: max(scores.items()) 와 같은 최초 등장 우선, app: 앱의 getTopCharacter 와 같은 순서,
+# split: 공동 1위에게 1/k 씩, random: 공동 1위 중 균등 추첨
+TIE_POLICIES = ("first", "app", "split", "random")
+APP_STABLE_SORT_LIMIT = 32  # Dart List.sort 는 32개 이하에서 삽입 정렬(안정 정렬)을 쓴다
+BLOCK_LIMIT = 4096  # 블록 하나가 담는 응답 조합 수 상한
+INT8_MAX = np.iinfo(np.int8).max
+INT16_MAX = np.iinfo(np.int16).max
+INT32_MAX = np.iinfo(np.int32).max
+INT64_MAX = np.iinfo(np.int64).max
+
+
+class ScoreBlock:
+    """연속된 질문 묶음의 모든 응답 조합에 대한 점수/정렬 키 테이블"""
+
+    def __init__(self, start, stop, radices, totals, first, keys):
+        self.start = start
+        self.stop = stop
+        self.radices = radices
+        self.size = len(totals)
+        self.totals = totals  # (size, C) 조합별 점수 합
+        self.first = first    # (size, C) 조합별 최초 등장 코드
+        self.keys = keys      # (size, C) 더해서 쓰는 정렬 키 조각, 패킹 불가면 None
+
+
+class CompiledQuestions:
+    """컴파일된 질문 세트"""
+
+    def __init__(self, questions, characters, scores, first, option_counts, block_limit=BLOCK_LIMIT):
+        self.questions = questions
+        self.characters = characters
+        self.char_index = {c: i for i, c in enumerate(characters)}
+        self.scores = scores                # (Q, O, C) int8 (범위를 넘으면 int16), 없는 선택지는 0
+        self.first = first                  # (Q, O, C) int32, 미등장은 not_seen
+        self.option_counts = option_counts  # (Q,)
+        self.not_seen = int(first.max()) if first.size else 0
+        self.blocks = _build_blocks(self, block_limit)
+        _pack_keys(self)
+
+    @property
+    def num_questions(self):
+        return self.scores.shape[0]
+
+    @property
+    def num_characters(self):
+        return self.scores.shape[2]
+
+    def to_dict(self, counts):
+        """캐릭터 인덱스별 카운트를 {캐릭터: 카운트} 로 변환 (0 은 생략)"""
+        return {c: int(n) for c, n in zip(self.characters, counts) if n}
+
+
+def collect_characters(questions):
+    """질문 세트에 등장하는 캐릭터 ID 를 최초 등장 순서대로 반환"""
+    characters = []
+    seen = set()
+    for question in questions:
+        for option in question['options']:
+            for character in option['scores']:
+                if character not in seen:
+                    seen.add(character)
+                    characters.append(character)
+    return characters
+
+
+def compile_questions(questions, characters=None, block_limit=BLOCK_LIMIT):
+    """질문 리스트를 점수 텐서로 컴파일"""
+    if characters is None:
+        characters = collect_characters(questions)
+    char_index = {c: i for i, c in enumerate(characters)}
+
+    num_q = len(questions)
+    max_options = max((len(q['options']) for q in questions), default=0)
+    max_pos = max((len(o['scores']) for q in questions for o in q['options']), default=0)
+    not_seen = num_q * max_pos
+
+    scores = np.zeros((num_q, max_options, len(characters)), dtype=np.int16)
+    first = np.full(scores.shape, not_seen, dtype=np.int32)
+    option_counts = np.array([len(q['options']) for q in questions], dtype=np.int64)
+
+    for qi, question in enumerate(questions):
+        for oi, option in enumerate(question['options']):
+            for pos, (character, score) in enumerate(option['scores'].items()):
+                ci = char_index.get(character)
+                if ci is None:
+                    continue
+                scores[qi, oi, ci] = score
+                # 질문 순서가 우선, 같은 선택지 안에서는 딕셔너리 순서
+                first[qi, oi, ci] = qi * max_pos + pos
+
+    if scores.size == 0 or np.abs(scores).max() <= INT8_MAX:
+        scores = scores.astype(np.int8)
+
+    return CompiledQuestions(questions, list(characters), scores, first, option_counts, block_limit)
+
+
+def _build_blocks(compiled, block_limit):
+    """질문을 묶어 블록별 전체 응답 조합 테이블을 미리 계산"""
+    blocks = []
+    num_c = compiled.num_characters
+    start = 0
+    while start < compiled.num_questions:
+        stop = start
+        size = 1
+        while stop < compiled.num_questions and size * compiled.option_counts[stop] <= block_limit:
+            size *= int(compiled.option_counts[stop])
+            stop += 1
+        if stop == start:  # 선택지가 아주 많은 질문은 단독 블록
+            stop = start + 1
+
+        totals = np.zeros((1, num_c), dtype=np.int16)
+        first = np.full((1, num_c), compiled.not_seen, dtype=np.int32)
+        for qi in range(start, stop):
+            n = compiled.option_counts[qi]
+            # 앞쪽 질문이 상위 자릿수가 되도록 펼친다
+            totals = (totals[:, None, :] + compiled.scores[qi, :n][None]).reshape(-1, num_c)
+            first = np.minimum(first[:, None, :], compiled.first[qi, :n][None]).reshape(-1, num_c)
+
+        radices = compiled.option_counts[start:stop].copy()
+        blocks.append(ScoreBlock(start, stop, radices, totals, first, None))
+        start = stop
+    return blocks
+
+
+def _pack_keys(compiled):
+    """블록별 정렬 키 조각을 계산
+
+    키 = (총점 * scale + 우선순위) * C + (C - 1 - 캐릭터 번호)
+    우선순위는 블록마다 한 자리(밑 width)를 쓰고 앞 블록이 상위 자리다.
+    캐릭터가 처음 나온 블록의 자리에서 먼저 등장한 쪽이 큰 값을 가지므로
+    자릿수 비교가 곧 전체 경로의 최초 등장 순서 비교가 된다.
+    자리수가 int64 를 넘는 큰 질문 세트는 (총점, 최초 등장) 을 따로 계산한다.
+    """
+    num_c = compiled.num_characters
+    width = 2
+    for block in compiled.blocks:
+        present = block.first < compiled.not_seen
+        if present.any():
+            span = int(block.first[present].max()) - int(block.first[present].min()) + 2
+            width = max(width, span)
+
+    max_total = int(np.abs(compiled.scores).max(axis=1).sum(axis=0).max()) if compiled.scores.size else 0
+    scale = width ** len(compiled.blocks)
+    # 키를 못 쓰는 경우 총점 누적에 쓰는 가장 작은 정수형
+    compiled.total_dtype = np.int16 if max_total <= INT16_MAX else (np.int32 if max_total <= INT32_MAX else np.int64)
+    compiled.packed = (max_total + 1) * scale * max(num_c, 1) < INT64_MAX
+    if not compiled.packed:
+        # 우선순위는 전역 최초 등장 코드로 직접 만든다
+        compiled.scale = compiled.not_seen + 1
+        compiled.key_dtype = np.int64
+        return
+
+    compiled.scale = scale
+    max_key = (max_total + 1) * scale * num_c
+    compiled.key_dtype = np.int32 if max_key <= INT32_MAX else np.int64
+    char_digit = np.arange(num_c - 1, -1, -1, dtype=np.int64)
+    for b, block in enumerate(compiled.blocks):
+        place = width ** (len(compiled.blocks) - 1 - b)
+        present = block.first < compiled.not_seen
+        low = block.first[present].min() if present.any() else 0
+        digit = np.where(present, width - 1 - (block.first - low), 0).astype(np.int64)
+        keys = (block.totals.astype(np.int64) * scale + digit * place) * num_c
+        if b == 0:
+            keys += char_digit
+        block.keys = keys.astype(compiled.key_dtype)
+
+
+def block_indices(compiled, answers):
+    """(N, Q) 응답 행렬을 블록별 조합 인덱스 리스트로 변환"""
+    indices = []
+    for block in compiled.blocks:
+        idx = np.zeros(len(answers), dtype=np.int64)
+        for offset, radix in enumerate(block.radices):
+            idx = idx * radix + answers[:, block.start + offset]
+        indices.append(idx)
+    return indices
+
+
+def sample_block_indices(compiled, n, rng):
+    """균등 응답을 블록 인덱스로 바로 샘플링 (질문별 균등 추출과 같은 분포)"""
+    return [rng.integers(0, block.size, size=n) for block in compiled.blocks]
+
+
+def sample_answers(compiled, n, rng):
+    """균등 응답 행렬 (N, Q) 샘플링"""
+    draws = rng.random((n, compiled.num_questions))
+    return (draws * compiled.option_counts).astype(np.uint8)
+
+
+def score_blocks(compiled, indices):
+    """블록 인덱스로부터 (N, C) 정렬 키 계산"""
+    n = len(indices[0]) if indices else 0
+    num_c = compiled.num_characters
+    if not compiled.packed:
+        totals = np.zeros((n, num_c), dtype=compiled.total_dtype)
+        first = np.full((n, num_c), compiled.not_seen, dtype=np.int32)
+        for block, idx in zip(compiled.blocks, indices):
+            totals += np.take(block.totals, idx, axis=0)
+            np.minimum(first, np.take(block.first, idx, axis=0), out=first)
+        prio = np.where(first < compiled.not_seen, compiled.not_seen - first, 0)
+        return (totals.astype(np.int64) * compiled.scale + prio) * num_c + np.arange(num_c - 1, -1, -1)
+
+    if not indices:
+        return np.zeros((0, num_c), dtype=compiled.key_dtype)
+    keys = np.take(compiled.blocks[0].keys, indices[0], axis=0)
+    for block, idx in zip(compiled.blocks[1:], indices[1:]):
+        keys += np.take(block.keys, idx, axis=0)
+    return keys
+
+
+def score_answers(compiled, answers):
+    """(N, Q) 응답 행렬의 정렬 키 계산"""
+    return score_blocks(compiled, block_indices(compiled, answers))
+
+
+def keys_to_totals(compiled, keys):
+    """정렬 키에서 캐릭터별 총점 복원"""
+    return keys // (compiled.scale * compiled.num_characters)
+
+
+def winners(compiled, keys):
+    """시행별 승자 인덱스, 점수를 받은 캐릭터가 없으면 -1"""
+    num_c = compiled.num_characters
+    top = keys.max(axis=1)
+    win = (num_c - 1 - top % num_c).astype(np.int64)
+    win[top < num_c] = -1  # 최초 등장 자리가 0 이면 scores 에 없던 캐릭터
+    return win
+
+
+def count_winners(compiled, win):
+    """승자 인덱스 배열을 캐릭터별 승리 횟수로 집계"""
+    return np.bincount(win[win >= 0], minlength=compiled.num_characters).astype(np.int64)
+
+
+def simulate(compiled, trials, rng=None, batch_size=DEFAULT_BATCH_SIZE, metrics=NULL_METRICS):
+    """균등 응답 시뮬레이션, 캐릭터 인덱스별 승리 횟수 배열 반환
+
+    metrics (balance.metrics.Metrics) 를 주면 sample/accumulate/select 단계 시간을 잰다.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    counts = np.zeros(compiled.num_characters, dtype=np.int64)
+    done = 0
+    while done < trials:
+        n = min(batch_size, trials - done)
+        with metrics.stage("sample"):
+            indices = sample_block_indices(compiled, n, rng)
+        with metrics.stage("accumulate"):
+            keys = score_blocks(compiled, indices)
+        with metrics.stage("select"):
+            counts += count_winners(compiled, winners(compiled, keys))
+        done += n
+        metrics.add("trials", n)
+        metrics.tick(done, trials)
+    return counts
+
+
+class TieResult:
+    """동점 집계를 포함한 시뮬레이션 결과"""
+
+    def __init__(self, characters, counts, tie_counts, tie_trials, trials, policy):
+        self.characters = characters
+        self.counts = counts          # 캐릭터별 승리 수 (split 이면 소수)
+        self.tie_counts = tie_counts  # 캐릭터별 공동 1위에 든 시행 수
+        self.tie_trials = tie_trials  # 공동 1위가 나온 시행 수
+        self.trials = trials
+        self.policy = policy
+
+    @property
+    def tie_rates(self):
+        """캐릭터별 공동 1위 비율"""
+        return self.tie_counts / self.trials if self.trials else self.tie_counts * 0.0
+
+    def to_dict(self):
+        return {c: n for c, n in zip(self.characters, self.counts.tolist()) if n}
+
+
+def tied_leaders(compiled, keys):
+    """시행별 최대 키와 공동 1위(총점이 최고점과 같은) 캐릭터 마스크"""
+    top = keys.max(axis=1)
+    unit = compiled.scale * compiled.num_characters
+    # 총점이 최고점과 같으면 키가 top 의 총점 자리 이상, 미등장 캐릭터(키 < C)는 제외
+    floor = np.maximum(top // unit * unit, compiled.num_characters)
+    return top, keys >= floor[:, None]
+
+
+def check_tie_policy(compiled, policy):
+    if policy not in TIE_POLICIES:
+        raise ValueError(f"알 수 없는 동점 규칙: {policy} (가능: {', '.join(TIE_POLICIES)})")
+    if policy == "app" and compiled.num_characters > APP_STABLE_SORT_LIMIT:
+        # 더 많으면 Dart 가 불안정한 퀵정렬을 써서 순서를 재현할 수 없다
+        raise ValueError(f"app 규칙은 캐릭터 {APP_STABLE_SORT_LIMIT}명 이하에서만 재현됩니다")
+
+
+def simulate_with_ties(compiled, trials, rng=None, tie_policy="first", batch_size=DEFAULT_BATCH_SIZE):
+    """동점 규칙을 고를 수 있고 공동 1위 비율도 함께 세는 시뮬레이션
+
+    앱의 _calculateScores 는 질문 순서대로, 선택지 안에서는 JSON 순서대로 점수 맵에 넣고
+    getTopCharacter 는 값 내림차순으로 안정 정렬하므로 동점이면 먼저 들어간 캐릭터가 1위다.
+    그래서 app 규칙은 first 와 같고, 같은 배치 안에서 마스크 한 번으로 동점을 센다.
+    """
+    check_tie_policy(compiled, tie_policy)
+    if rng is None:
+        rng = np.random.default_rng()
+    tally = TieTally(compiled, tie_policy)
+    done = 0
+    while done < trials:
+        n = min(batch_size, trials - done)
+        keys = score_blocks(compiled, sample_block_indices(compiled, n, rng))
+        tally.add(keys, lambda multi: rng.random((int(multi.sum()), compiled.num_characters)))
+        done += n
+    return tally.result(trials)
+
+
+class TieTally:
+    """배치별 정렬 키를 동점 규칙대로 누적하는 카운터 (엔진과 카운터 스트림이 같이 쓴다)"""
+
+    def __init__(self, compiled, tie_policy):
+        num_c = compiled.num_characters
+        self.compiled = compiled
+        self.tie_policy = tie_policy
+        self.counts = np.zeros(num_c, dtype=np.int64)
+        # split: [k, c] 는 c 가 k 명 공동 1위였던 시행 수, 정수로 모아 두고 끝에 1/k 를 곱해 배치와 상관없게 한다
+        self.shares = np.zeros((num_c + 1, num_c), dtype=np.int64) if tie_policy == "split" else None
+        self.tie_counts = np.zeros(num_c, dtype=np.int64)
+        self.tie_trials = 0
+
+    def add(self, keys, draws):
+        """(n, C) 키 누적, draws(multi) 는 random 규칙에서 공동 1위가 있는 시행(multi 마스크)의 (m, C) 추첨값"""
+        compiled = self.compiled
+        num_c = compiled.num_characters
+        top, tied = tied_leaders(compiled, keys)
+        width = tied.sum(axis=1)
+        multi = width > 1
+        self.tie_counts += tied[multi].sum(axis=0)
+        self.tie_trials += int(multi.sum())
+
+        win = (num_c - 1 - top % num_c).astype(np.int64)
+        win[top < num_c] = -1
+        if self.tie_policy == "split":
+            single = win[~multi]
+            self.shares[1] += np.bincount(single[single >= 0], minlength=num_c)
+            rows, cols = np.nonzero(tied[multi])
+            cells = width[multi][rows] * num_c + cols
+            self.shares += np.bincount(cells, minlength=self.shares.size).reshape(self.shares.shape)
+            return
+        if self.tie_policy == "random" and multi.any():
+            draw = np.asarray(draws(multi), dtype=np.float64)
+            draw[~tied[multi]] = -1.0
+            win[multi] = draw.argmax(axis=1)
+        self.counts += count_winners(compiled, win)
+
+    def result(self, trials):
+        counts = self.counts
+        if self.shares is not None:
+            counts = (self.shares[1:] / np.arange(1, len(self.shares))[:, None]).sum(axis=0)
+        return TieResult(self.compiled.characters, counts, self.tie_counts, self.tie_trials, trials,
+                         self.tie_policy)
+
+
+TOP_RANKS = 3  # 결과 화면(getTop3Characters)에 보이는 캐릭터 수
+
+
+def top_ranks(compiled, keys, k=TOP_RANKS):
+    """시행별 상위 k 캐릭터 번호 (N, k), 점수 맵에 없어서 빈 순위는 -1
+
+    getTop3Characters 는 값 내림차순 안정 정렬 후 앞의 3개를 쓰므로 정렬 키 상위 k 개와 같다.
+    키에 캐릭터 번호가 들어 있어 전체 정렬 대신 키 값만 partition 으로 k 개 고르고 그 안에서만 정렬한다.
+    """
+    num_c = compiled.num_characters
+    k = min(k, num_c)
+    picked = np.partition(keys, num_c - k, axis=1)[:, num_c - k:]
+    picked = np.sort(picked, axis=1)[:, ::-1].astype(np.int64)
+    return np.where(picked >= num_c, num_c - 1 - picked % num_c, -1)
+
+
+class RankResult:
+    """순위별 등장 횟수"""
+
+    def __init__(self, characters, rank_counts, trials):
+        self.characters = characters
+        self.rank_counts = rank_counts  # (k, C) r+1 위로 나온 횟수, rank_counts[0] 이 승리 횟수
+        self.trials = trials
+
+    @property
+    def top_counts(self):
+        """상위 k 안에 든 횟수"""
+        return self.rank_counts.sum(axis=0)
+
+    def rates(self):
+        """(k, C) 순위별 비율"""
+        return self.rank_counts / self.trials if self.trials else self.rank_counts * 0.0
+
+
+def simulate_ranks(compiled, trials, rng=None, k=TOP_RANKS, batch_size=DEFAULT_BATCH_SIZE):
+    """균등 응답 시뮬레이션에서 1 ~ k 위 캐릭터별 횟수를 한 번에 집계"""
+    if rng is None:
+        rng = np.random.default_rng()
+    num_c = compiled.num_characters
+    k = min(k, num_c)
+    rank_counts = np.zeros((k, num_c), dtype=np.int64)
+    done = 0
+    while done < trials:
+        n = min(batch_size, trials - done)
+        ranks = top_ranks(compiled, score_blocks(compiled, sample_block_indices(compiled, n, rng)), k)
+        for r in range(k):
+            rank_counts[r] += count_winners(compiled, ranks[:, r])
+        done += n
+    return RankResult(compiled.characters, rank_counts, trials)
+
+
+def simulate_distribution(questions, trials=10000, seed=None, batch_size=DEFAULT_BATCH_SIZE,
+                          tie_policy="first", metrics=NULL_METRICS):
+    """test_balanced_distribution 과 같은 형태 ({캐릭터: 승리 횟수}) 의 벡터화 버전"""
+    with metrics.stage("compile"):
+        compiled = compile_questions(questions)
+    rng = np.random.default_rng(seed)
+    if tie_policy == "first":
+        return compiled.to_dict(simulate(compiled, trials, rng, batch_size, metrics))
+    return simulate_with_ties(compiled, trials, rng, tie_policy, batch_size).to_dict()
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""균등 응답 가정에서 캐릭터별 정확한 승리 확률 계산 (샘플링 노이즈 없음)
+
+질문을 앞쪽(prefix)과 뒤쪽(suffix)으로 나눠 만난다(meet-in-the-middle).
+뒤쪽 질문의 모든 응답 조합 점수 테이블을 한 번 만들어 두고, 앞쪽 조합을 청크 단위로
+열거하면서 앞쪽 점수 + 뒤쪽 테이블로 승자를 센다.
+
+승자 규칙은 max(scores.items()) 와 같다. 동점이면 먼저 등장한 캐릭터가 이기는데,
+앞쪽에서 등장한 캐릭터는 항상 뒤쪽에서 처음 등장한 캐릭터보다 먼저다.
+그래서 정렬 키를 총점 * 2^bits + 우선순위 로 두고 우선순위는
+앞쪽 등장이면 (상위 구간 + 앞쪽 등장 순서), 아니면 뒤쪽 등장 순서로 만든다.
+20문항 세트는 키가 int16 에 들어가 한 번에 처리하는 원소 수가 두 배가 된다.
+
+가지치기
+- 뒤쪽 전체에서 j 가 i 보다 얻을 수 있는 최대 점수차(정확한 값)로 못 이기는 캐릭터를 후보에서 뺀다.
+- 후보가 하나뿐인 앞쪽 조합은 뒤쪽 조합 수만큼 한꺼번에 센다.
+
+20문항 4지선다는 약 1.1e12 경로라 한 코어로는 몇 시간이 걸린다.
+workers 로 앞쪽 조합 구간을 여러 프로세스에 나누면 코어 수에 비례해 줄어든다.
+"""
+
+import math
+
+import numpy as np
+
+from balance.engine import compile_questions
+
+SUFFIX_LIMIT = 4096    # 뒤쪽 조합 테이블 크기 상한
+PREFIX_CHUNK = 1 << 14  # 한 번에 열거하는 앞쪽 조합 수
+GROUP_PATHS = 1 << 18   # 커널 한 번에 처리하는 (앞쪽 × 뒤쪽) 경로 수
+
+
+def _enumerate(compiled):
+    """블록 테이블을 펼쳐 모든 응답 조합의 점수 합과 최초 등장 코드 계산"""
+    num_c = compiled.num_characters
+    totals = np.zeros((1, num_c), dtype=np.int32)
+    first = np.full((1, num_c), compiled.not_seen, dtype=np.int32)
+    for block in compiled.blocks:
+        totals = (totals[:, None, :] + block.totals[None]).reshape(-1, num_c)
+        first = np.minimum(first[:, None, :], block.first[None]).reshape(-1, num_c)
+    return totals, first
+
+
+class ExactPlan:
+    """앞쪽/뒤쪽 분할, 뒤쪽 조합 키 테이블과 키 인코딩"""
+
+    def __init__(self, questions, characters, suffix_limit=SUFFIX_LIMIT):
+        split = len(questions)
+        size = 1
+        while split > 0 and size * len(questions[split - 1]['options']) <= suffix_limit:
+            split -= 1
+            size *= len(questions[split]['options'])
+
+        self.questions = questions
+        self.characters = characters
+        self.prefix = compile_questions(questions[:split], characters)
+        self.suffix = compile_questions(questions[split:], characters, block_limit=suffix_limit)
+        self.prefix_size = math.prod(b.size for b in self.prefix.blocks)
+
+        s_totals, s_first = _enumerate(self.suffix)
+        s_present = s_first < self.suffix.not_seen
+        self.suffix_size = len(s_totals)
+
+        # 우선순위: 뒤쪽만 등장 [1, suffix_span], 앞쪽 등장 (suffix_span, suffix_span + prefix_span]
+        self.suffix_span = self.suffix.not_seen + 1
+        prefix_span = self.prefix.not_seen + 1
+        self.shift = max(1, (self.suffix_span + prefix_span).bit_length())
+        max_total = int(np.abs(self.prefix.scores).max(axis=1, initial=0).sum(axis=0).max(initial=0)) \
+            + int(np.abs(s_totals).max(initial=0))
+        max_key = ((max_total + 1) << self.shift) - 1
+        if max_key <= np.iinfo(np.int16).max:
+            self.key_dtype = np.int16
+        elif max_key <= np.iinfo(np.int32).max:
+            self.key_dtype = np.int32
+        else:
+            self.key_dtype = np.int64
+
+        # 앞쪽에서 등장한 캐릭터용 / 앞쪽에 없던 캐릭터용 뒤쪽 키 (C, S)
+        base = (s_totals.astype(np.int64) << self.shift)
+        self.suffix_present_keys = np.ascontiguousarray(base.T.astype(self.key_dtype))
+        absent = np.where(s_present, base + (self.suffix.not_seen + 1 - s_first), -1)
+        self.suffix_absent_keys = np.ascontiguousarray(absent.T.astype(self.key_dtype))
+
+        # 뒤쪽에서 j 가 i 보다 최대 몇 점 더 얻을 수 있는지
+        diff = s_totals[:, :, None] - s_totals[:, None, :]
+        self.max_gain = diff.max(axis=0) if len(diff) else np.zeros((len(characters),) * 2, np.int32)
+
+    @property
+    def total_paths(self):
+        return self.prefix_size * self.suffix_size
+
+    def prefix_state(self, start, stop):
+        """앞쪽 조합 번호 [start, stop) 의 점수 합, 앞쪽 키, 등장 여부"""
+        compiled = self.prefix
+        num_c = compiled.num_characters
+        index = np.arange(start, stop, dtype=np.int64)
+        totals = np.zeros((len(index), num_c), dtype=np.int32)
+        first = np.full((len(index), num_c), compiled.not_seen, dtype=np.int32)
+        for block in reversed(compiled.blocks):
+            index, idx = np.divmod(index, block.size)
+            totals += np.take(block.totals, idx, axis=0)
+            np.minimum(first, np.take(block.first, idx, axis=0), out=first)
+        present = first < compiled.not_seen
+        prio = np.where(present, self.suffix_span + compiled.not_seen - first, 0)
+        keys = (totals.astype(np.int64) << self.shift) + prio
+        return totals, keys.astype(self.key_dtype), present
+
+
+def count_range(plan, start, stop):
+    """앞쪽 조합 [start, stop) 과 모든 뒤쪽 조합에 대한 캐릭터별 승리 경로 수"""
+    num_c = len(plan.characters)
+    num_s = plan.suffix_size
+    counts = np.zeros(num_c, dtype=np.int64)
+    step = max(1, GROUP_PATHS // num_s)
+    acc = np.empty((step, num_s), dtype=plan.key_dtype)
+    tmp = np.empty((step, num_s), dtype=plan.key_dtype)
+    floor = np.iinfo(plan.key_dtype).min
+
+    for lo in range(start, stop, PREFIX_CHUNK):
+        hi = min(lo + PREFIX_CHUNK, stop)
+        totals, keys, present = plan.prefix_state(lo, hi)
+
+        # j 가 어떤 i 에게 뒤쪽 전체에서 못 따라잡으면 후보 탈락
+        margin = totals[:, :, None] - totals[:, None, :] + plan.max_gain[None]
+        candidate = (margin >= 0).all(axis=2)
+
+        # 후보가 하나이고 앞쪽에서 이미 등장했다면 모든 뒤쪽 조합에서 승리
+        sole = candidate.argmax(axis=1)
+        settled = (candidate.sum(axis=1) == 1) & present[np.arange(len(keys)), sole]
+        counts += np.bincount(sole[settled], minlength=num_c) * num_s
+
+        keep = ~settled
+        keys, candidate, present = keys[keep], candidate[keep], present[keep]
+        # 후보/등장 구성이 비슷한 조합끼리 모아 열 단위로 처리
+        order = np.lexsort(np.concatenate([present.T, candidate.T]))
+        keys, candidate, present = keys[order], candidate[order], present[order]
+
+        for a in range(0, len(keys), step):
+            part = slice(a, a + step)
+            n = len(keys[part])
+            acc_v, tmp_v = acc[:n], tmp[:n]
+            columns = np.flatnonzero(candidate[part].any(axis=0))
+            rows = [_column_keys(plan, keys[part], present[part], j) for j in columns]
+
+            acc_v.fill(floor)
+            for pk, sk in rows:
+                np.add(pk, sk, out=tmp_v)
+                np.maximum(acc_v, tmp_v, out=acc_v)
+            valid = acc_v >= 0
+            every = valid.all()
+            for j, (pk, sk) in zip(columns, rows):
+                np.add(pk, sk, out=tmp_v)
+                hit = acc_v == tmp_v
+                counts[j] += np.count_nonzero(hit if every else hit & valid)
+    return counts
+
+
+def _column_keys(plan, keys, present, j):
+    """캐릭터 j 의 (앞쪽 키 열, 뒤쪽 키 행) 쌍, 앞쪽 등장 여부가 섞이면 행별로 고른다"""
+    pk = keys[:, j, None]
+    col = present[:, j]
+    if col.all():
+        return pk, plan.suffix_present_keys[j][None, :]
+    if not col.any():
+        return pk, plan.suffix_absent_keys[j][None, :]
+    sk = np.where(col[:, None], plan.suffix_present_keys[j][None, :], plan.suffix_absent_keys[j][None, :])
+    return pk, sk
+
+
+def _count_shard(args):
+    questions, characters, suffix_limit, start, stop = args
+    return count_range(ExactPlan(questions, characters, suffix_limit), start, stop)
+
+
+def exact_counts(compiled, workers=1, suffix_limit=SUFFIX_LIMIT, progress=None):
+    """모든 응답 경로에 대한 캐릭터별 승리 경로 수와 전체 경로 수"""
+    plan = ExactPlan(compiled.questions, compiled.characters, suffix_limit)
+    num_shards = max(1, min(plan.prefix_size, max(workers, 1) * 16))
+    bounds = np.linspace(0, plan.prefix_size, num_shards + 1).astype(np.int64)
+    shards = [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    counts = np.zeros(compiled.num_characters, dtype=np.int64)
+    if workers <= 1:
+        for i, (start, stop) in enumerate(shards):
+            counts += count_range(plan, start, stop)
+            if progress:
+                progress(i + 1, len(shards))
+        return counts, plan.total_paths
+
+    from multiprocessing import Pool
+    tasks = [(compiled.questions, compiled.characters, suffix_limit, a, b) for a, b in shards]
+    with Pool(workers) as pool:
+        for i, part in enumerate(pool.imap_unordered(_count_shard, tasks)):
+            counts += part
+            if progress:
+                progress(i + 1, len(shards))
+    return counts, plan.total_paths
+
+
+def exact_distribution(questions, workers=1, progress=None):
+    """균등 응답에서 캐릭터별 정확한 승리 확률 {캐릭터: 확률}"""
+    compiled = compile_questions(questions)
+    counts, total = exact_counts(compiled, workers, progress=progress)
+    return {c: int(n) / total for c, n in zip(compiled.characters, counts) if n}
+
+
+def main():
+    import os
+    import sys
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    questions = create_biblically_balanced_questions()
+
+    def progress(done, total):
+        print(f"\r⏳ {done}/{total} 구간 완료", end="", flush=True)
+
+    result = exact_distribution(questions, workers, progress)
+    print(f"\n\n📊 정확한 승리 확률 (균등 응답, workers={workers}):")
+    print(f"{'캐릭터':^15} | {'비율(%)':^10}")
+    print("-" * 30)
+    for char_id, prob in sorted(result.items(), key=lambda x: x[1], reverse=True):
+        print(f"{char_id:^15} | {prob * 100:^10.4f}")
+
+
+if __name__ == "__main__":
+    main()
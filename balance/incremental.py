@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""한 선택지의 점수만 바뀌었을 때 해당 시행만 다시 계산하는 캐시된 평가 상태
+
+고정된 응답 표본(N, Q)과 시행별 캐릭터 총점, 최초 등장 코드, 1, 2위 정렬 키를 들고 있다.
+질문 q 의 선택지 o 를 고친 편집은 그 선택지를 고른 시행(평균 N / 선택지 수)에만 영향을 주므로
+총점과 승자를 그 시행들에 대해서만 갱신한다. 4지선다면 처음부터 다시 돌리는 것보다 약 4배 싸다.
+승자 규칙(동점이면 먼저 등장한 캐릭터)은 engine 과 같다.
+"""
+
+import copy
+import time
+
+import numpy as np
+
+from balance.engine import collect_characters
+
+SAMPLE_TRIALS = 1 << 16
+
+
+def sample_uniform_answers(questions, trials, rng):
+    """질문별 균등 응답 행렬 (N, Q)"""
+    option_counts = np.array([len(q['options']) for q in questions])
+    return (rng.random((trials, len(questions))) * option_counts).astype(np.int64)
+
+
+class EvaluationState:
+    """고정된 응답 표본과 시행별 총점/1, 2위를 캐시해 두는 평가 상태"""
+
+    def __init__(self, questions, characters, answers):
+        self.questions = questions  # set_score/set_option 이 직접 수정하는 작업용 사본
+        self.characters = characters
+        self.char_index = {c: i for i, c in enumerate(characters)}
+        self.answers = answers
+
+        num_q = len(questions)
+        num_c = len(characters)
+        max_options = max(len(q['options']) for q in questions)
+        max_pos = max(len(o['scores']) for q in questions for o in q['options'])
+        self.stride = max_pos + num_c  # 새 항목이 뒤에 붙어도 코드가 겹치지 않도록
+        self.not_seen = num_q * self.stride
+        self.base = self.not_seen + 1
+
+        self.values = np.zeros((num_q, max_options, num_c), dtype=np.int32)
+        self.codes = np.full(self.values.shape, self.not_seen, dtype=np.int32)
+        for qi, question in enumerate(questions):
+            for oi, option in enumerate(question['options']):
+                for pos, (character, score) in enumerate(option['scores'].items()):
+                    ci = self.char_index[character]
+                    self.values[qi, oi, ci] = score
+                    self.codes[qi, oi, ci] = qi * self.stride + pos
+
+        self.rows = [[np.flatnonzero(answers[:, qi] == oi) for oi in range(len(q['options']))]
+                     for qi, q in enumerate(questions)]
+        qi = np.arange(num_q)
+        # 캐릭터 한 명의 열을 빨리 꺼내도록 (C, N) 로 보관
+        self.totals_t = np.ascontiguousarray(self.values[qi, answers].sum(axis=1).T)
+        self.first_t = np.ascontiguousarray(self.codes[qi, answers].min(axis=1).T)
+
+        self.top1 = np.zeros(len(answers), dtype=np.int64)
+        self.top2 = np.zeros(len(answers), dtype=np.int64)
+        self.win = np.zeros(len(answers), dtype=np.int64)     # 1위 캐릭터
+        self.second = np.zeros(len(answers), dtype=np.int64)  # 2위 캐릭터
+        self._refresh(np.arange(len(answers)))
+        self.counts = self._count(self.top1)
+
+    @property
+    def num_characters(self):
+        return len(self.characters)
+
+    def _keys(self, totals, first, cols):
+        """(총점, 최초 등장, 캐릭터 번호) 정렬 키, engine 과 같은 규칙"""
+        num_c = self.num_characters
+        prio = np.where(first < self.not_seen, self.not_seen - first, 0)
+        return (totals.astype(np.int64) * self.base + prio) * num_c + (num_c - 1 - cols)
+
+    def _winner(self, top):
+        num_c = self.num_characters
+        return np.where(top >= num_c, num_c - 1 - top % num_c, -1)
+
+    def _count(self, top):
+        win = self._winner(top)
+        return np.bincount(win[win >= 0], minlength=self.num_characters).astype(np.int64)
+
+    def _refresh(self, rows):
+        """주어진 시행의 1, 2위 키와 캐릭터 다시 계산"""
+        keys = self._keys(self.totals_t[:, rows].T, self.first_t[:, rows].T, np.arange(self.num_characters))
+        if self.num_characters > 1:
+            top = np.partition(keys, self.num_characters - 2, axis=1)[:, -2:]
+            self.top2[rows] = top[:, 0]
+            self.top1[rows] = top[:, 1]
+        else:
+            self.top2[rows] = -1
+            self.top1[rows] = keys[:, 0]
+        self.win[rows] = self._winner(self.top1[rows])
+        self.second[rows] = self._winner(self.top2[rows])
+
+    def _new_code(self, qi, oi):
+        """딕셔너리 끝에 새 항목을 붙일 때의 최초 등장 코드"""
+        return qi * self.stride + len(self.questions[qi]['options'][oi]['scores'])
+
+    def preview_many(self, qi, oi, cis, values):
+        """한 선택지에 대한 후보 편집 k 개를 한꺼번에 평가, (k, C) 승리 횟수"""
+        num_c = self.num_characters
+        cis = np.asarray(cis, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        rows = self.rows[qi][oi]
+        old = self.values[qi, oi, cis]
+        col = cis[:, None]
+
+        # (k, R) 배치: 후보별로 편집된 캐릭터의 키만 다시 만든다
+        totals = np.take(self.totals_t[cis], rows, axis=1) + (values - old)[:, None]
+        first = np.take(self.first_t[cis], rows, axis=1)
+        fresh = self.codes[qi, oi, cis] == self.not_seen  # 점수 맵에 없던 캐릭터 (0점 항목은 이미 있다)
+        if fresh.any():
+            first[fresh] = np.minimum(first[fresh], self._new_code(qi, oi))
+        key = self._keys(totals, first, col)
+
+        win = self.win[rows]
+        mine = win == col
+        other = np.where(mine, self.top2[rows], self.top1[rows])
+        new_win = np.where(key > other, col, np.where(mine, self.second[rows], win))
+
+        # 승자가 바뀐 시행만 (후보, 캐릭터) 칸으로 모아 더하고 뺀다
+        changed = new_win != win
+        slot = np.arange(len(cis))[:, None] * num_c
+        gained = (slot + new_win)[changed & (new_win >= 0)]
+        lost = (slot + win)[changed & (win >= 0)]
+        size = len(cis) * num_c
+        delta = np.bincount(gained, minlength=size) - np.bincount(lost, minlength=size)
+        return self.counts + delta.reshape(len(cis), num_c)
+
+    def preview(self, qi, oi, ci, value):
+        """(질문, 선택지, 캐릭터) 점수를 value 로 바꿨을 때의 캐릭터별 승리 횟수"""
+        return self.preview_many(qi, oi, [ci], [value])[0]
+
+    def _update_counts(self, rows):
+        before = self._count(self.top1[rows])
+        self._refresh(rows)
+        self.counts += self._count(self.top1[rows]) - before
+
+    def set_score(self, qi, oi, ci, value):
+        """점수 한 칸을 바꾸고 그 선택지를 고른 시행만 갱신"""
+        rows = self.rows[qi][oi]
+        old = int(self.values[qi, oi, ci])
+        scores = self.questions[qi]['options'][oi]['scores']
+        if self.codes[qi, oi, ci] == self.not_seen:
+            self.codes[qi, oi, ci] = self._new_code(qi, oi)
+            self.first_t[ci, rows] = np.minimum(self.first_t[ci, rows], self.codes[qi, oi, ci])
+        scores[self.characters[ci]] = int(value)
+        self.values[qi, oi, ci] = value
+        self.totals_t[ci, rows] += value - old
+        self._update_counts(rows)
+
+    def set_option(self, qi, oi, scores):
+        """선택지 점수 딕셔너리 전체를 교체 (항목 삭제/순서 변경 포함)"""
+        unknown = [c for c in scores if c not in self.char_index]
+        if unknown:
+            raise ValueError(f"평가 상태에 없는 캐릭터: {unknown}")
+        if len(scores) > self.stride:
+            raise ValueError(f"선택지 항목이 너무 많습니다: {len(scores)}")
+
+        rows = self.rows[qi][oi]
+        old = self.values[qi, oi].copy()
+        self.values[qi, oi] = 0
+        self.codes[qi, oi] = self.not_seen
+        for pos, (character, score) in enumerate(scores.items()):
+            ci = self.char_index[character]
+            self.values[qi, oi, ci] = score
+            self.codes[qi, oi, ci] = qi * self.stride + pos
+        self.questions[qi]['options'][oi]['scores'] = dict(scores)
+
+        self.totals_t[:, rows] += (self.values[qi, oi] - old)[:, None]
+        # 삭제/순서 변경은 최초 등장 코드를 해당 시행만 처음부터 다시 계산
+        picked = self.answers[rows]
+        self.first_t[:, rows] = self.codes[np.arange(len(self.questions)), picked].min(axis=1).T
+        self._update_counts(rows)
+
+    def rates(self):
+        """캐릭터별 승리 비율"""
+        return self.counts / len(self.answers)
+
+    def to_dict(self):
+        """{캐릭터: 승리 횟수} (0 은 생략)"""
+        return {c: int(n) for c, n in zip(self.characters, self.counts) if n}
+
+
+def from_questions(questions, characters=None, trials=SAMPLE_TRIALS, seed=0):
+    """질문 세트 사본으로 평가 상태 생성"""
+    if characters is None:
+        characters = collect_characters(questions)
+    answers = sample_uniform_answers(questions, trials, np.random.default_rng(seed))
+    return EvaluationState(copy.deepcopy(questions), list(characters), answers)
+
+
+def print_rates(state, previous=None):
+    for ci, character in enumerate(state.characters):
+        rate = state.counts[ci] / len(state.answers) * 100
+        delta = ""
+        if previous is not None:
+            change = (state.counts[ci] - previous[ci]) / len(state.answers) * 100
+            delta = f" ({change:+.2f})" if change else ""
+        print(f"  {character:<12} {rate:6.2f}%{delta}")
+
+
+def main():
+    """대화형 점수 조정: '<질문번호> <선택지번호> <캐릭터> <점수>' 를 입력"""
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    state = from_questions(create_biblically_balanced_questions())
+    print(f"📊 현재 분포 ({len(state.answers):,}개 표본):")
+    print_rates(state)
+    print("\n✏️  '<질문번호> <선택지번호> <캐릭터> <점수>' 입력 (종료: q)")
+    while True:
+        try:
+            line = input("> ").strip()
+        except EOFError:
+            break
+        if not line:
+            continue
+        if line == "q":
+            break
+        try:
+            q, o, character, value = line.split()
+            qi, oi, value = int(q) - 1, int(o) - 1, int(value)
+            ci = state.char_index[character]
+            state.questions[qi]['options'][oi]
+        except (ValueError, KeyError, IndexError):
+            print("❌ 형식: 1 4 esther 5")
+            continue
+        previous = state.counts.copy()
+        start = time.perf_counter()
+        state.set_score(qi, oi, ci, value)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✅ 갱신 {len(state.rows[qi][oi]):,}개 시행, {elapsed:.1f}ms")
+        print_rates(state, previous)
+
+
+if __name__ == "__main__":
+    main()
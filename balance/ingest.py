@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""실제 응답 로그(JSONL) 를 메모리 고정으로 읽어 집계하고 시뮬레이션과 비교
+
+로그 한 줄은 완료된 퀴즈 하나다. 다음 형식을 받는다.
+- {"answerChoices": {"1": 0, "2": 3, ...}, "resultCharacter": {...}}  앱의 AssessmentResult JSON
+  (질문 id -> 선택지 번호, resultCharacter 는 id/englishName 이 있는 딕셔너리나 캐릭터 ID)
+- {"answers": [0, 3, ...], "winner": "moses"}  질문 순서대로 선택지 번호 (0부터)
+- [0, 3, ...]  응답 벡터만
+
+줄을 CHUNK_SIZE 개씩 uint8 버퍼에 모아 engine 으로 한 번에 채점하고, 캐릭터별 승리 수,
+질문/선택지별 선택 수, 선택지별 승자 분포만 누적하므로 로그 크기와 상관없이 메모리가 일정하다.
+깨진 줄은 이유별로 세고 건너뛴다. 로그에 승자가 있으면 채점 결과와 다른 줄 수도 센다.
+.gz 로그는 gzip 으로 바로 읽는다.
+"""
+
+import json
+
+import numpy as np
+
+from balance.engine import count_winners, score_answers, winners
+
+CHUNK_SIZE = 1 << 14
+REPORT_EVERY = 1 << 20  # 진행 콜백 간격 (줄 수)
+BAD_REASONS = ("json", "format", "incomplete", "range")
+
+
+class LogStats:
+    """응답 로그 누적 집계"""
+
+    def __init__(self, compiled):
+        num_q, max_options, num_c = compiled.scores.shape
+        self.characters = compiled.characters
+        self.question_ids = [q.get('id', i + 1) for i, q in enumerate(compiled.questions)]
+        self.counts = np.zeros(num_c, dtype=np.int64)                              # 캐릭터별 승리 수
+        self.option_counts = np.zeros((num_q, max_options), dtype=np.int64)        # 질문/선택지별 선택 수
+        self.option_winners = np.zeros((num_q, max_options, num_c), dtype=np.int64)  # 선택지를 고른 응답의 승자 분포
+        self.lines = 0
+        self.scored = 0
+        self.no_winner = 0                        # 점수를 받은 캐릭터가 없는 응답
+        self.bad = {reason: 0 for reason in BAD_REASONS}
+        self.logged = 0                           # 로그에 승자가 있던 줄
+        self.mismatched = 0                       # 그중 채점 승자와 다른 줄
+
+    @property
+    def skipped(self):
+        return sum(self.bad.values())
+
+    def option_rates(self):
+        """(Q, O) 질문별 선택지 선택 비율"""
+        totals = self.option_counts.sum(axis=1, keepdims=True)
+        return np.divide(self.option_counts, totals, out=np.zeros(self.option_counts.shape), where=totals > 0)
+
+    def to_dict(self):
+        return {
+            "lines": self.lines,
+            "scored": self.scored,
+            "bad": dict(self.bad),
+            "no_winner": self.no_winner,
+            "logged_winner": self.logged,
+            "mismatched_winner": self.mismatched,
+            "counts": {c: int(n) for c, n in zip(self.characters, self.counts) if n},
+            "options": {str(qid): row.tolist() for qid, row in zip(self.question_ids, self.option_counts)},
+        }
+
+
+def _logged_winner(record, char_index):
+    """로그에 기록된 승자 인덱스, 없거나 모르는 캐릭터면 -1"""
+    from balance.data import character_id
+
+    value = record.get('winner', record.get('resultCharacter'))
+    if isinstance(value, dict):
+        value = value.get('id') or (character_id(value['englishName']) if value.get('englishName') else None)
+    if not isinstance(value, str):
+        return -1
+    index = char_index.get(value)
+    return char_index.get(character_id(value), -1) if index is None else index
+
+
+def parse_line(line, id_keys, char_index):
+    """로그 한 줄을 (응답 목록, 로그 승자 인덱스) 로, 깨진 줄은 ValueError(이유)"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise ValueError("json")
+    logged = -1
+    if isinstance(record, dict):
+        logged = _logged_winner(record, char_index)
+        if isinstance(record.get('answerChoices'), dict):
+            choices = record['answerChoices']
+            try:
+                record = [choices[key] for key in id_keys]
+            except KeyError:
+                raise ValueError("incomplete")
+        else:
+            record = record.get('answers')
+    if not isinstance(record, list):
+        raise ValueError("format")
+    if len(record) != len(id_keys):
+        raise ValueError("incomplete")
+    if not all(type(a) is int for a in record):
+        raise ValueError("format")
+    return record, logged
+
+
+def _score_chunk(stats, compiled, answers, logged):
+    """(n, Q) 청크를 채점해 누적"""
+    num_q, max_options, num_c = compiled.scores.shape
+    win = winners(compiled, score_answers(compiled, answers))
+    stats.counts += count_winners(compiled, win)
+    stats.no_winner += int((win < 0).sum())
+    stats.scored += len(answers)
+
+    flat = np.arange(num_q) * max_options + answers  # (n, Q) 질문/선택지 칸 번호
+    stats.option_counts += np.bincount(flat.ravel(), minlength=num_q * max_options).reshape(num_q, max_options)
+    valid = win >= 0
+    cells = (flat[valid] * num_c + win[valid, None]).ravel()
+    stats.option_winners += np.bincount(cells, minlength=num_q * max_options * num_c).reshape(
+        num_q, max_options, num_c)
+
+    checked = logged >= 0
+    stats.logged += int(checked.sum())
+    stats.mismatched += int((logged[checked] != win[checked]).sum())
+
+
+def ingest(compiled, lines, chunk_size=CHUNK_SIZE, progress=None):
+    """JSONL 줄 반복자를 청크 단위로 채점해 LogStats 반환"""
+    stats = LogStats(compiled)
+    id_keys = [str(qid) for qid in stats.question_ids]
+    limits = compiled.option_counts
+    buffer = np.empty((chunk_size, compiled.num_questions), dtype=np.int64)
+    logged = np.empty(chunk_size, dtype=np.int64)
+    n = 0
+    next_report = REPORT_EVERY
+    for line in lines:
+        if not line.strip():
+            continue
+        stats.lines += 1
+        try:
+            row, winner = parse_line(line, id_keys, compiled.char_index)
+            buffer[n] = row
+        except ValueError as e:
+            stats.bad[e.args[0] if e.args and e.args[0] in stats.bad else "format"] += 1
+            continue
+        except OverflowError:
+            stats.bad["range"] += 1
+            continue
+        if ((buffer[n] < 0) | (buffer[n] >= limits)).any():
+            stats.bad["range"] += 1
+            continue
+        logged[n] = winner
+        n += 1
+        if n == chunk_size:
+            _score_chunk(stats, compiled, buffer.astype(np.uint8), logged)
+            n = 0
+        if progress and stats.lines >= next_report:
+            progress(stats)
+            next_report += REPORT_EVERY
+    if n:
+        _score_chunk(stats, compiled, buffer[:n].astype(np.uint8), logged[:n])
+    return stats
+
+
+def open_log(path):
+    """로그 파일을 텍스트 줄 반복자로 연다 (.gz 지원, "-" 는 표준 입력)"""
+    import sys
+
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        import gzip
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, encoding='utf-8', errors='replace')
+
+
+def observed_model(stats):
+    """로그의 질문별 선택 비율로 만든 응답자 모델 (balance.respondents.TableModel)"""
+    from balance.respondents import TableModel
+
+    return TableModel({str(qid): row.tolist() for qid, row in zip(stats.question_ids, stats.option_counts)
+                       if row.sum() > 0})
+
+
+class Comparison:
+    """관측 분포와 시뮬레이션 분포 비교"""
+
+    def __init__(self, characters, observed, expected, trials):
+        self.characters = characters
+        self.observed = observed  # (C,) 관측 승리 수
+        self.expected = expected  # {이름: (C,) 시뮬레이션 승리 비율}
+        self.trials = trials      # 시뮬레이션 시행 수
+
+    def chi_square(self, name):
+        """(카이제곱 통계량, 자유도), 시뮬레이션 비율이 0 인 캐릭터는 관측도 0 이어야 하므로 따로 본다"""
+        total = self.observed.sum()
+        expected = self.expected[name] * total
+        used = expected > 0
+        stat = float((((self.observed[used] - expected[used]) ** 2) / expected[used]).sum())
+        return stat, max(int(used.sum()) - 1, 0)
+
+
+def compare(compiled, stats, trials=1 << 20, seed=0):
+    """균등 응답과 로그 선택 비율 모델로 시뮬레이션해 관측 분포와 비교"""
+    from balance.engine import simulate
+    from balance.respondents import simulate_model
+
+    expected = {"uniform": simulate(compiled, trials, np.random.default_rng(seed)) / trials}
+    if stats.option_counts.any():
+        model = observed_model(stats)
+        expected["observed_options"] = simulate_model(compiled, model, trials, np.random.default_rng(seed)) / trials
+    return Comparison(compiled.characters, stats.counts, expected, trials)
+
+
+def print_report(stats, comparison):
+    print(f"\n📥 로그 {stats.lines:,}줄, 채점 {stats.scored:,}건, 건너뜀 {stats.skipped:,}줄 "
+          f"({', '.join(f'{k} {v:,}' for k, v in stats.bad.items() if v) or '없음'})")
+    if stats.logged:
+        mark = "✅" if not stats.mismatched else "⚠️ "
+        print(f"{mark} 로그 승자와 채점 승자 불일치 {stats.mismatched:,}/{stats.logged:,}건")
+
+    total = max(int(stats.counts.sum()), 1)
+    names = list(comparison.expected)
+    header = " | ".join(f"{name + '(%)':^16}" for name in names)
+    print(f"\n{'캐릭터':^15} | {'관측(%)':^8} | {header}")
+    print("-" * (30 + 19 * len(names)))
+    for i in np.argsort(-stats.counts, kind="stable"):
+        observed = stats.counts[i] / total * 100
+        cells = " | ".join(f"{comparison.expected[name][i] * 100:>7.2f} ({observed - comparison.expected[name][i] * 100:+6.2f})"
+                           for name in names)
+        print(f"{stats.characters[i]:^15} | {observed:^8.2f} | {cells}")
+    for name in names:
+        stat, dof = comparison.chi_square(name)
+        print(f"📐 {name}: 카이제곱 {stat:.1f} (자유도 {dof})")
+
+
+def main():
+    import sys
+    from balance.cli import main as cli_main
+
+    sys.exit(cli_main(["ingest", *sys.argv[1:]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""시뮬레이션 승자를 MBTI 유형과 네 축(E/I, S/N, T/F, J/P)으로 집계
+
+여러 캐릭터가 같은 유형을 공유하므로(ISTJ, ISFJ, INTJ 가 둘씩) 캐릭터 분포가 고르더라도
+유형과 축 분포는 기울 수 있다. 캐릭터 번호 -> 유형 번호 배열과 유형 -> 축 글자(0: 앞 글자, 1: 뒷 글자)
+배열을 미리 만들어 두고, 승자 배열이나 캐릭터별 승리 횟수를 정수 인덱싱과 bincount 로만 바꾼다.
+시행마다 문자열을 다루지 않는다.
+
+승자마다 유형이 하나로 정해지므로 캐릭터별 승리 횟수를 유형으로 더한 값은 시행별로 센 값과 같다.
+그래서 어느 엔진이든 한 번 돌린 카운터(또는 캐시된 결과)에서 바로 나온다.
+신뢰구간은 비율마다 Wilson 구간이다 (balance.adaptive.wilson_interval).
+"""
+
+import numpy as np
+
+from balance.adaptive import wilson_interval
+
+AXES = (("E", "I"), ("S", "N"), ("T", "F"), ("J", "P"))
+Z = 1.96  # 95% 신뢰구간
+
+
+class MbtiLookup:
+    """캐릭터 -> MBTI 유형 -> 축 조회 배열"""
+
+    def __init__(self, characters, mbti):
+        self.characters = list(characters)
+        self.types = sorted({mbti[c] for c in self.characters if c in mbti})
+        type_index = {t: i for i, t in enumerate(self.types)}
+        num_t = len(self.types)
+        # 마지막 칸은 승자 없음(-1) 과 유형 모르는 캐릭터가 모이는 칸, win = -1 이 그대로 이 칸을 가리킨다
+        self.char_type = np.array([type_index.get(mbti.get(c), num_t) for c in self.characters] + [num_t],
+                                  dtype=np.int64)
+        self.type_axes = np.array([[axis.index(t[a]) for a, axis in enumerate(AXES)] for t in self.types],
+                                  dtype=np.int64).reshape(num_t, len(AXES))
+
+    @property
+    def num_types(self):
+        return len(self.types)
+
+    def count_types(self, win):
+        """승자 배열 (n,) -> 유형별 시행 수 (T + 1,), 마지막은 유형 없음"""
+        return np.bincount(self.char_type[win], minlength=self.num_types + 1)
+
+    def types_from_counts(self, counts):
+        """캐릭터별 승리 횟수 (C,) -> 유형별 시행 수 (T + 1,)"""
+        out = np.zeros(self.num_types + 1, dtype=np.int64)
+        np.add.at(out, self.char_type[:len(self.characters)], np.asarray(counts, dtype=np.int64))
+        return out
+
+    def axis_counts(self, type_counts):
+        """유형별 시행 수 -> (4, 2) 축별 앞/뒤 글자 시행 수"""
+        typed = type_counts[:self.num_types]
+        second = self.type_axes.T @ typed
+        return np.stack([typed.sum() - second, second], axis=1)
+
+
+def load_lookup(characters, path=None):
+    """캐릭터 JSON 의 mbti 로 조회 배열 생성"""
+    from balance.data import CHARACTERS_PATH, character_id, load_characters
+
+    mbti = {character_id(c['englishName']): c['mbti'].upper()
+            for c in load_characters(path or CHARACTERS_PATH) if c.get('mbti')}
+    return MbtiLookup(characters, mbti)
+
+
+class MbtiResult:
+    """유형/축 분포와 신뢰구간"""
+
+    def __init__(self, lookup, type_counts, trials):
+        self.types = lookup.types
+        self.type_counts = type_counts[:lookup.num_types]  # (T,) 유형별 시행 수
+        self.unassigned = int(type_counts[lookup.num_types])  # 승자 없음 또는 유형 모르는 캐릭터
+        self.axis_counts = lookup.axis_counts(type_counts)  # (4, 2)
+        self.trials = trials
+
+    def type_rates(self):
+        return self.type_counts / self.trials
+
+    def axis_rates(self):
+        return self.axis_counts / self.trials
+
+    def type_intervals(self, z=Z):
+        return wilson_interval(self.type_counts, self.trials, z)
+
+    def axis_intervals(self, z=Z):
+        return wilson_interval(self.axis_counts, self.trials, z)
+
+    def to_dict(self, z=Z):
+        type_low, type_high = self.type_intervals(z)
+        axis_low, axis_high = self.axis_intervals(z)
+        return {
+            "trials": self.trials,
+            "unassigned": self.unassigned,
+            "types": {t: {"count": int(n), "rate": n / self.trials, "ci": [float(lo), float(hi)]}
+                      for t, n, lo, hi in zip(self.types, self.type_counts.tolist(), type_low, type_high)},
+            "axes": {letter: {"count": int(self.axis_counts[a, s]), "rate": self.axis_counts[a, s] / self.trials,
+                              "ci": [float(axis_low[a, s]), float(axis_high[a, s])]}
+                     for a, axis in enumerate(AXES) for s, letter in enumerate(axis)},
+        }
+
+
+def aggregate(lookup, counts, trials):
+    """캐릭터별 승리 횟수에서 MbtiResult"""
+    return MbtiResult(lookup, lookup.types_from_counts(counts), trials)
+
+
+def print_report(result, z=Z):
+    axis_low, axis_high = result.axis_intervals(z)
+    print(f"\n🧭 MBTI 축 분포 ({result.trials:,}번 테스트, 95% 신뢰구간)")
+    print(f"{'축':^6} | {'앞 글자(%)':^24} | {'뒷 글자(%)':^24} | {'50:50':^5}")
+    print("-" * 70)
+    for a, (first, second) in enumerate(AXES):
+        cells = [f"{letter} {result.axis_counts[a, s] / result.trials * 100:6.2f} "
+                 f"[{axis_low[a, s] * 100:5.2f}, {axis_high[a, s] * 100:5.2f}]"
+                 for s, letter in enumerate((first, second))]
+        even = "✅" if axis_low[a, 0] <= 0.5 <= axis_high[a, 0] else "🔶"
+        print(f"{first + '/' + second:^6} | {cells[0]:^24} | {cells[1]:^24} | {even:^5}")
+
+    type_low, type_high = result.type_intervals(z)
+    print(f"\n{'유형':^6} | {'매칭수':^10} | {'비율(%)':^8} | {'95% 구간(%)':^16}")
+    print("-" * 50)
+    for t in np.argsort(-result.type_counts, kind="stable"):
+        print(f"{result.types[t]:^6} | {int(result.type_counts[t]):^10,} | "
+              f"{result.type_counts[t] / result.trials * 100:^8.2f} | "
+              f"{f'{type_low[t] * 100:.2f} ~ {type_high[t] * 100:.2f}':^16}")
+    if result.unassigned:
+        print(f"⚠️  유형 없음(승자 없음/모르는 캐릭터) {result.unassigned:,}회")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""시뮬레이션 단계별 타이머, 처리량 카운터, 진행 콜백과 내보내기
+
+단계 이름은 compile, sample, accumulate, select, report 를 쓴다.
+측정을 끄면 NULL_METRICS 를 쓰는데, stage() 가 미리 만든 빈 컨텍스트를 돌려주고
+add()/tick() 은 아무 일도 하지 않아서 배치(1만 6천 시행)당 비용이 마이크로초 수준이다.
+
+    metrics = Metrics(progress=lambda m: print(m.counters["trials"]), interval=1.0)
+    counts = simulate(compiled, trials, rng, metrics=metrics)
+    metrics.save("run.json")   # 확장자가 .prom 이면 Prometheus 텍스트 형식
+"""
+
+import json
+import time
+
+STAGES = ("compile", "sample", "accumulate", "select", "report")
+PROGRESS_INTERVAL = 5.0  # 진행 콜백 최소 간격 (초)
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.metrics.seconds[self.name] = self.metrics.seconds.get(self.name, 0.0) + elapsed
+        self.metrics.calls[self.name] = self.metrics.calls.get(self.name, 0) + 1
+        return False
+
+
+class Metrics:
+    """단계별 누적 시간/호출 수와 카운터"""
+
+    enabled = True
+
+    def __init__(self, progress=None, interval=PROGRESS_INTERVAL):
+        self.seconds = {}
+        self.calls = {}
+        self.counters = {}
+        self.progress = progress
+        self.interval = interval
+        self.started = time.perf_counter()
+        self._next_progress = self.started + interval
+
+    def stage(self, name):
+        """with metrics.stage("sample"): ... 로 단계 시간 누적"""
+        return _Timer(self, name)
+
+    def add(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def tick(self, done=None, total=None):
+        """interval 초마다 진행 콜백 호출"""
+        if done is not None:
+            self.counters["done"] = done
+        if total is not None:
+            self.counters["total"] = total
+        if self.progress is None:
+            return
+        now = time.perf_counter()
+        if now >= self._next_progress:
+            self._next_progress = now + self.interval
+            self.progress(self)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def rate(self, name="trials"):
+        """시작 이후 초당 카운터 증가량"""
+        elapsed = self.elapsed
+        return self.counters.get(name, 0) / elapsed if elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            "elapsed_seconds": self.elapsed,
+            "stages": {name: {"seconds": self.seconds[name], "calls": self.calls[name]} for name in self.seconds},
+            "counters": dict(self.counters),
+            "trials_per_second": self.rate("trials"),
+        }
+
+    def to_prometheus(self, prefix="balance"):
+        """Prometheus 텍스트 노출 형식"""
+        lines = [
+            f"# TYPE {prefix}_stage_seconds_total counter",
+            *(f'{prefix}_stage_seconds_total{{stage="{n}"}} {s:.6f}' for n, s in self.seconds.items()),
+            f"# TYPE {prefix}_stage_calls_total counter",
+            *(f'{prefix}_stage_calls_total{{stage="{n}"}} {c}' for n, c in self.calls.items()),
+        ]
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {prefix}_{name} gauge" if name in ("done", "total")
+                         else f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name} {value}" if name in ("done", "total")
+                         else f"{prefix}_{name}_total {value}")
+        lines.append(f"# TYPE {prefix}_elapsed_seconds gauge")
+        lines.append(f"{prefix}_elapsed_seconds {self.elapsed:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """확장자 .prom/.txt 는 Prometheus 형식, 그 외는 JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith((".prom", ".txt")):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class NullMetrics:
+    """측정을 끈 상태, 모든 호출이 즉시 반환된다"""
+
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_TIMER
+
+    def add(self, name, value=1):
+        pass
+
+    def tick(self, done=None, total=None):
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""목표 승리 분포에 맞춰 선택지 점수를 자동으로 조정하는 최적화기
+
+create_biblically_balanced_questions 의 숫자를 손으로 고치고 다시 돌리는 대신,
+점수 한 칸을 ±1 (또는 새 캐릭터 추가) 하는 편집을 반복해 목표 분포와의 오차를 줄인다.
+
+모든 후보 편집은 같은 응답 표본(common random numbers) 위에서 비교한다.
+incremental.EvaluationState 가 시행별 총점과 1, 2위 정렬 키를 들고 있어서, 편집 하나를 평가할 때
+그 선택지를 고른 시행의 해당 캐릭터 키만 다시 계산하면 된다.
+"""
+
+import copy
+import time
+
+import numpy as np
+
+from balance.engine import collect_characters, compile_questions, simulate
+from balance.incremental import EvaluationState, sample_uniform_answers
+
+SCORE_RANGE = (1, 5)
+SAMPLE_TRIALS = 1 << 15
+VALIDATION_TRIALS = 1 << 20
+MAX_ITERATIONS = 200
+
+
+class OptimizeResult:
+    """최적화 결과"""
+
+    def __init__(self, questions, diff, characters, target, before, after,
+                 iterations, evaluated, elapsed):
+        self.questions = questions
+        self.diff = diff
+        self.characters = characters
+        self.target = target
+        self.before = before  # 표본 기준 시작 분포
+        self.after = after    # 표본 기준 최종 분포
+        self.iterations = iterations
+        self.evaluated = evaluated
+        self.elapsed = elapsed
+
+    @property
+    def evaluations_per_second(self):
+        return self.evaluated / self.elapsed if self.elapsed else 0.0
+
+
+def squared_error(counts, target):
+    """승리 비율과 목표 분포의 제곱 오차 합, counts 가 (k, C) 면 후보별 오차"""
+    total = counts.sum(axis=-1, keepdims=True)
+    rates = counts / np.maximum(total, 1)
+    return ((rates - target) ** 2).sum(axis=-1)
+
+
+def uniform_target(characters):
+    """균등 목표 분포 {캐릭터: 1/n}"""
+    return {c: 1 / len(characters) for c in characters}
+
+
+def _candidates(evaluator, edits, score_range, max_edits_per_option, allow_add):
+    """선택지별로 가능한 한 칸 편집 (질문, 선택지, 캐릭터 목록, 새 점수 목록)"""
+    low, high = score_range
+    values = evaluator.values
+    for qi, question in enumerate(evaluator.questions):
+        for oi in range(len(question['options'])):
+            edited = edits.get((qi, oi), set())
+            full = max_edits_per_option is not None and len(edited) >= max_edits_per_option
+            cis, news = [], []
+            for ci in range(evaluator.num_characters):
+                value = int(values[qi, oi, ci])
+                if full and ci not in edited:
+                    continue
+                if value == 0:
+                    if allow_add:
+                        cis.append(ci)
+                        news.append(low)
+                    continue
+                for new in (value - 1, value + 1):
+                    if low <= new <= high:
+                        cis.append(ci)
+                        news.append(new)
+            if cis:
+                yield qi, oi, cis, news
+
+
+def option_diff(original, edited):
+    """두 질문 세트의 점수 차이 목록"""
+    diff = []
+    for q_old, q_new in zip(original, edited):
+        for oi, (o_old, o_new) in enumerate(zip(q_old['options'], q_new['options'])):
+            for character, value in o_new['scores'].items():
+                before = o_old['scores'].get(character)
+                if before != value:
+                    diff.append({
+                        "question": q_new.get('id', None),
+                        "option": oi,
+                        "text": o_new.get('text', ''),
+                        "character": character,
+                        "before": before,
+                        "after": value,
+                    })
+    return diff
+
+
+def optimize(questions, target, trials=SAMPLE_TRIALS, seed=0, score_range=SCORE_RANGE,
+             max_edits_per_option=None, allow_add=False, max_iterations=MAX_ITERATIONS,
+             progress=None):
+    """목표 분포에 가까워지도록 점수를 한 칸씩 조정 (최대 개선 편집을 반복 적용)"""
+    characters = collect_characters(questions)
+    characters += [c for c in target if c not in characters]
+    target_vec = np.array([target.get(c, 0.0) for c in characters], dtype=np.float64)
+    target_vec /= target_vec.sum()
+
+    answers = sample_uniform_answers(questions, trials, np.random.default_rng(seed))
+    evaluator = EvaluationState(copy.deepcopy(questions), characters, answers)
+    original = evaluator.values.copy()
+    edits = {}
+    before = evaluator.counts.copy()
+    loss = float(squared_error(before, target_vec))
+
+    evaluated = 0
+    iterations = 0
+    start = time.perf_counter()
+    while iterations < max_iterations:
+        best = None
+        for qi, oi, cis, news in _candidates(evaluator, edits, score_range, max_edits_per_option, allow_add):
+            losses = squared_error(evaluator.preview_many(qi, oi, cis, news), target_vec)
+            evaluated += len(cis)
+            k = int(losses.argmin())
+            if best is None or losses[k] < best[0]:
+                best = (float(losses[k]), (qi, oi, cis[k], news[k]))
+        if best is None or best[0] >= loss - 1e-12:
+            break
+
+        loss, (qi, oi, ci, value) = best
+        evaluator.set_score(qi, oi, ci, value)
+        changed = edits.setdefault((qi, oi), set())
+        if value == original[qi, oi, ci]:
+            changed.discard(ci)
+        else:
+            changed.add(ci)
+        iterations += 1
+        if progress:
+            progress(iterations, loss)
+    elapsed = time.perf_counter() - start
+
+    return OptimizeResult(
+        evaluator.questions, option_diff(questions, evaluator.questions), characters,
+        target_vec, before, evaluator.counts.copy(), iterations, evaluated, elapsed,
+    )
+
+
+def validate(questions, characters, trials=VALIDATION_TRIALS, seed=1):
+    """표본과 다른 seed 로 다시 시뮬레이션한 캐릭터별 승리 비율"""
+    compiled = compile_questions(questions, characters)
+    counts = simulate(compiled, trials, np.random.default_rng(seed))
+    return counts / trials
+
+
+def main():
+    from balance.data import load_character_ids
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    questions = create_biblically_balanced_questions()
+    target = uniform_target(load_character_ids())
+
+    def progress(iteration, loss):
+        print(f"\r🔧 {iteration}회 편집, 오차 {loss:.5f}", end="", flush=True)
+
+    result = optimize(questions, target, progress=progress)
+    print(f"\n\n⚡ 후보 {result.evaluated:,}개 평가 ({result.evaluations_per_second:,.0f}개/초)")
+
+    print(f"\n📝 변경 내역 ({len(result.diff)}칸):")
+    for d in result.diff:
+        before = "-" if d['before'] is None else d['before']
+        print(f"  Q{d['question']} 선택지{d['option'] + 1} {d['character']}: {before} → {d['after']}")
+
+    fresh = validate(result.questions, result.characters)
+    trials = result.before.sum()
+    print(f"\n{'캐릭터':^15} | {'목표(%)':^8} | {'이전(%)':^8} | {'이후(%)':^8} | {'검증(%)':^8}")
+    print("-" * 60)
+    for i, c in enumerate(result.characters):
+        print(f"{c:^15} | {result.target[i] * 100:^8.2f} | {result.before[i] / trials * 100:^8.2f} | "
+              f"{result.after[i] / trials * 100:^8.2f} | {fresh[i] * 100:^8.2f}")
+
+
+if __name__ == "__main__":
+    main()
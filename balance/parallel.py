@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""프로세스 풀로 시행을 샤드 단위로 나눠 돌리는 병렬 시뮬레이션
+
+샤드 경계는 시행 수와 shard_trials 로만 정해지고, 샤드 i 의 난수 스트림은
+SeedSequence(seed, spawn_key=(i,)) 에서 나온다. 샤드별 카운터는 정수 합으로
+병합하므로 같은 seed 면 workers 가 몇이든 결과가 비트 단위로 같다.
+counter=True 면 샤드가 카운터 기반 스트림(balance.streams)의 자기 구간을 쓰므로
+shard_trials 를 바꿔도, 단일 프로세스 엔진과 비교해도 결과가 같다.
+"""
+
+import os
+
+import numpy as np
+
+from balance.engine import DEFAULT_BATCH_SIZE, compile_questions, simulate
+from balance.metrics import NULL_METRICS
+
+SHARD_TRIALS = 1 << 20
+
+_worker_compiled = None
+
+
+def shard_plan(trials, shard_trials=SHARD_TRIALS):
+    """(샤드 번호, 시행 수) 목록"""
+    return [(i, min(shard_trials, trials - start))
+            for i, start in enumerate(range(0, trials, shard_trials))]
+
+
+def shard_rng(seed, index):
+    """마스터 seed 에서 샤드 번호로 갈라진 독립 난수 생성기"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+def run_shard(compiled, seed, index, trials, batch_size=DEFAULT_BATCH_SIZE, start=None):
+    """샤드 하나의 캐릭터별 승리 횟수, start 를 주면 카운터 스트림의 [start, start + trials) 구간"""
+    if start is not None:
+        from balance.streams import simulate_counter
+        return simulate_counter(compiled, trials, seed, start, batch_size)
+    return simulate(compiled, trials, shard_rng(seed, index), batch_size)
+
+
+def merge_counts(parts, num_characters):
+    """샤드별 카운터 병합"""
+    total = np.zeros(num_characters, dtype=np.int64)
+    for part in parts:
+        total += part
+    return total
+
+
+def _tracked(results, metrics, trials):
+    """(시행 수, 카운터) 결과를 metrics 에 기록하면서 카운터만 흘려보낸다"""
+    done = 0
+    for n, part in results:
+        done += n
+        metrics.add("trials", n)
+        metrics.add("shards")
+        metrics.tick(done, trials)
+        yield part
+
+
+def _init_worker(questions, characters):
+    global _worker_compiled
+    _worker_compiled = compile_questions(questions, characters)
+
+
+def _run_worker_shard(args):
+    seed, index, trials, batch_size, start = args
+    return trials, run_shard(_worker_compiled, seed, index, trials, batch_size, start)
+
+
+def simulate_sharded(compiled, trials, seed, workers=None, shard_trials=SHARD_TRIALS,
+                     batch_size=DEFAULT_BATCH_SIZE, metrics=NULL_METRICS, counter=False):
+    """시행을 샤드로 나눠 여러 프로세스에서 시뮬레이션, 캐릭터별 승리 횟수 반환
+
+    metrics 에는 샤드 단위 진행만 기록한다 (워커 안의 단계 시간은 재지 않는다).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    plan = shard_plan(trials, shard_trials)
+    workers = max(1, min(workers, len(plan)))
+    starts = [i * shard_trials if counter else None for i, _ in plan]
+
+    if workers == 1:
+        parts = ((n, run_shard(compiled, seed, i, n, batch_size, start)) for (i, n), start in zip(plan, starts))
+        return merge_counts(_tracked(parts, metrics, trials), compiled.num_characters)
+
+    from multiprocessing import Pool
+    tasks = [(seed, i, n, batch_size, start) for (i, n), start in zip(plan, starts)]
+    with Pool(workers, initializer=_init_worker,
+              initargs=(compiled.questions, compiled.characters)) as pool:
+        parts = pool.imap_unordered(_run_worker_shard, tasks)
+        return merge_counts(_tracked(parts, metrics, trials), compiled.num_characters)
+
+
+def simulate_distribution_sharded(questions, trials=10000, seed=None, workers=None,
+                                  shard_trials=SHARD_TRIALS):
+    """병렬 버전 simulate_distribution, seed 가 없으면 새로 뽑는다"""
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    compiled = compile_questions(questions)
+    counts = simulate_sharded(compiled, trials, seed, workers, shard_trials)
+    return compiled.to_dict(counts)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""캐릭터별 도달 가능성과 최소 확정 응답 수 계산 (분기 한정)
+
+샘플링으로는 "절대 안 나온다" 나 "한 경로로만 나온다" 를 증명할 수 없다.
+캐릭터 X 와 경쟁자 r 의 점수차 X - r 은 질문마다 독립적으로 더해지므로
+남은 질문에서 벌 수 있는 최대 점수차(질문별 최댓값의 합)가 정확한 상한이 된다.
+
+- 도달 가능성: 질문 순서대로 선택지를 고르며 내려가다가, 어떤 경쟁자에게든 남은 최대 점수차를
+  더해도 지면 가지를 친다. 끝에서는 앱과 같은 규칙(동점이면 먼저 들어간 캐릭터)으로 승자를 확인한다.
+  찾은 응답 벡터가 증거(witness)다.
+- 최소 확정 응답: 일부 질문의 답만 고정하고 나머지를 어떻게 골라도 X 가 이기려면
+  모든 경쟁자에 대해 (고정한 질문의 점수차 + 나머지 질문의 최소 점수차) >= 1 이어야 한다.
+  고정할 때마다 경쟁자별 최악 점수차가 올라가는 양을 덮는 문제로 보고,
+  탐욕해를 상한으로 둔 뒤 남은 칸 수로 얻을 수 있는 최대 증가량으로 가지를 쳐 최소 개수를 찾는다.
+  동점에 기대지 않는(점수차 1 이상) 확정이므로 어떤 동점 규칙에서도 성립한다.
+"""
+
+import numpy as np
+
+NODE_LIMIT = 2_000_000  # 캐릭터 하나에 쓰는 탐색 노드 상한
+
+
+class ReachResult:
+    """캐릭터 하나의 도달 가능성 결과"""
+
+    def __init__(self, character, reachable, witness, fixed, fixed_optimal, nodes):
+        self.character = character
+        self.reachable = reachable        # True / False / None (노드 상한 도달)
+        self.witness = witness            # 질문별 선택지 번호 (0부터), 없으면 None
+        self.fixed = fixed                # {질문 번호: 선택지 번호} 승리를 확정하는 최소 고정 응답, 없으면 None
+        self.fixed_optimal = fixed_optimal  # fixed 가 최소임이 증명됐는지
+        self.nodes = nodes
+
+    @property
+    def min_fixed(self):
+        return None if self.fixed is None else len(self.fixed)
+
+
+def winner_of(questions, answers):
+    """앱/test_balanced_distribution 과 같은 규칙의 승자, 점수가 없으면 None"""
+    scores = {}
+    for question, oi in zip(questions, answers):
+        for character, value in question['options'][oi]['scores'].items():
+            scores[character] = scores.get(character, 0) + value
+    return max(scores.items(), key=lambda x: x[1])[0] if scores else None
+
+
+def _diffs(questions, character, rivals):
+    """질문별, 선택지별 (X - 경쟁자) 점수차 목록, 마지막 칸은 X 자신의 점수 (X 가 0점보다 커야 등장)"""
+    table = []
+    for question in questions:
+        rows = []
+        for option in question['options']:
+            scores = option['scores']
+            x = scores.get(character, 0)
+            rows.append([x - scores.get(r, 0) for r in rivals] + [x])
+        table.append(rows)
+    return table
+
+
+def _suffix(table, pick):
+    """질문 q 부터 끝까지 경쟁자별 pick(max/min) 점수차의 합, (Q + 1) 행"""
+    width = len(table[0][0]) if table and table[0] else 0
+    suffix = [[0] * width]
+    for rows in reversed(table):
+        best = [pick(row[r] for row in rows) for r in range(width)]
+        suffix.append([a + b for a, b in zip(best, suffix[-1])])
+    suffix.reverse()
+    return suffix
+
+
+def find_witness(questions, character, rivals, node_limit=NODE_LIMIT):
+    """X 가 승자가 되는 응답 벡터 하나, (witness, 탐색 노드 수, 완료 여부)"""
+    table = _diffs(questions, character, rivals)
+    best = _suffix(table, max)
+    num_q = len(questions)
+    width = len(best[0])
+    # X 에게 유리한(최악 경쟁자 기준) 선택지부터 본다
+    orders = [sorted(range(len(rows)), key=lambda o: (-min(rows[o][:-1], default=0), -sum(rows[o])))
+              for rows in table]
+    path = []
+    nodes = 0
+
+    def dfs(q, diff):
+        nonlocal nodes
+        nodes += 1
+        if nodes > node_limit:
+            raise _Abort
+        if q == num_q:
+            return winner_of(questions, path) == character
+        for oi in orders[q]:
+            row = table[q][oi]
+            nxt = [d + v for d, v in zip(diff, row)]
+            bound = best[q + 1]
+            # 남은 질문에서 최대로 벌어도 지는 경쟁자가 있으면 가지치기
+            if any(nxt[r] + bound[r] < 0 for r in range(width - 1)):
+                continue
+            path.append(oi)
+            if dfs(q + 1, nxt):
+                return True
+            path.pop()
+        return False
+
+    try:
+        found = dfs(0, [0] * width)
+    except _Abort:
+        return None, nodes, False
+    return (list(path) if found else None), nodes, True
+
+
+class _Abort(Exception):
+    pass
+
+
+def guarantees_win(questions, character, fixed):
+    """fixed ({질문 번호: 선택지 번호}) 로 고정하면 나머지를 어떻게 골라도 character 가 1점 이상 앞서는지"""
+    from balance.engine import collect_characters
+
+    rivals = [c for c in collect_characters(questions) if c != character]
+    worst = [0] * (len(rivals) + 1)
+    for q, rows in enumerate(_diffs(questions, character, rivals)):
+        if q in fixed:
+            worst = [w + v for w, v in zip(worst, rows[fixed[q]])]
+        else:
+            worst = [w + min(row[r] for row in rows) for r, w in enumerate(worst)]
+    return all(w >= 1 for w in worst)
+
+
+def min_fixed_answers(questions, character, rivals, node_limit=NODE_LIMIT):
+    """승리를 확정하는 최소 고정 응답 ({질문 번호: 선택지 번호} 또는 None, 최소 증명 여부, 노드 수)"""
+    table = _diffs(questions, character, rivals)
+    num_q = len(questions)
+    if not num_q:
+        return None, True, 0
+    width = len(table[0][0])
+    max_options = max(len(rows) for rows in table)
+    diff = np.zeros((num_q, max_options, width), dtype=np.int64)
+    valid = np.zeros((num_q, max_options), dtype=bool)
+    for q, rows in enumerate(table):
+        diff[q, :len(rows)] = rows
+        valid[q, :len(rows)] = True
+    low = np.where(valid[:, :, None], diff, np.iinfo(np.int64).max).min(axis=1)
+    need = np.maximum(0, 1 - low.sum(axis=0))  # 경쟁자별로 채워야 하는 최악 점수차
+    # 질문 q 를 선택지 o 로 고정하면 경쟁자별 최악 점수차가 오르는 양 (없는 선택지는 0)
+    gains = np.where(valid[:, :, None], diff - low[:, None, :], 0)
+    if not need.any():
+        return {}, True, 0
+
+    # 탐욕해: 남은 부족분을 가장 많이 채우는 (질문, 선택지) 를 반복 선택, 막히면 상한 없이 탐색한다
+    best, left = {}, need.copy()
+    while left.any():
+        cover = np.minimum(gains, left).sum(axis=2)
+        cover[list(best)] = -1
+        q, o = np.unravel_index(int(cover.argmax()), cover.shape)
+        if cover[q, o] <= 0:
+            best = None
+            break
+        best[int(q)] = int(o)
+        left = np.maximum(0, left - gains[q, o])
+
+    # 같은 질문의 다른 선택지보다 모든 경쟁자에서 증가량이 같거나 작은 선택지는 볼 필요가 없다
+    branch = gains.copy()
+    for q in range(num_q):
+        for o in range(max_options):
+            for p in range(max_options):
+                if p != o and valid[q, p] and (gains[q, p] >= gains[q, o]).all() and \
+                        ((gains[q, p] > gains[q, o]).any() or p < o):
+                    branch[q, o] = 0
+                    break
+
+    # 증가량이 큰 질문부터 본다
+    top = gains.max(axis=1)
+    order = np.argsort(-top.sum(axis=1), kind="stable")
+    ordered = branch[order]
+    # suffix_top[i, b, r]: order[i:] 에서 b 개를 골라 경쟁자 r 이 얻는 최대 증가량
+    suffix_top = np.zeros((num_q + 1, num_q + 1, width), dtype=np.int64)
+    for i in range(num_q):
+        values = -np.sort(-top[order[i:]], axis=0)
+        suffix_top[i, 1:num_q - i + 1] = np.cumsum(values, axis=0)
+        suffix_top[i, num_q - i + 1:] = suffix_top[i, num_q - i]
+
+    nodes = 0
+
+    def dfs(i, left, chosen, budget):
+        """order[i:] 질문에서 budget 개 이하로 left 를 모두 채우는 고정을 찾는다"""
+        nonlocal nodes
+        nodes += 1
+        if nodes > node_limit:
+            raise _Abort
+        if not left.any():
+            return True
+        if budget == 0 or i == num_q:
+            return False
+        # 경쟁자별로 남은 질문 budget 개의 최대 증가량으로 한정
+        if (suffix_top[i, budget] < left).any():
+            return False
+        # 질문 하나가 채울 수 있는 부족분 합의 상위 budget 개로 한정
+        cover = np.minimum(ordered[i:], left).sum(axis=2)
+        caps = cover.max(axis=1)
+        if budget < len(caps):
+            caps = np.partition(caps, len(caps) - budget)[len(caps) - budget:]
+        if caps.sum() < left.sum():
+            return False
+        q = int(order[i])
+        for o in np.argsort(-cover[0], kind="stable"):
+            if cover[0, o] == 0:
+                break
+            chosen[q] = int(o)
+            if dfs(i + 1, np.maximum(0, left - gains[q, o]), chosen, budget - 1):
+                return True
+            del chosen[q]
+        return dfs(i + 1, left, chosen, budget)
+
+    optimal = True
+    try:
+        while best is None or len(best) > 1:
+            chosen = {}
+            if not dfs(0, need, chosen, num_q if best is None else len(best) - 1):
+                break
+            best = dict(chosen)
+    except _Abort:
+        optimal = False
+    return best, optimal, nodes
+
+
+def solve(questions, characters=None, node_limit=NODE_LIMIT):
+    """캐릭터별 ReachResult 목록, characters 를 주면 질문에 없는 캐릭터도 (도달 불가로) 포함"""
+    from balance.engine import collect_characters
+
+    present = collect_characters(questions)
+    characters = list(characters) if characters is not None else present
+    characters += [c for c in present if c not in characters]
+    results = []
+    for character in characters:
+        if character not in present:
+            results.append(ReachResult(character, False, None, None, True, 0))
+            continue
+        rivals = [c for c in present if c != character]
+        witness, nodes, done = find_witness(questions, character, rivals, node_limit)
+        reachable = True if witness is not None else (False if done else None)
+        fixed, optimal, more = (None, True, 0)
+        if reachable:
+            fixed, optimal, more = min_fixed_answers(questions, character, rivals, node_limit)
+        results.append(ReachResult(character, reachable, witness, fixed, optimal, nodes + more))
+    return results
+
+
+def print_report(results, questions):
+    print(f"\n🧭 캐릭터별 도달 가능성 ({len(questions)}문항):")
+    print(f"{'캐릭터':^15} | {'도달':^6} | {'최소 확정 응답':^14} | 증거 응답 (1부터)")
+    print("-" * 80)
+    for r in results:
+        mark = {True: "✅", False: "❌", None: "❓"}[r.reachable]
+        if r.fixed is None:
+            fixed = "-"
+        else:
+            fixed = f"{len(r.fixed)}개" + ("" if r.fixed_optimal else " 이하")
+        witness = "-" if r.witness is None else " ".join(str(o + 1) for o in r.witness)
+        print(f"{r.character:^15} | {mark:^6} | {fixed:^14} | {witness}")
+    print("ℹ️  최소 확정 응답은 동점 없이 1점 이상 앞서는 경우만 센 보수적 기준입니다. "
+          "동점 규칙(먼저 등장한 캐릭터 우선)까지 쓰면 더 적은 고정으로도 확정될 수 있습니다.")
+
+
+def main():
+    import sys
+    import time
+    from balance.data import QUESTIONS_PATH, load_character_ids, load_questions
+
+    questions = load_questions(sys.argv[1] if len(sys.argv) > 1 else QUESTIONS_PATH)
+    start = time.perf_counter()
+    results = solve(questions, load_character_ids())
+    elapsed = time.perf_counter() - start
+    print_report(results, questions)
+    for r in results:
+        if r.fixed:
+            qs = ", ".join(f"Q{questions[q].get('id', q + 1)}={o + 1}" for q, o in sorted(r.fixed.items()))
+            print(f"  🔒 {r.character}: {qs}")
+    print(f"\n⏱️  {elapsed:.2f}초, 탐색 노드 {sum(r.nodes for r in results):,}개")
+
+
+if __name__ == "__main__":
+    main()
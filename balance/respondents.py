@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""균등 선택이 아닌 응답자 모델로 응답 행렬을 배치 샘플링
+
+random.choice(question['options']) 대신 쓸 수 있는 모델들이다.
+모두 sample(compiled, n, rng) 로 (N, Q) uint8 응답 행렬을 돌려주며,
+반복은 질문/페르소나 단위로만 돌고 시행 축은 벡터화되어 있다.
+
+JSON 형식 (type 으로 구분, model_from_dict 참고)
+- {"type": "uniform"}
+- {"type": "table", "default": [0.4, 0.3, 0.2, 0.1], "questions": {"3": [0.1, 0.1, 0.2, 0.6]}}
+  질문 id 별 선택지 가중치, 없는 질문은 default (선택지 위치별 가중치), 그것도 없으면 균등
+- {"type": "markov", "base": {...}, "repeat": 0.3}
+  직전 질문과 같은 위치의 선택지를 repeat 확률로 다시 고르고, 아니면 base 모델에서 뽑는다
+- {"type": "markov", "base": {...}, "transition": [[...], ...]}
+  직전 선택 위치 -> 다음 선택 위치 가중치 행렬, 첫 질문은 base 에서 뽑는다
+- {"type": "mixture", "personas": [{"name": "열정형", "weight": 0.4, "model": {...}}, ...]}
+  시행마다 가중치로 페르소나를 고른 뒤 그 모델로 응답한다
+"""
+
+import numpy as np
+
+from balance.engine import DEFAULT_BATCH_SIZE, compile_questions, count_winners, score_answers, winners
+
+
+def _normalize(weights, count, where):
+    """선택지 수에 맞춘 확률 벡터, 모자라면 0, 넘치면 잘라낸다"""
+    w = np.zeros(count, dtype=np.float64)
+    values = np.asarray(weights, dtype=np.float64)[:count]
+    if (values < 0).any():
+        raise ValueError(f"{where}: 가중치는 음수일 수 없습니다")
+    w[:len(values)] = values
+    if w.sum() <= 0:
+        raise ValueError(f"{where}: 가중치 합이 0 입니다")
+    return w / w.sum()
+
+
+def _cumulative(probs, max_options):
+    """(Q, O) 누적 확률 표, 선택지가 없는 칸은 1"""
+    cum = np.ones((len(probs), max_options), dtype=np.float64)
+    for qi, p in enumerate(probs):
+        cum[qi, :len(p)] = np.cumsum(p)
+        cum[qi, len(p) - 1] = 1.0
+    return cum
+
+
+def _draw(cum, u):
+    """누적 확률 표와 균등 난수로 범주 추출 (역변환), cum 은 (..., O), u 는 (...)"""
+    return (u[..., None] >= cum).sum(axis=-1)
+
+
+class UniformModel:
+    """모든 선택지를 같은 확률로 고르는 기존 가정"""
+
+    def probabilities(self, compiled):
+        return [np.full(n, 1 / n) for n in compiled.option_counts]
+
+    def sample(self, compiled, n, rng):
+        draws = rng.random((n, compiled.num_questions))
+        return (draws * compiled.option_counts).astype(np.uint8)
+
+
+class TableModel:
+    """질문별 선택지 확률 표"""
+
+    def __init__(self, questions=None, default=None):
+        self.questions = {str(k): v for k, v in (questions or {}).items()}
+        self.default = default
+
+    def probabilities(self, compiled):
+        """질문 순서대로 선택지 확률 벡터 목록"""
+        probs = []
+        for qi, (question, count) in enumerate(zip(compiled.questions, compiled.option_counts)):
+            key = str(question.get('id', qi + 1))
+            weights = self.questions.get(key, self.default)
+            if weights is None:
+                probs.append(np.full(count, 1 / count))
+            else:
+                probs.append(_normalize(weights, int(count), f"질문 {key}"))
+        return probs
+
+    def sample(self, compiled, n, rng):
+        cum = _cumulative(self.probabilities(compiled), compiled.scores.shape[1])
+        return _draw(cum[None], rng.random((n, compiled.num_questions))).astype(np.uint8)
+
+
+class MarkovModel:
+    """직전 답의 선택지 위치에 따라 다음 답이 달라지는 모델"""
+
+    def __init__(self, base=None, repeat=None, transition=None):
+        if (repeat is None) == (transition is None):
+            raise ValueError("markov 모델은 repeat 또는 transition 중 하나만 지정합니다")
+        if repeat is not None and not 0 <= repeat <= 1:
+            raise ValueError("repeat 는 0 ~ 1 사이여야 합니다")
+        self.base = base or UniformModel()
+        self.repeat = repeat
+        self.transition = None if transition is None else np.asarray(transition, dtype=np.float64)
+
+    def _transition_cum(self, count):
+        """선택지 count 개 질문에 쓸 (직전 위치 -> 누적 확률) 표"""
+        rows = len(self.transition)
+        cum = np.ones((rows, count), dtype=np.float64)
+        for prev in range(rows):
+            cum[prev] = np.cumsum(_normalize(self.transition[prev], count, f"transition[{prev}]"))
+            cum[prev, -1] = 1.0
+        return cum
+
+    def sample(self, compiled, n, rng):
+        answers = self.base.sample(compiled, n, rng)
+        if self.repeat is not None:
+            stay = rng.random((n, compiled.num_questions)) < self.repeat
+            for qi in range(1, compiled.num_questions):
+                prev = answers[:, qi - 1]
+                keep = stay[:, qi] & (prev < compiled.option_counts[qi])
+                answers[keep, qi] = prev[keep]
+            return answers
+
+        u = rng.random((n, compiled.num_questions))
+        tables = {}
+        for qi in range(1, compiled.num_questions):
+            count = int(compiled.option_counts[qi])
+            if count not in tables:
+                tables[count] = self._transition_cum(count)
+            cum = tables[count]
+            prev = np.minimum(answers[:, qi - 1], len(cum) - 1)
+            answers[:, qi] = _draw(cum[prev], u[:, qi])
+        return answers
+
+
+class MixtureModel:
+    """페르소나별 모델의 가중 혼합"""
+
+    def __init__(self, personas):
+        if not personas:
+            raise ValueError("mixture 모델에는 페르소나가 하나 이상 필요합니다")
+        self.names = [name for name, _, _ in personas]
+        self.models = [model for _, _, model in personas]
+        self.weights = _normalize([weight for _, weight, _ in personas], len(personas), "personas")
+
+    def assign(self, n, rng):
+        """시행별 페르소나 번호"""
+        return rng.choice(len(self.models), size=n, p=self.weights)
+
+    def sample(self, compiled, n, rng):
+        persona = self.assign(n, rng)
+        answers = np.empty((n, compiled.num_questions), dtype=np.uint8)
+        for pi, model in enumerate(self.models):
+            rows = np.flatnonzero(persona == pi)
+            if len(rows):
+                answers[rows] = model.sample(compiled, len(rows), rng)
+        return answers
+
+
+def model_from_dict(spec):
+    """JSON 딕셔너리에서 응답자 모델 생성"""
+    kind = spec.get('type', 'uniform')
+    if kind == 'uniform':
+        return UniformModel()
+    if kind == 'table':
+        return TableModel(spec.get('questions'), spec.get('default'))
+    if kind == 'markov':
+        base = model_from_dict(spec['base']) if 'base' in spec else None
+        return MarkovModel(base, spec.get('repeat'), spec.get('transition'))
+    if kind == 'mixture':
+        personas = [(p.get('name', f"persona{i + 1}"), p.get('weight', 1), model_from_dict(p['model']))
+                    for i, p in enumerate(spec.get('personas', []))]
+        return MixtureModel(personas)
+    raise ValueError(f"알 수 없는 응답자 모델: {kind}")
+
+
+def load_model(path):
+    """응답자 모델 JSON 로드"""
+    from balance.data import load_json
+    return model_from_dict(load_json(path))
+
+
+def simulate_model(compiled, model, trials, rng=None, batch_size=DEFAULT_BATCH_SIZE):
+    """응답자 모델로 시뮬레이션, 캐릭터 인덱스별 승리 횟수 배열 반환"""
+    if rng is None:
+        rng = np.random.default_rng()
+    counts = np.zeros(compiled.num_characters, dtype=np.int64)
+    done = 0
+    while done < trials:
+        n = min(batch_size, trials - done)
+        keys = score_answers(compiled, model.sample(compiled, n, rng))
+        counts += count_winners(compiled, winners(compiled, keys))
+        done += n
+    return counts
+
+
+def simulate_distribution_model(questions, model, trials=10000, seed=None):
+    """응답자 모델 버전 simulate_distribution ({캐릭터: 승리 횟수})"""
+    compiled = compile_questions(questions)
+    return compiled.to_dict(simulate_model(compiled, model, trials, np.random.default_rng(seed)))
+
+
+def main():
+    """python -m balance.respondents <모델.json> [시행 수]: 균등 응답과 분포 비교"""
+    import sys
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    if len(sys.argv) < 2:
+        print("사용법: python -m balance.respondents <모델.json> [시행 수]")
+        return
+    model = load_model(sys.argv[1])
+    trials = int(sys.argv[2]) if len(sys.argv) > 2 else 1 << 20
+    compiled = compile_questions(create_biblically_balanced_questions())
+    uniform = simulate_model(compiled, UniformModel(), trials, np.random.default_rng(0))
+    modeled = simulate_model(compiled, model, trials, np.random.default_rng(0))
+
+    print(f"\n📊 응답자 모델 비교 ({trials:,}번 테스트):")
+    print(f"{'캐릭터':^15} | {'균등(%)':^8} | {'모델(%)':^8} | {'차이(%p)':^8}")
+    print("-" * 50)
+    for i in np.argsort(-modeled):
+        a, b = uniform[i] / trials * 100, modeled[i] / trials * 100
+        print(f"{compiled.characters[i]:^15} | {a:^8.2f} | {b:^8.2f} | {b - a:^+8.2f}")
+
+
+if __name__ == "__main__":
+    main()
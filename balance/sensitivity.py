@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""(질문, 선택지, 캐릭터) 점수를 ±1 했을 때 캐릭터별 승리 비율 변화 추정
+
+80개 선택지 × 16명마다 시뮬레이션을 따로 돌리지 않고, 응답 표본 하나(common random numbers)를
+incremental.EvaluationState 에 담아 두고 선택지마다 후보 편집을 preview_many 로 한꺼번에 평가한다.
+모든 편집이 같은 표본을 쓰므로 비율 차이에는 표본 간 노이즈가 섞이지 않는다.
+점수가 없는 칸의 +1 은 그 선택지에 캐릭터를 새로 1점으로 넣는 편집이다.
+"""
+
+import numpy as np
+
+from balance.incremental import SAMPLE_TRIALS, from_questions
+
+TOP_EDITS = 5
+
+
+class SensitivityResult:
+    """편집별 캐릭터 승리 비율 변화표"""
+
+    def __init__(self, characters, base, edits, deltas, trials):
+        self.characters = characters
+        self.base = base      # (C,) 기준 승리 비율
+        self.edits = edits    # [(질문 번호, 선택지 번호, 캐릭터 번호, 이전 점수, 새 점수)]
+        self.deltas = deltas  # (E, C) 편집별 승리 비율 변화
+        self.trials = trials
+
+    def ranked(self, character, top=TOP_EDITS, direction=1):
+        """character 의 비율을 direction 쪽(+1 올림, -1 내림)으로 가장 크게 움직이는 편집 번호"""
+        ci = self.characters.index(character)
+        effect = self.deltas[:, ci] * direction
+        order = np.argsort(-effect, kind="stable")[:top]
+        return [int(e) for e in order if effect[e] > 0]
+
+
+def sensitivity(questions, characters=None, trials=SAMPLE_TRIALS, seed=0, include_absent=True,
+                score_range=None):
+    """모든 (질문, 선택지, 캐릭터) ±1 편집의 승리 비율 변화표
+
+    score_range=(low, high) 를 주면 범위를 벗어나는 편집은 건너뛴다.
+    """
+    state = from_questions(questions, characters, trials, seed)
+    low, high = score_range if score_range else (-np.inf, np.inf)
+    base = state.counts.copy()
+    edits, deltas = [], []
+    for qi, question in enumerate(state.questions):
+        for oi in range(len(question['options'])):
+            cis, news = [], []
+            for ci in range(state.num_characters):
+                value = int(state.values[qi, oi, ci])
+                if value == 0 and ci not in _present(state, qi, oi):
+                    steps = (1,) if include_absent else ()
+                else:
+                    steps = (-1, 1)
+                for step in steps:
+                    if low <= value + step <= high:
+                        cis.append(ci)
+                        news.append(value + step)
+                        edits.append((qi, oi, ci, value, value + step))
+            if cis:
+                deltas.append(state.preview_many(qi, oi, cis, news) - base)
+    num_c = state.num_characters
+    deltas = np.concatenate(deltas) / trials if deltas else np.zeros((0, num_c))
+    return SensitivityResult(state.characters, base / trials, edits, deltas, trials)
+
+
+def _present(state, qi, oi):
+    """선택지 scores 에 들어 있는 캐릭터 번호 집합 (0점 항목 포함)"""
+    scores = state.questions[qi]['options'][oi]['scores']
+    return {state.char_index[c] for c in scores if c in state.char_index}
+
+
+def print_report(result, questions, top=TOP_EDITS):
+    """캐릭터별로 비율을 가장 많이 올리는/내리는 편집 표"""
+    print(f"\n🔬 점수 민감도 ({result.trials:,}개 공통 표본, 편집 {len(result.edits):,}개)")
+    for ci, character in enumerate(result.characters):
+        print(f"\n👤 {character} (현재 {result.base[ci] * 100:.2f}%)")
+        for label, direction in (("⬆️ ", 1), ("⬇️ ", -1)):
+            for e in result.ranked(character, top, direction):
+                qi, oi, ei, before, after = result.edits[e]
+                qid = questions[qi].get('id', qi + 1)
+                print(f"  {label} Q{qid} 선택지{oi + 1} {result.characters[ei]}: {before} → {after}"
+                      f"  {result.deltas[e, ci] * 100:+.2f}%p")
+
+
+def main():
+    import sys
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else TOP_EDITS
+    questions = create_biblically_balanced_questions()
+    print_report(sensitivity(questions), questions, top)
+
+
+if __name__ == "__main__":
+    main()
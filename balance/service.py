@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""응답 벡터를 배치로 채점하는 로컬 서비스 (HTTP 또는 표준 입출력 JSONL)
+
+앱의 _calculateScores / getTopCharacter / getTop3Characters 와 같은 규칙으로,
+engine 이 컴파일한 점수 텐서와 정렬 키를 그대로 써서 채점한다. 외부 서비스나 추가 패키지 없이
+표준 라이브러리 http.server 로 뜨며, 같은 응답 벡터는 LRU 캐시에서 바로 돌려준다.
+
+    python -m balance serve --port 8765
+    curl -d '{"answers": [[0, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2, 3]]}' localhost:8765/score
+    python -m balance serve --stdin < answers.jsonl > results.jsonl
+
+응답 벡터는 질문 순서대로 고른 선택지 번호 (0부터) 목록이다.
+결과는 {"winner": 캐릭터, "top": [[캐릭터, 점수], ...], "scores": {캐릭터: 점수}} 이고
+scores 는 앱의 점수 맵처럼 그 경로에서 점수를 받은 캐릭터만, 들어간 순서대로 담는다.
+"""
+
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from balance.engine import TOP_RANKS, keys_to_totals, score_answers, top_ranks
+
+CACHE_SIZE = 1 << 16     # LRU 캐시에 담는 응답 벡터 수
+MAX_BATCH = 1 << 14      # 요청 하나에 받는 응답 벡터 수 상한
+STDIN_BATCH = 1024       # 표준 입력 모드에서 한 번에 채점하는 줄 수
+DEFAULT_PORT = 8765
+
+
+class Scorer:
+    """컴파일된 질문 세트로 응답 벡터 배치를 채점하고 결과를 LRU 캐시에 보관"""
+
+    def __init__(self, compiled, cache_size=CACHE_SIZE):
+        self.compiled = compiled
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # 응답 벡터 bytes -> 결과 딕셔너리
+        self.hits = 0
+        self.misses = 0
+
+    def to_matrix(self, answers):
+        """응답 벡터 목록 -> 검사한 (N, Q) int64 행렬, 정수가 아닌 값(bool, 실수, 문자열)이나 범위 밖이면 ValueError"""
+        if isinstance(answers, np.ndarray):
+            if answers.size and answers.dtype.kind not in "iu":
+                raise ValueError(f"선택지 번호는 정수여야 합니다 (받은 배열 dtype: {answers.dtype})")
+        else:
+            answers = list(answers)
+            num_q = self.compiled.num_questions
+            for row, vector in enumerate(answers):
+                if not isinstance(vector, (list, tuple, np.ndarray)) or len(vector) != num_q:
+                    raise ValueError(f"{row}번째 응답은 길이 {num_q} 의 선택지 번호 목록이어야 합니다")
+                for q, value in enumerate(vector):
+                    if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, np.integer)):
+                        raise ValueError(f"{row}번째 응답의 질문 {q + 1} 선택지 번호 {value!r} 가 정수가 아닙니다")
+        answers = np.asarray(answers, dtype=np.int64)
+        if answers.size == 0:
+            answers = answers.reshape(0, self.compiled.num_questions)
+        self.check(answers)
+        return answers
+
+    def check(self, answers):
+        """(N, Q) 응답 행렬 검사, 잘못되면 ValueError"""
+        compiled = self.compiled
+        if answers.ndim != 2 or answers.shape[1] != compiled.num_questions:
+            raise ValueError(f"응답 벡터는 길이 {compiled.num_questions} 의 선택지 번호 목록이어야 합니다")
+        bad = (answers < 0) | (answers >= compiled.option_counts)
+        if bad.any():
+            row, q = np.argwhere(bad)[0]
+            raise ValueError(f"{row}번째 응답의 질문 {q + 1} 선택지 번호 {answers[row, q]} 가 범위를 벗어났습니다")
+
+    def _results(self, answers):
+        """캐시 없이 (N, Q) 응답 행렬 채점"""
+        compiled = self.compiled
+        characters = compiled.characters
+        num_c = compiled.num_characters
+        keys = score_answers(compiled, answers)
+        totals = keys_to_totals(compiled, keys).tolist()
+        # 정렬 키의 우선순위 자리가 0 이면 그 경로에서 점수 맵에 들어가지 않은 캐릭터
+        prio = (keys // num_c) % compiled.scale
+        ranks = top_ranks(compiled, keys, TOP_RANKS).tolist()
+        # 점수 맵 순서 = 최초 등장 순서 = 우선순위 내림차순
+        order = np.argsort(-prio, axis=1, kind="stable").tolist()
+        present = (prio > 0).sum(axis=1).tolist()
+        results = []
+        for row, rank, seq, count in zip(totals, ranks, order, present):
+            top = [[characters[c], row[c]] for c in rank if c >= 0]
+            results.append({
+                "winner": top[0][0] if top else None,
+                "top": top,
+                "scores": {characters[c]: row[c] for c in seq[:count]},
+            })
+        return results
+
+    def score(self, answers):
+        """응답 벡터 목록 (N, Q) 을 채점해 결과 딕셔너리 목록 반환"""
+        answers = self.to_matrix(answers)
+        packed = answers.astype(np.uint8)
+        cache = self.cache
+        results = [None] * len(packed)
+        missing = {}  # 응답 bytes -> 배치 안 행 번호 목록 (같은 벡터는 한 번만 채점)
+        for i, row in enumerate(packed):
+            key = row.tobytes()
+            hit = cache.get(key)
+            if hit is not None:
+                cache.move_to_end(key)
+                results[i] = hit
+            else:
+                missing.setdefault(key, []).append(i)
+        self.hits += len(packed) - sum(len(rows) for rows in missing.values())
+        self.misses += len(missing)
+        if missing:
+            rows = [positions[0] for positions in missing.values()]
+            for (key, positions), result in zip(missing.items(), self._results(packed[rows])):
+                cache[key] = result
+                for i in positions:
+                    results[i] = result
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return results
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "questions": self.compiled.num_questions,
+            "characters": self.compiled.num_characters,
+            "cache_size": len(self.cache),
+            "cache_limit": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def _parse_request(payload):
+    """{"answers": [[...], ...]} 또는 응답 벡터 하나/목록"""
+    if isinstance(payload, dict):
+        payload = payload.get("answers")
+    if not isinstance(payload, list):
+        raise ValueError("answers 목록이 필요합니다")
+    if payload and not isinstance(payload[0], list):
+        payload = [payload]
+    if len(payload) > MAX_BATCH:
+        raise ValueError(f"한 요청에 응답 벡터는 {MAX_BATCH}개까지입니다")
+    return payload
+
+
+def make_handler(scorer):
+    """Scorer 를 쓰는 http.server 요청 처리 클래스"""
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, scorer.stats())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/score":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                answers = _parse_request(json.loads(self.rfile.read(length)))
+                self._send(200, {"results": scorer.score(answers)})
+            except (ValueError, TypeError) as e:
+                self._send(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 stderr 로그를 남기지 않는다
+
+    return Handler
+
+
+def serve_http(scorer, host="127.0.0.1", port=DEFAULT_PORT):
+    from http.server import HTTPServer
+
+    server = HTTPServer((host, port), make_handler(scorer))
+    print(f"🚀 채점 서비스: http://{host}:{port}/score (상태: /health)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def serve_stdin(scorer, stdin, stdout, batch=STDIN_BATCH):
+    """줄마다 응답 벡터 하나 (또는 {"answers": [...]}) 를 읽어 결과를 같은 순서로 한 줄씩 출력
+
+    벡터 하나인 줄은 결과 딕셔너리, 목록/answers 인 줄은 {"results": [...]} 를 출력한다.
+    batch 줄씩 모아 한 번에 채점하므로, 대화식으로 쓸 때는 batch=1 로 둔다.
+    잘못된 줄은 {"error": ...} 를 출력하고 계속한다.
+    """
+    pending = []
+
+    def flush():
+        vectors, slots = [], []
+        for line in pending:
+            try:
+                payload = json.loads(line)
+                single = isinstance(payload, list) and bool(payload) and not isinstance(payload[0], list)
+                rows = _parse_request(payload)
+                if rows:
+                    scorer.to_matrix(rows)
+                slots.append((len(vectors), len(rows), single))
+                vectors.extend(rows)
+            except (ValueError, TypeError) as e:
+                slots.append(str(e))
+        results = scorer.score(vectors)
+        for slot in slots:
+            if isinstance(slot, str):
+                body = {"error": slot}
+            else:
+                start, count, single = slot
+                body = results[start] if single else {"results": results[start:start + count]}
+            stdout.write(json.dumps(body, ensure_ascii=False) + "\n")
+        stdout.flush()
+        pending.clear()
+
+    for line in stdin:
+        if line.strip():
+            pending.append(line)
+        if len(pending) >= batch:
+            flush()
+    if pending:
+        flush()
+
+
+def main():
+    import sys
+    from balance.cli import main as cli_main
+
+    sys.exit(cli_main(["serve", *sys.argv[1:]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""10억 회 단위 시뮬레이션을 위한 메모리 고정 스트리밍 모드
+
+1% 미만인 캐릭터의 비율을 확인하려면 1e9 회 정도가 필요하다. 응답 행렬을 한꺼번에 만들면
+메모리가 부족하므로 고정 크기 청크로 나눠 돌리고 캐릭터별 카운터만 누적한다.
+청크 하나가 쓰는 메모리는 chunk_size 로만 정해지고 시행 수와는 무관하다.
+
+- 균등 응답은 응답 행렬 없이 블록 조합 인덱스를 uint16 으로 바로 뽑는다 (블록 크기 <= 4096)
+- 응답자 모델(respondents)을 쓰면 청크마다 uint8 응답 행렬만 만든다
+- 점수 텐서는 int8, 키를 못 쓰는 큰 세트의 총점 누적은 int16 (engine.compile_questions 참고)
+- counter=True 면 카운터 기반 스트림(balance.streams)으로 응답을 뽑아 청크 크기와 상관없이 결과가 같다
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from balance.engine import count_winners, score_answers, score_blocks, winners
+from balance.metrics import NULL_METRICS
+
+CHUNK_SIZE = 1 << 16
+REPORT_EVERY = 1 << 24  # 진행 콜백 간격 (시행 수)
+
+
+class MemoryReport:
+    """메모리 최고 사용량"""
+
+    def __init__(self, traced_peak, rss_peak):
+        self.traced_peak = traced_peak  # tracemalloc 기준 numpy/파이썬 할당 최고치 (바이트), 미측정이면 None
+        self.rss_peak = rss_peak        # 프로세스 최대 RSS (바이트), 알 수 없으면 None
+
+
+class StreamResult:
+    """스트리밍 시뮬레이션 결과"""
+
+    def __init__(self, characters, counts, trials, chunks, elapsed, memory):
+        self.characters = characters
+        self.counts = counts
+        self.trials = trials
+        self.chunks = chunks
+        self.elapsed = elapsed
+        self.memory = memory
+
+    @property
+    def trials_per_second(self):
+        return self.trials / self.elapsed if self.elapsed else 0.0
+
+
+def rss_peak():
+    """프로세스 최대 RSS (바이트), resource 모듈이 없으면 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def index_dtype(compiled):
+    """블록 조합 인덱스를 담을 가장 작은 부호 없는 정수형"""
+    largest = max((block.size for block in compiled.blocks), default=1)
+    return np.uint16 if largest <= np.iinfo(np.uint16).max + 1 else np.int64
+
+
+def chunk_bytes(compiled, chunk_size=CHUNK_SIZE):
+    """청크 하나가 만드는 주요 배열 크기 추정 (바이트)"""
+    index_size = np.dtype(index_dtype(compiled)).itemsize * len(compiled.blocks)
+    key_size = np.dtype(compiled.key_dtype).itemsize * compiled.num_characters * 2
+    return chunk_size * (index_size + key_size)
+
+
+def simulate_streaming(compiled, trials, seed=None, chunk_size=CHUNK_SIZE, model=None,
+                       progress=None, track_memory=False, metrics=NULL_METRICS, counter=False):
+    """청크 단위 스트리밍 시뮬레이션, 카운터만 누적
+
+    track_memory=True 면 tracemalloc 으로 할당 최고치를 잰다 (조금 느려진다).
+    counter=True 는 seed 가 필요하고 model 과 함께 쓸 수 없다.
+    """
+    rng = np.random.default_rng(seed)
+    stream = None
+    if counter:
+        from balance.streams import TrialStream
+        if seed is None or model is not None:
+            raise ValueError("카운터 스트림은 seed 가 있는 균등 응답에서만 쓸 수 있습니다")
+        stream = TrialStream(seed, compiled.num_questions)
+    dtype = index_dtype(compiled)
+    counts = np.zeros(compiled.num_characters, dtype=np.int64)
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    done = 0
+    chunks = 0
+    next_report = REPORT_EVERY
+    try:
+        while done < trials:
+            n = min(chunk_size, trials - done)
+            if stream is not None:
+                with metrics.stage("sample"):
+                    answers = stream.answers(compiled.option_counts, done, n)
+                with metrics.stage("accumulate"):
+                    keys = score_answers(compiled, answers)
+            elif model is None:
+                with metrics.stage("sample"):
+                    indices = [rng.integers(0, block.size, size=n, dtype=dtype) for block in compiled.blocks]
+                with metrics.stage("accumulate"):
+                    keys = score_blocks(compiled, indices)
+            else:
+                with metrics.stage("sample"):
+                    answers = model.sample(compiled, n, rng)
+                with metrics.stage("accumulate"):
+                    keys = score_answers(compiled, answers)
+            with metrics.stage("select"):
+                counts += count_winners(compiled, winners(compiled, keys))
+            done += n
+            chunks += 1
+            metrics.add("trials", n)
+            metrics.tick(done, trials)
+            if progress and done >= next_report:
+                progress(done, trials)
+                next_report += REPORT_EVERY
+        traced = tracemalloc.get_traced_memory()[1] if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+    memory = MemoryReport(traced, rss_peak())
+    return StreamResult(compiled.characters, counts, done, chunks, elapsed, memory)
+
+
+def _mb(value):
+    return "-" if value is None else f"{value / (1 << 20):.1f}MB"
+
+
+def main():
+    """python -m balance.streaming [시행 수]: 기본 1e9 회"""
+    import sys
+    from balance.engine import compile_questions
+    from manual_biblical_balance import create_biblically_balanced_questions
+
+    trials = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 9
+    compiled = compile_questions(create_biblically_balanced_questions())
+
+    def progress(done, total):
+        print(f"\r⏳ {done:,}/{total:,} ({done / total * 100:.1f}%)", end="", flush=True)
+
+    print(f"📦 청크 {CHUNK_SIZE:,}회, 청크당 약 {_mb(chunk_bytes(compiled))}")
+    result = simulate_streaming(compiled, trials, progress=progress, track_memory=True)
+    print(f"\n\n📊 스트리밍 결과 ({result.trials:,}번 테스트, {result.trials_per_second:,.0f}회/초):")
+    print(f"{'캐릭터':^15} | {'매칭수':^14} | {'비율(%)':^10}")
+    print("-" * 45)
+    for i in np.argsort(-result.counts):
+        print(f"{result.characters[i]:^15} | {result.counts[i]:^14,} | {result.counts[i] / result.trials * 100:^10.4f}")
+    print(f"\n💾 메모리 최고치: 할당 {_mb(result.memory.traced_peak)}, RSS {_mb(result.memory.rss_peak)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""20문항에서 k 문항만 골라 짧은 버전을 만들 때 균형이 가장 좋은 조합 찾기
+
+C(20, 10) 은 약 18만 5천 개라 조합마다 시뮬레이션을 돌릴 수는 없다.
+
+1. 선별: 모든 후보를 같은 응답 표본(common random numbers)으로 평가한다. 질문 순서대로
+   포함/제외를 정하며 내려가는 탐색이라 앞쪽 질문 합은 형제 후보끼리 공유하고,
+   마지막 세 문항은 가능한 조합을 (후보, 캐릭터, 시행) 배치로 한 번에 계산한다.
+   전체 후보는 표본 앞 1/8 로만 훑어 상위 2% 만 남기고(가지치기), 남은 후보를 표본 전체로 다시 본다.
+   C(20, 10) 전체 선별이 한 코어에서 십여 초 걸린다.
+2. 재평가: 선별 상위 후보만 다른 seed 의 큰 표본으로 engine 을 돌려 다시 순위를 매긴다.
+   선별 표본의 우연한 이득(승자의 저주)이 최종 순위에 섞이지 않는다.
+
+승자 규칙은 engine 과 같다. 고른 질문만 원래 순서대로 답한 경로에서 먼저 등장한 캐릭터가
+동점을 이기며, 최초 등장 코드 (질문 번호, 딕셔너리 순서) 는 부분 집합에서도 순서가 그대로다.
+필수/제외 질문은 탐색 단계에서 바로 반영해 후보 수 자체를 줄인다.
+"""
+
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from balance.engine import collect_characters, compile_questions, sample_answers, simulate
+
+SCREEN_TRIALS = 1 << 11   # 선별 표본 크기
+REFINE_TRIALS = 1 << 16   # 재평가 표본 크기
+KEEP = 128                # 재평가할 상위 후보 수
+BATCH_DEPTH = 3           # 마지막 몇 문항을 조합으로 묶어 한 번에 평가할지
+PRUNE_DIVISOR = 8         # 1차 선별은 표본의 이 분의 1 만 쓴다
+PRUNE_FRACTION = 0.02     # 1차 선별에서 남기는 후보 비율
+BATCH = 64                # 한 번에 평가하는 후보 수 (메모리 상한)
+CANDIDATE_LIMIT = 5_000_000
+
+
+class SubsetResult:
+    """질문 부분 집합 하나의 평가 결과"""
+
+    def __init__(self, indices, error, rates, screen_error):
+        self.indices = indices          # 고른 질문 번호 (0부터, 원래 순서)
+        self.error = error              # 재평가 표본의 목표 분포 제곱 오차 합
+        self.rates = rates              # (C,) 재평가 승리 비율
+        self.screen_error = screen_error  # 선별 표본의 오차
+
+
+def count_candidates(num_questions, k, required=(), forbidden=()):
+    """제약을 만족하는 k 문항 조합 수"""
+    free = num_questions - len(set(required)) - len(set(forbidden) - set(required))
+    need = k - len(set(required))
+    return math.comb(free, need) if 0 <= need <= free else 0
+
+
+class _Screen:
+    """선별용 질문별 기여 테이블 (공통 응답 표본)
+
+    (Q, C, N) 캐릭터 우선 배치라 캐릭터 축 최댓값이 N 길이 배열끼리의 비교가 된다.
+    정렬 키는 engine 의 비패킹 경로와 같은 (총점 * scale + 우선순위) * C + (C - 1 - 캐릭터) 인데,
+    우선순위 자리는 질문별 값의 최댓값(= 최초 등장)이므로 총점 부분은 더하고 나머지는 maximum 으로 모은다.
+    """
+
+    def __init__(self, totals, prio):
+        self.totals = totals  # (Q, C, N) int32 질문별 총점 자리
+        self.prio = prio      # (Q, C, N) int16 질문별 우선순위 + 캐릭터 자리
+        self.num_c = totals.shape[1]
+        self.trials = totals.shape[2]
+
+    @classmethod
+    def sample(cls, compiled, trials, rng):
+        num_c = compiled.num_characters
+        answers = sample_answers(compiled, trials, rng)
+        q = np.arange(compiled.num_questions)
+        unit = (compiled.not_seen + 1) * num_c
+        first = compiled.first[q, answers]  # (N, Q, C)
+        digit = np.arange(num_c - 1, -1, -1)
+        totals = (compiled.scores[q, answers].astype(np.int32) * unit).transpose(1, 2, 0)
+        prio = ((compiled.not_seen - first) * num_c + digit).astype(np.int16).transpose(1, 2, 0)
+        return cls(np.ascontiguousarray(totals), np.ascontiguousarray(prio))
+
+    def head(self, n):
+        """앞 n 시행만 쓰는 표 (같은 표본의 부분)"""
+        return _Screen(np.ascontiguousarray(self.totals[:, :, :n]), np.ascontiguousarray(self.prio[:, :, :n]))
+
+    def counts(self, totals, prio):
+        """(B, C, N) 부분 합으로 후보별 캐릭터 승리 횟수 (B, C)"""
+        top = (totals + prio).max(axis=1)
+        # 점수를 받은 캐릭터가 없는 시행은 버리는 칸(num_c)으로 보낸다 (engine.winners 와 같은 판정)
+        win = np.where(top >= self.num_c, self.num_c - 1 - top % self.num_c, self.num_c)
+        win += np.arange(len(win))[:, None] * (self.num_c + 1)
+        flat = np.bincount(win.ravel(), minlength=len(win) * (self.num_c + 1))
+        return flat.reshape(len(win), self.num_c + 1)[:, :self.num_c]
+
+    def errors(self, candidates, target, base=None):
+        """(B, k) 후보 배열의 목표 분포 제곱 오차, base 는 공통 앞부분의 (총점, 우선순위)"""
+        totals = self.totals[candidates].sum(axis=1)
+        prio = self.prio[candidates].max(axis=1)
+        if base is not None:
+            totals += base[0]
+            np.maximum(prio, base[1], out=prio)
+        rates = self.counts(totals, prio) / self.trials
+        return ((rates - target) ** 2).sum(axis=-1)
+
+
+class _Best:
+    """오차가 작은 후보 n 개를 유지하는 힙"""
+
+    def __init__(self, n):
+        self.n = n
+        self.heap = []  # (-오차, 후보)
+
+    def push(self, errors, candidates):
+        heap = self.heap
+        for error, candidate in zip(errors.tolist(), candidates):
+            item = (-error, candidate)
+            if len(heap) < self.n:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def items(self):
+        return sorted((-e, c) for e, c in self.heap)
+
+
+def _enumerate(data, k, target, allowed, required, best):
+    """제약을 만족하는 모든 후보를 평가, 앞쪽 질문 합은 형제 후보끼리 공유한다"""
+    # 각 위치 이후에 남은 필수 질문 수
+    required_after = [sum(1 for q in allowed[i:] if q in required) for i in range(len(allowed) + 1)]
+
+    def dfs(i, prefix, totals, prio):
+        remaining = k - len(prefix)
+        if remaining <= BATCH_DEPTH:
+            # 마지막 몇 문항은 가능한 조합을 모두 나열해 배치로 평가
+            rest = allowed[i:]
+            must = required.intersection(rest)
+            tails = [t for t in itertools.combinations(rest, remaining) if must.issubset(t)]
+            for s in range(0, len(tails), BATCH):
+                chunk = tails[s:s + BATCH]
+                errors = data.errors(np.array(chunk).reshape(len(chunk), remaining), target, (totals, prio))
+                best.push(errors, [prefix + t for t in chunk])
+            return
+        for j in range(i, len(allowed)):
+            # 필수 질문을 건너뛸 수 없고, 남은 질문이 모자라면 중단
+            if required_after[i] - required_after[j] > 0 or len(allowed) - j < remaining:
+                break
+            q = allowed[j]
+            dfs(j + 1, prefix + (q,), totals + data.totals[q], np.maximum(prio, data.prio[q]))
+
+    shape = (data.num_c, data.trials)
+    dfs(0, (), np.zeros(shape, dtype=np.int32), np.zeros(shape, dtype=np.int16))
+
+
+def screen(compiled, k, target, trials=SCREEN_TRIALS, seed=0, required=(), forbidden=(), keep=KEEP,
+           prune=PRUNE_FRACTION):
+    """모든 후보를 공통 표본으로 평가해 오차가 작은 keep 개 [(오차, 질문 번호 튜플)]
+
+    1차로 표본 앞 1/PRUNE_DIVISOR 만 써서 전체 후보를 훑고 상위 prune 비율만 남긴 뒤,
+    남은 후보를 같은 표본 전체로 다시 평가한다.
+    """
+    num_q = compiled.num_questions
+    required, forbidden = set(required), set(forbidden) - set(required)
+    if len(required) > k:
+        raise ValueError(f"필수 질문 {len(required)}개가 k={k} 보다 많습니다")
+    total = count_candidates(num_q, k, required, forbidden)
+    if total == 0 or k == 0:
+        return []
+    if total > CANDIDATE_LIMIT:
+        raise ValueError(f"후보 {total:,}개가 상한 {CANDIDATE_LIMIT:,}개를 넘습니다 (필수/제외 질문으로 줄여 주세요)")
+
+    data = _Screen.sample(compiled, trials, np.random.default_rng(seed))
+    allowed = [q for q in range(num_q) if q not in forbidden]
+    survivors = max(keep * 4, int(total * prune))
+    if survivors >= total or trials < PRUNE_DIVISOR:
+        best = _Best(keep)
+        _enumerate(data, k, target, allowed, required, best)
+        return best.items()
+
+    rough = _Best(survivors)
+    _enumerate(data.head(trials // PRUNE_DIVISOR), k, target, allowed, required, rough)
+    best = _Best(keep)
+    candidates = [c for _, c in rough.items()]
+    for s in range(0, len(candidates), BATCH):
+        chunk = candidates[s:s + BATCH]
+        best.push(data.errors(np.array(chunk), target), chunk)
+    return best.items()
+
+
+def select_subsets(questions, k, target=None, required=(), forbidden=(), screen_trials=SCREEN_TRIALS,
+                   refine_trials=REFINE_TRIALS, keep=KEEP, seed=0, top=10):
+    """k 문항 부분 집합을 목표 분포와의 오차 순으로 top 개 (SubsetResult 목록)
+
+    target 은 {캐릭터: 비율}, 없으면 질문 세트에 등장하는 캐릭터 균등.
+    required/forbidden 은 0부터 센 질문 번호.
+    """
+    characters = collect_characters(questions)
+    if target is None:
+        target = {c: 1 / len(characters) for c in characters}
+    characters += [c for c in target if c not in characters]
+    target_vec = np.array([target.get(c, 0.0) for c in characters], dtype=np.float64)
+    target_vec /= target_vec.sum()
+
+    compiled = compile_questions(questions, characters)
+    if (compiled.not_seen + 1) * compiled.num_characters > np.iinfo(np.int16).max:
+        raise ValueError("질문/선택지가 너무 많아 선별 표본을 만들 수 없습니다")
+    shortlist = screen(compiled, k, target_vec, screen_trials, seed, required, forbidden, keep)
+
+    rng_seed = np.random.SeedSequence(seed).spawn(1)[0]
+    results = []
+    for screen_error, indices in shortlist:
+        sub = compile_questions([questions[q] for q in indices], characters)
+        counts = simulate(sub, refine_trials, np.random.default_rng(rng_seed))
+        rates = counts / refine_trials
+        results.append(SubsetResult(list(indices), float(((rates - target_vec) ** 2).sum()), rates, screen_error))
+    results.sort(key=lambda r: r.error)
+    return results[:top], characters, target_vec
+
+
+def main():
+    import sys
+    from balance.cli import main as cli_main
+
+    sys.exit(cli_main(["subset", *sys.argv[1:]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""질문 세트 변형 × 응답자 모델 격자를 프로세스 풀로 한 번에 돌리는 스윕
+
+변형마다 스크립트를 따로 돌리며 질문 딕셔너리를 다시 만들던 것을 대신한다.
+부모 프로세스가 변형을 한 번씩 컴파일해 점수 텐서와 블록 키 테이블을 공유 메모리 한 덩어리에 담고,
+워커는 시작할 때 이름과 배치표(이름, dtype, shape, 오프셋)만 받아 numpy 뷰로 붙는다.
+칸 (변형, 모델) 하나가 작업 하나이고 워커와 주고받는 것은 작업 번호와 캐릭터별 카운터뿐이다.
+
+같은 모델은 모든 변형에서 같은 난수 스트림(SeedSequence(seed, spawn_key=(모델 번호,)))을 쓰므로
+변형 사이 차이에 표본 잡음이 덜 섞이고, workers 수와 상관없이 결과가 같다.
+
+스윕 JSON 형식 (경로는 스윕 파일 기준 상대 경로, "builtin" 은 create_biblically_balanced_questions)
+    {
+      "trials": 1000000, "seed": 0,
+      "variants": {"base": "../assets/data/biblical_questions.json", "builtin": "builtin"},
+      "models": {"uniform": {"type": "uniform"}, "mix": "models/mix.json"}
+    }
+"""
+
+import os
+
+import numpy as np
+
+from balance.engine import CompiledQuestions, ScoreBlock, compile_questions, simulate
+from balance.respondents import simulate_model
+
+_worker_cells = None
+_worker_memory = None
+
+
+class SweepResult:
+    """스윕 결과 표"""
+
+    def __init__(self, characters, variants, models, counts, trials):
+        self.characters = characters  # 모든 변형의 캐릭터 합집합 (열 순서)
+        self.variants = variants      # 변형 이름 목록
+        self.models = models          # 모델 이름 목록
+        self.counts = counts          # (변형, 모델, C) 승리 횟수
+        self.trials = trials
+
+    def rates(self):
+        return self.counts / self.trials
+
+    def errors(self, target=None):
+        """(변형, 모델) 목표 분포(기본: 캐릭터 균등)와의 제곱 오차 합"""
+        if target is None:
+            target = np.full(len(self.characters), 1 / len(self.characters))
+        return ((self.rates() - target) ** 2).sum(axis=-1)
+
+    def rows(self):
+        """칸마다 한 행인 결과 표 (딕셔너리 목록)"""
+        rows = []
+        errors = self.errors()
+        for v, variant in enumerate(self.variants):
+            for m, model in enumerate(self.models):
+                counts = self.counts[v, m]
+                rows.append({
+                    "variant": variant,
+                    "model": model,
+                    "trials": self.trials,
+                    "error": float(errors[v, m]),
+                    "min_rate": float(counts.min() / self.trials),
+                    "max_rate": float(counts.max() / self.trials),
+                    "counts": {c: int(n) for c, n in zip(self.characters, counts)},
+                })
+        return rows
+
+
+# ---- 공유 메모리 ----
+
+def _compiled_arrays(compiled):
+    """CompiledQuestions 를 다시 만드는 데 필요한 배열 {이름: 배열}"""
+    arrays = {"scores": compiled.scores, "first": compiled.first, "option_counts": compiled.option_counts}
+    for b, block in enumerate(compiled.blocks):
+        arrays[f"block{b}.radices"] = block.radices
+        arrays[f"block{b}.totals"] = block.totals
+        arrays[f"block{b}.first"] = block.first
+        if block.keys is not None:
+            arrays[f"block{b}.keys"] = block.keys
+    return arrays
+
+
+def _compiled_meta(compiled):
+    """배열 외의 작은 속성"""
+    return {
+        "questions": compiled.questions,
+        "characters": compiled.characters,
+        "blocks": [(block.start, block.stop) for block in compiled.blocks],
+        "packed": compiled.packed,
+        "scale": compiled.scale,
+        "key_dtype": np.dtype(compiled.key_dtype).str,
+        "total_dtype": np.dtype(compiled.total_dtype).str,
+    }
+
+
+def _restore(meta, arrays):
+    """공유 메모리 뷰로 CompiledQuestions 복원 (다시 컴파일하지 않는다)"""
+    compiled = CompiledQuestions.__new__(CompiledQuestions)
+    compiled.questions = meta["questions"]
+    compiled.characters = meta["characters"]
+    compiled.char_index = {c: i for i, c in enumerate(compiled.characters)}
+    compiled.scores = arrays["scores"]
+    compiled.first = arrays["first"]
+    compiled.option_counts = arrays["option_counts"]
+    compiled.not_seen = int(compiled.first.max()) if compiled.first.size else 0
+    compiled.blocks = [ScoreBlock(start, stop, arrays[f"block{b}.radices"], arrays[f"block{b}.totals"],
+                                  arrays[f"block{b}.first"], arrays.get(f"block{b}.keys"))
+                       for b, (start, stop) in enumerate(meta["blocks"])]
+    compiled.packed = meta["packed"]
+    compiled.scale = meta["scale"]
+    compiled.key_dtype = np.dtype(meta["key_dtype"]).type
+    compiled.total_dtype = np.dtype(meta["total_dtype"]).type
+    return compiled
+
+
+def share(compiled_list):
+    """컴파일된 변형들을 공유 메모리 한 덩어리에 복사, (SharedMemory, 배치표)
+
+    배치표는 변형마다 (meta, [(이름, dtype, shape, 오프셋)]) 이고 피클해도 작다.
+    """
+    from multiprocessing import shared_memory
+
+    layouts, offset = [], 0
+    for compiled in compiled_list:
+        entries = []
+        for name, array in _compiled_arrays(compiled).items():
+            offset = (offset + 63) // 64 * 64  # 캐시 라인 정렬
+            entries.append((name, array.dtype.str, array.shape, offset))
+            offset += array.nbytes
+        layouts.append((_compiled_meta(compiled), entries))
+
+    memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for compiled, (_, entries) in zip(compiled_list, layouts):
+        arrays = _compiled_arrays(compiled)
+        for name, dtype, shape, start in entries:
+            np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=start)[...] = arrays[name]
+    return memory, layouts
+
+
+def attach(name, layouts):
+    """공유 메모리에 붙어 변형별 CompiledQuestions 목록, (SharedMemory, 목록)"""
+    from multiprocessing import shared_memory
+
+    # 워커는 부모의 resource tracker 를 같이 쓰므로 붙을 때 다시 등록돼도 무해하다.
+    # 여기서 등록을 풀면 부모의 unlink 때 추적기가 KeyError 를 찍고, 부모가 죽으면 덩어리가 샌다.
+    memory = shared_memory.SharedMemory(name=name)
+    compiled_list = []
+    for meta, entries in layouts:
+        arrays = {entry: np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=start)
+                  for entry, dtype, shape, start in entries}
+        for array in arrays.values():
+            array.flags.writeable = False
+        compiled_list.append(_restore(meta, arrays))
+    return memory, compiled_list
+
+
+# ---- 실행 ----
+
+def _run_cell(compiled, model, trials, seed, model_index):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(model_index,)))
+    if model is None:
+        return simulate(compiled, trials, rng)
+    return simulate_model(compiled, model, trials, rng)
+
+
+def _init_worker(name, layouts, models):
+    global _worker_cells, _worker_memory
+    _worker_memory, compiled_list = attach(name, layouts)
+    _worker_cells = (compiled_list, models)
+
+
+def _run_task(compiled_list, models, task):
+    v, m, trials, seed = task
+    return v, m, _run_cell(compiled_list[v], models[m], trials, seed, m)
+
+
+def _run_worker_cell(task):
+    return _run_task(*_worker_cells, task)
+
+
+def sweep(variants, models, trials, seed=0, workers=None, progress=None):
+    """variants {이름: 질문 목록} × models {이름: 응답자 모델 또는 None(균등)} 격자 실행 (SweepResult)"""
+    from balance.engine import collect_characters
+
+    names = list(variants)
+    model_names = list(models)
+    model_list = [models[m] for m in model_names]
+    characters = []
+    for questions in variants.values():
+        characters += [c for c in collect_characters(questions) if c not in characters]
+    compiled_list = [compile_questions(variants[name], characters) for name in names]
+
+    counts = np.zeros((len(names), len(model_names), len(characters)), dtype=np.int64)
+    tasks = [(v, m, trials, seed) for v in range(len(names)) for m in range(len(model_names))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if workers == 1:
+        results = (_run_task(compiled_list, model_list, task) for task in tasks)
+        for done, (v, m, part) in enumerate(results, 1):
+            counts[v, m] = part
+            if progress:
+                progress(done, len(tasks))
+        return SweepResult(characters, names, model_names, counts, trials)
+
+    from multiprocessing import Pool
+    memory, layouts = share(compiled_list)
+    try:
+        with Pool(workers, initializer=_init_worker, initargs=(memory.name, layouts, model_list)) as pool:
+            for done, (v, m, part) in enumerate(pool.imap_unordered(_run_worker_cell, tasks), 1):
+                counts[v, m] = part
+                if progress:
+                    progress(done, len(tasks))
+    finally:
+        memory.close()
+        memory.unlink()
+    return SweepResult(characters, names, model_names, counts, trials)
+
+
+def load_sweep(path):
+    """스윕 JSON 을 (variants, models, trials, seed) 로"""
+    from balance.data import load_json, load_questions
+    from balance.respondents import load_model, model_from_dict
+
+    spec = load_json(path)
+    base = os.path.dirname(os.path.abspath(path))
+    resolve = lambda p: p if os.path.isabs(p) else os.path.join(base, p)
+
+    variants = {}
+    for name, source in spec.get("variants", {}).items():
+        if source == "builtin":
+            from manual_biblical_balance import create_biblically_balanced_questions
+            variants[name] = create_biblically_balanced_questions()
+        elif isinstance(source, list):
+            variants[name] = source
+        else:
+            variants[name] = load_questions(resolve(source))
+    if not variants:
+        raise ValueError("variants 가 비어 있습니다")
+
+    models = {}
+    for name, source in spec.get("models", {"uniform": None}).items():
+        if source is None or source == {"type": "uniform"}:
+            models[name] = None  # 균등 응답은 엔진의 블록 인덱스 샘플링을 그대로 쓴다
+        elif isinstance(source, dict):
+            models[name] = model_from_dict(source)
+        else:
+            models[name] = load_model(resolve(source))
+    return variants, models, spec.get("trials", 1 << 20), spec.get("seed", 0)
+
+
+def print_report(result):
+    errors = result.errors()
+    width = max(len(m) for m in result.models)
+    print(f"\n🧪 스윕 결과 (변형 {len(result.variants)}개 × 모델 {len(result.models)}개, 칸마다 {result.trials:,}회)")
+    print("균등 목표와의 제곱 오차 (괄호: 최저 비율 %)")
+    header = " | ".join(f"{m:^{max(width, 16)}}" for m in result.models)
+    print(f"{'변형':^20} | {header}")
+    print("-" * (23 + (max(width, 16) + 3) * len(result.models)))
+    for v, variant in enumerate(result.variants):
+        cells = " | ".join(
+            f"{f'{errors[v, m]:.5f} ({result.counts[v, m].min() / result.trials * 100:.2f})':^{max(width, 16)}}"
+            for m in range(len(result.models)))
+        print(f"{variant:^20} | {cells}")
+
+
+def main():
+    import sys
+    from balance.cli import main as cli_main
+
+    sys.exit(cli_main(["sweep", *sys.argv[1:]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""질문 세트 JSON 구조와 밸런스 검사
+
+numpy 없이 파이썬 딕셔너리만 훑으므로 CLI 에서 바로 돌릴 수 있다.
+QuestionIndex 는 질문 세트를 한 번 훑어 캐릭터별 점수를 주는 선택지 목록과
+얻을 수 있는 최고/최저 총점을 만든다. 1,000문항 × 100명 풀 전체 검사가 수십 밀리초 안에 끝난다.
+
+검사 항목
+- 캐릭터 JSON 에 없는 ID (오타로 생긴 유령 캐릭터), 비슷한 ID 제안
+- 캐릭터 JSON 에는 있지만 어떤 선택지에서도 점수를 받지 못하는 캐릭터
+- 같은 질문에서 다른 선택지를 모든 캐릭터 점수로 지배하는 선택지
+- 최고 총점이 다른 캐릭터의 최저 총점보다 낮아 절대 이길 수 없는 캐릭터
+"""
+
+import difflib
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Issue:
+    """검사에서 발견한 문제 하나"""
+
+    def __init__(self, severity, code, message, question=None, option=None):
+        self.severity = severity
+        self.code = code
+        self.message = message
+        self.question = question  # 질문 id (없으면 1부터 센 순번)
+        self.option = option      # 0부터 센 선택지 번호
+
+    def __str__(self):
+        where = ""
+        if self.question is not None:
+            where = f"Q{self.question}" + ("" if self.option is None else f" 선택지{self.option + 1}") + ": "
+        mark = "❌" if self.severity == ERROR else "⚠️ "
+        return f"{mark} {where}{self.message}"
+
+
+def check_structure(questions):
+    """질문/선택지/점수 형식 검사"""
+    issues = []
+    if not isinstance(questions, list):
+        return [Issue(ERROR, "format", "질문 세트는 리스트여야 합니다")]
+    seen_ids = set()
+    for qi, question in enumerate(questions):
+        qid = question.get('id', qi + 1) if isinstance(question, dict) else qi + 1
+        if not isinstance(question, dict) or not isinstance(question.get('options'), list):
+            issues.append(Issue(ERROR, "format", "options 목록이 없습니다", qid))
+            continue
+        if qid in seen_ids:
+            issues.append(Issue(ERROR, "duplicate-id", "질문 id 가 중복됩니다", qid))
+        seen_ids.add(qid)
+        if not question['options']:
+            issues.append(Issue(ERROR, "no-options", "선택지가 없습니다", qid))
+        for oi, option in enumerate(question['options']):
+            scores = option.get('scores') if isinstance(option, dict) else None
+            if not isinstance(scores, dict):
+                issues.append(Issue(ERROR, "format", "scores 딕셔너리가 없습니다", qid, oi))
+                continue
+            if not scores:
+                issues.append(Issue(WARNING, "empty-scores", "점수가 하나도 없습니다", qid, oi))
+            for character, value in scores.items():
+                if not isinstance(value, int) or isinstance(value, bool):
+                    issues.append(Issue(ERROR, "score-type", f"{character} 점수가 정수가 아닙니다: {value!r}", qid, oi))
+    return issues
+
+
+class QuestionIndex:
+    """캐릭터별 점수 선택지 목록과 최고/최저 총점"""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.characters = []  # 최초 등장 순서
+        self.options = {}     # 캐릭터 -> [(질문 번호, 선택지 번호, 점수)]
+        self.max_score = {}   # 캐릭터 -> 질문마다 가장 높은 선택지를 고른 총점
+        self.min_score = {}   # 캐릭터 -> 질문마다 가장 낮은 선택지를 고른 총점 (점수 없는 선택지는 0)
+        for qi, question in enumerate(questions):
+            options = question['options']
+            high, low, hits = {}, {}, {}
+            for oi, option in enumerate(options):
+                for character, value in option['scores'].items():
+                    entry = self.options.get(character)
+                    if entry is None:
+                        entry = self.options[character] = []
+                        self.characters.append(character)
+                    entry.append((qi, oi, value))
+                    h = high.get(character)
+                    if h is None:
+                        high[character] = low[character] = value
+                        hits[character] = 1
+                        continue
+                    if value > h:
+                        high[character] = value
+                    elif value < low[character]:
+                        low[character] = value
+                    hits[character] += 1
+            count = len(options)
+            max_score, min_score = self.max_score, self.min_score
+            for character, value in high.items():
+                # 점수가 없는 선택지가 있으면 0 도 후보
+                lo = low[character]
+                if hits[character] < count:
+                    value, lo = max(value, 0), min(lo, 0)
+                max_score[character] = max_score.get(character, 0) + value
+                min_score[character] = min_score.get(character, 0) + lo
+
+    def never_wins(self):
+        """[(캐릭터, 최고 총점, 항상 앞서는 캐릭터, 그 캐릭터의 최저 총점)]"""
+        if not self.characters:
+            return []
+        leader = max(self.characters, key=lambda c: self.min_score[c])
+        floor = self.min_score[leader]
+        return [(c, self.max_score[c], leader, floor) for c in self.characters if self.max_score[c] < floor]
+
+    def dominated_options(self):
+        """[(질문 번호, 지배하는 선택지, 지배당하는 선택지)]
+
+        모든 캐릭터 점수가 같거나 높고 하나 이상 더 높으면 지배한다.
+        """
+        found = []
+        for qi, question in enumerate(self.questions):
+            options = [option['scores'] for option in question['options']]
+            # 지배하려면 합이 더 커야 하므로 합으로 먼저 거른다
+            sums = [sum(scores.values()) for scores in options]
+            nonneg = [min(scores.values(), default=0) >= 0 for scores in options]
+            for a, sa in enumerate(options):
+                for b, sb in enumerate(options):
+                    if sums[a] <= sums[b]:
+                        continue
+                    # b 의 모든 점수 이상이고, b 에 없는 a 의 점수는 0 이상이어야 한다
+                    if all(sa.get(k, 0) >= v for k, v in sb.items()) and \
+                            (nonneg[a] or all(v >= 0 for k, v in sa.items() if k not in sb)):
+                        found.append((qi, a, b))
+        return found
+
+
+def _normalize_id(character):
+    return character.lower().replace("_", "").replace(" ", "").replace("-", "")
+
+
+def check_index(index, characters=None):
+    """색인 기반 밸런스 검사"""
+    issues = []
+    qid = lambda qi: index.questions[qi].get('id', qi + 1)
+
+    if characters is not None:
+        known = set(characters)
+        by_normal = {_normalize_id(c): c for c in characters}
+        for character in index.characters:
+            if character in known:
+                continue
+            qi, oi, _ = index.options[character][0]
+            hint = by_normal.get(_normalize_id(character))
+            if hint is None:
+                close = difflib.get_close_matches(character, characters, n=1)
+                hint = close[0] if close else None
+            extra = f" ({hint} 아닌가요?)" if hint else ""
+            count = len(index.options[character])
+            issues.append(Issue(ERROR, "unknown-character",
+                                f"모르는 캐릭터 ID: {character}, 선택지 {count}곳{extra}", qid(qi), oi))
+        for character in characters:
+            if character not in index.options:
+                issues.append(Issue(WARNING, "missing-character", f"{character} 는 어떤 선택지에서도 점수를 받지 못합니다"))
+
+    for qi, a, b in index.dominated_options():
+        issues.append(Issue(WARNING, "dominated-option",
+                            f"선택지{a + 1} 이 선택지{b + 1} 을 모든 캐릭터 점수에서 지배합니다", qid(qi), b))
+
+    for character, best, leader, floor in index.never_wins():
+        issues.append(Issue(WARNING, "never-wins",
+                            f"{character} 최고 총점 {best} < {leader} 최저 총점 {floor}, 절대 1위가 될 수 없습니다"))
+    return issues
+
+
+def check_questions(questions, characters=None):
+    """구조 검사 후 색인을 만들어 밸런스 검사, characters 를 주면 캐릭터 ID 도 검사"""
+    issues = check_structure(questions)
+    if any(i.severity == ERROR for i in issues):
+        return issues
+    return issues + check_index(QuestionIndex(questions), characters)
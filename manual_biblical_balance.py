@@ -2,9 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import json
+import os
 import random
 from collections import defaultdict
 
+TARGET_CHARS = ['moses', 'luke', 'joseph', 'esther']  # 가장 부족했던 4명
+TARGET_MIN_PERCENT = 3.0  # 타겟 캐릭터 성공 기준
+REASONABLE_PERCENT = (2, 10)  # 나머지 캐릭터의 합리적 범위
+ENGINES = ("python", "numpy", "parallel")  # test_balanced_distribution 엔진
+TIE_POLICIES = ("first", "app", "split", "random")  # balance.engine.TIE_POLICIES 와 같다
+FINAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "assets", "data", "biblical_questions_final.json")
+
 def create_biblically_balanced_questions():
     """성경적 특성에 맞는 20개 질문 생성"""
     
@@ -860,15 +869,56 @@ def create_biblically_balanced_questions():
     
     return questions
 
-def test_balanced_distribution(questions):
-    """균형 잡힌 분포 테스트"""
+def test_balanced_distribution(questions, trials=10000, engine="python", seed=None, workers=None,
+                               tie_policy="first"):
+    """균형 잡힌 분포 테스트
+
+    engine="numpy" 는 balance.engine 의 벡터화 엔진,
+    engine="parallel" 은 balance.parallel 의 멀티코어 샤드 실행을 사용
+    tie_policy 는 balance.engine.TIE_POLICIES 중 하나. app 은 first 와 같은 규칙이라 모든 엔진이 받고,
+    split/random 은 numpy 엔진에서만 쓸 수 있다 (다른 엔진은 ValueError).
+    seed 를 주면 모든 엔진과 동점 규칙이 balance.streams 의 카운터 기반 스트림으로 응답을 뽑으므로
+    시행 i 의 응답이 엔진/워커 수와 상관없이 같고 결과도 같다.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"알 수 없는 엔진: {engine} (가능: {', '.join(ENGINES)})")
+    if tie_policy not in TIE_POLICIES:
+        raise ValueError(f"알 수 없는 동점 규칙: {tie_policy} (가능: {', '.join(TIE_POLICIES)})")
+    if tie_policy in ("split", "random") and engine != "numpy":
+        raise ValueError(f"{tie_policy} 동점 규칙은 numpy 엔진에서만 쓸 수 있습니다")
+    if seed is not None and engine in ("numpy", "parallel"):
+        from balance.engine import compile_questions
+        compiled = compile_questions(questions)
+        if engine == "parallel":
+            from balance.parallel import simulate_sharded
+            return compiled.to_dict(simulate_sharded(compiled, trials, seed, workers, counter=True))
+        if tie_policy != "first":
+            from balance.streams import simulate_counter_ties
+            return simulate_counter_ties(compiled, trials, seed, tie_policy).to_dict()
+        from balance.streams import simulate_counter
+        return compiled.to_dict(simulate_counter(compiled, trials, seed))
+    if engine == "numpy":
+        from balance.engine import simulate_distribution
+        return simulate_distribution(questions, trials, seed, tie_policy=tie_policy)
+    if engine == "parallel":
+        from balance.parallel import simulate_distribution_sharded
+        return simulate_distribution_sharded(questions, trials, seed, workers)
+    
     results = defaultdict(int)
+    answers = None
+    if seed is not None:
+        from balance.streams import iter_answers
+        answers = iter_answers(questions, trials, seed)
     
-    for _ in range(10000):
+    for _ in range(trials):
         scores = defaultdict(int)
+        row = next(answers) if answers is not None else None
         
-        for question in questions:
-            random_option = random.choice(question['options'])
+        for qi, question in enumerate(questions):
+            if row is None:
+                random_option = random.choice(question['options'])
+            else:
+                random_option = question['options'][row[qi]]
             for character, score in random_option['scores'].items():
                 scores[character] += score
         
@@ -878,53 +928,64 @@ def test_balanced_distribution(questions):
     
     return results
 
-def main():
-    print("🔧 성경적 특성에 맞는 20개 질문 생성 및 테스트")
-    
-    # 질문 생성
-    questions = create_biblically_balanced_questions()
-    
-    # 테스트 실행
-    results = test_balanced_distribution(questions)
-    
-    # 결과 출력
-    print(f"\n📊 성경적 균형 조정 후 분포 (10,000번 테스트):")
-    print(f"{'캐릭터':^15} | {'매칭수':^6} | {'비율(%)':^8} | {'목표달성':^8}")
-    print("-" * 55)
+def print_report(results, trials):
+    """분포 표와 목표 달성 여부 출력, 성공한 타겟 캐릭터 수 반환"""
+    # split 동점 규칙은 공동 1위에게 1/k 씩 나눠 세므로 매칭수가 소수다
+    fractional = any(isinstance(count, float) for count in results.values())
+    width = 10 if fractional else 6
+    print(f"\n📊 성경적 균형 조정 후 분포 ({trials:,}번 테스트):")
+    print(f"{'캐릭터':^15} | {'매칭수':^{width}} | {'비율(%)':^8} | {'목표달성':^8}")
+    print("-" * (49 + width))
     
     sorted_results = sorted(results.items(), key=lambda x: x[1], reverse=True)
     
-    target_chars = ['moses', 'luke', 'joseph', 'esther']  # 가장 부족했던 4명
     success_count = 0
     
     for char_id, count in sorted_results:
-        percentage = (count / 10000) * 100
+        percentage = (count / trials) * 100
         
-        if char_id in target_chars:
-            if percentage >= 3.0:  # 3% 이상이면 성공
+        if char_id in TARGET_CHARS:
+            if percentage >= TARGET_MIN_PERCENT:  # 3% 이상이면 성공
                 target_status = "✅"
                 success_count += 1
             else:
                 target_status = "❌"
         else:
-            if 2 <= percentage <= 10:  # 합리적 범위
+            low, high = REASONABLE_PERCENT
+            if low <= percentage <= high:  # 합리적 범위
                 target_status = "✅"
             else:
                 target_status = "🔶"
         
-        print(f"{char_id:^15} | {count:^6} | {percentage:^8.2f} | {target_status:^8}")
+        count_text = f"{count:>{width}.2f}" if fractional else f"{count:^{width}}"
+        print(f"{char_id:^15} | {count_text} | {percentage:^8.2f} | {target_status:^8}")
     
-    print(f"\n🎯 타겟 캐릭터 성공: {success_count}/4")
+    print(f"\n🎯 타겟 캐릭터 성공: {success_count}/{len(TARGET_CHARS)}")
+    return success_count
+
+def main(questions=None, trials=10000, output=FINAL_PATH, engine="python", seed=None):
+    print("🔧 성경적 특성에 맞는 20개 질문 생성 및 테스트")
+    
+    # 질문 생성
+    if questions is None:
+        questions = create_biblically_balanced_questions()
+    
+    # 테스트 실행
+    results = test_balanced_distribution(questions, trials, engine, seed)
+    
+    # 결과 출력
+    success_count = print_report(results, trials)
     
     # 결과 저장
     if success_count >= 3:  # 4명 중 3명 이상 성공
-        with open("/Users/kimjungho/Documents/kimjungho_coding/sns-bible-mbti/assets/data/biblical_questions_final.json", 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
-        print("✅ 성경적으로 균형 잡힌 20개 질문이 저장되었습니다!")
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(questions, f, ensure_ascii=False, indent=2)
+            print(f"✅ 성경적으로 균형 잡힌 {len(questions)}개 질문이 저장되었습니다! ({output})")
         return True
     else:
         print("❌ 목표 미달. 추가 조정이 필요합니다.")
         return False
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
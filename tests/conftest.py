@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""저장소 루트(balance, manual_biblical_balance)를 import 경로에 넣어 pytest 를 어디서 돌려도 되게 한다"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""테스트용 작은 질문 세트와 test_balanced_distribution 과 같은 규칙의 기준 승자"""
+
+import random
+from collections import defaultdict
+
+
+def synthetic_questions(num_questions, num_characters, seed, max_entries=4, low=0, high=2):
+    """점수 폭이 좁아 동점이 잦은 임의 질문 세트 (선택지 2~4개, 점수 딕셔너리 순서도 임의)"""
+    r = random.Random(seed)
+    questions = []
+    for qi in range(num_questions):
+        options = []
+        for _ in range(r.randint(2, 4)):
+            picked = r.sample(range(num_characters), r.randint(0, min(max_entries, num_characters)))
+            options.append({"text": "", "scores": {f"c{c}": r.randint(low, high) for c in picked}})
+        questions.append({"id": qi + 1, "question": "", "options": options})
+    return questions
+
+
+def reference_winner(questions, answers):
+    """test_balanced_distribution 의 루프 그대로: max(scores.items()), 점수가 없으면 None"""
+    scores = defaultdict(int)
+    for question, oi in zip(questions, answers):
+        for character, score in question['options'][oi]['scores'].items():
+            scores[character] += score
+    return max(scores.items(), key=lambda x: x[1])[0] if scores else None
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""적응형 시뮬레이션의 구간, 유의수준 분배, 중단 규칙"""
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from balance.adaptive import decide, look_z, simulate_until_settled, wilson_interval
+from balance.engine import compile_questions
+from helpers import synthetic_questions
+
+
+def test_wilson_interval_known_values():
+    low, high = wilson_interval(50, 100, 1.96)
+    assert (low, high) == pytest.approx((0.4038, 0.5962), abs=1e-4)
+    assert wilson_interval(0, 100, 1.96)[0] == 0.0
+    assert wilson_interval(100, 100, 1.96)[1] == pytest.approx(1.0)
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+
+
+def test_look_z_spends_at_most_alpha():
+    num_c = 8
+    spent = sum(2 * (1 - NormalDist().cdf(look_z(k, num_c, 0.05))) * num_c for k in range(1, 5000))
+    assert spent < 0.05
+    assert look_z(1, 1, 0.05) == pytest.approx(NormalDist().inv_cdf(1 - 0.05 * 6 / math.pi ** 2 / 2))
+    assert look_z(2, num_c) > look_z(1, num_c)
+
+
+def test_decisions_settle_only_away_from_thresholds():
+    # 타겟 기준선 3%, 나머지 2 ~ 10%
+    decisions = decide(["t1", "t2", "t3", "a", "b"], [300, 500, 100, 500, 2000], 10000, 1.96,
+                       targets=("t1", "t2", "t3"))
+    assert {d.character: (d.status, d.settled) for d in decisions} == {
+        "t1": ("✅", False), "t2": ("✅", True), "t3": ("❌", True), "a": ("✅", True), "b": ("🔶", True),
+    }
+
+
+@pytest.mark.parametrize("max_trials", [1 << 12, 1 << 20])
+def test_simulate_until_settled_stops_on_schedule(max_trials):
+    compiled = compile_questions(synthetic_questions(6, 4, 180, low=1, high=3))
+    result = simulate_until_settled(compiled, seed=1, initial_trials=1000, max_trials=max_trials, targets=("c0",))
+    assert result.counts.sum() == result.trials
+    assert result.trials == min(1000 * 2 ** (result.looks - 1), max_trials)
+    assert result.settled == all(d.settled for d in result.decisions)
+    assert result.settled or result.trials == max_trials
+    if result.looks > 1 and result.trials < max_trials:
+        # 바로 앞 확인에서는 확정되지 않았어야 한다
+        before = simulate_until_settled(compiled, seed=1, initial_trials=1000, max_trials=result.trials // 2,
+                                        targets=("c0",))
+        assert not before.settled
+    again = simulate_until_settled(compiled, seed=1, initial_trials=1000, max_trials=max_trials, targets=("c0",))
+    assert (again.counts == result.counts).all()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""결과 캐시의 적중, 내용 변경 시 미스, 크기 상한에서의 LRU 삭제"""
+
+import copy
+import os
+
+from balance.cache import ResultCache, cache_key, cached
+from helpers import synthetic_questions
+
+
+def test_hit_and_miss_after_content_change(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    questions = synthetic_questions(3, 3, 110, low=1)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"c0": 1}
+
+    key = cache_key("simulate", questions, seed=1, trials=10)
+    assert cached(cache, key, compute) == ({"c0": 1}, False)
+    assert cached(cache, key, compute) == ({"c0": 1}, True)
+    assert len(calls) == 1
+
+    # 문구만 바꾸면 같은 키, 점수나 점수 순서를 바꾸면 다른 키
+    reworded = copy.deepcopy(questions)
+    reworded[0]['question'] = "다른 문구"
+    reworded[0]['options'][0]['text'] = "다른 선택지"
+    assert cache.get(cache_key("simulate", reworded, seed=1, trials=10)) == {"c0": 1}
+    rescored = copy.deepcopy(questions)
+    rescored[0]['options'][0]['scores'] = {"c2": 9}
+    assert cache.get(cache_key("simulate", rescored, seed=1, trials=10)) is None
+    assert cache.get(cache_key("simulate", questions, seed=2, trials=10)) is None
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 3
+
+
+def test_evicts_least_recently_used_at_capacity(tmp_path):
+    questions = synthetic_questions(3, 3, 111)
+    keys = [cache_key("simulate", questions, seed=s) for s in range(3)]
+    cache = ResultCache(str(tmp_path))
+    cache.put(keys[0], [0] * 50)
+    size = cache.stats()["bytes"]
+    cache.max_bytes = 2 * size  # 엔트리 둘까지
+    cache.put(keys[1], [0] * 50)
+    os.utime(cache._file(keys[0]), (100, 100))
+    os.utime(cache._file(keys[1]), (200, 200))
+
+    assert cache.get(keys[0]) is not None  # 읽으면 가장 최근 사용이 된다
+    cache.put(keys[2], [0] * 50)
+    assert cache.stats()["entries"] == 2
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.clear() == 2 and cache.stats()["entries"] == 0
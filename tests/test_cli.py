@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""명령줄 잘못된 입력이 트레이스백 대신 사용법 오류/0 이 아닌 종료 코드로 끝나는지"""
+
+import pytest
+
+from balance.cli import main
+
+
+def test_subset_unknown_question_id(capsys):
+    with pytest.raises(SystemExit) as e:
+        main(["subset", "--require", "99", "--forbid", "1", "77"])
+    assert e.value.code == 2
+    assert "99 77" in capsys.readouterr().err
+
+
+def test_tie_policy_choices_match_engine():
+    from balance import cli, engine
+
+    assert cli.TIE_POLICIES == engine.TIE_POLICIES
+
+
+def test_simulate_unknown_tie_policy(capsys):
+    with pytest.raises(SystemExit) as e:
+        main(["simulate", "--tie-policy", "bogus"])
+    assert e.value.code == 2
+    assert "bogus" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("option", [["--tie-policy", "split"], ["--model", "model.json"]])
+def test_simulate_python_engine_rejects_numpy_options(option, capsys):
+    with pytest.raises(SystemExit) as e:
+        main(["simulate", "--engine", "python", *option])
+    assert e.value.code == 2
+    assert "numpy" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("command", ["exact", "validate"])
+def test_malformed_questions_file(command, tmp_path, capsys):
+    path = tmp_path / "broken.json"
+    path.write_text('[{"id": 1,', encoding="utf-8")
+    with pytest.raises(SystemExit) as e:
+        main([command, str(path)])
+    assert e.value.code == 1
+    assert str(path) in capsys.readouterr().err
+
+
+def test_exact_defaults_to_all_cores():
+    import os
+
+    from balance.cli import build_parser
+
+    assert build_parser().parse_args(["exact"]).workers == (os.cpu_count() or 1)
+
+
+def test_report_formats_split_counts(capsys):
+    from manual_biblical_balance import print_report
+
+    print_report({"moses": 123.5, "luke": 76.5}, 200)
+    out = capsys.readouterr().out
+    assert "123.50" in out and " 76.50" in out
+
+
+@pytest.mark.parametrize("command", [
+    ["optimize", "--target"], ["subset", "--target"], ["simulate", "--model"], ["early", "--model"],
+    ["reach", "--characters"], ["marginals", "--characters"],
+])
+def test_malformed_option_file(command, tmp_path, capsys):
+    path = tmp_path / "broken.json"
+    path.write_text('{"moses":', encoding="utf-8")
+    with pytest.raises(SystemExit) as e:
+        main([*command, str(path)])
+    assert e.value.code == 1
+    assert str(path) in capsys.readouterr().err
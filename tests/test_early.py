@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""승자 확정 판정을 남은 응답 전수 조사와 비교"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from balance.early import decided_winner, decision_points, worst_margins
+from balance.engine import compile_questions
+from helpers import reference_winner, synthetic_questions
+
+
+def brute_force_decided(questions, prefix):
+    """접두 뒤 모든 응답에서 승자가 같으면 그 승자, 아니면 None"""
+    rest = [range(len(q['options'])) for q in questions[len(prefix):]]
+    found = {reference_winner(questions, (*prefix, *row)) for row in itertools.product(*rest)}
+    return found.pop() if len(found) == 1 else None
+
+
+@pytest.mark.parametrize("seed, low, high", [(0, 0, 2), (1, 0, 2), (2, 1, 3), (3, -1, 2)])
+def test_decisions_match_brute_force(seed, low, high):
+    questions = synthetic_questions(6, 4, seed + 90, low=low, high=high)
+    compiled = compile_questions(questions)
+    margins = worst_margins(compiled)
+    index = compiled.char_index
+
+    prefixes = {}
+    for t in range(len(questions) + 1):
+        for prefix in itertools.product(*[range(len(q['options'])) for q in questions[:t]]):
+            expected = brute_force_decided(questions, prefix)
+            got = decided_winner(compiled, prefix, margins)
+            assert got == (None if expected is None else index[expected])
+            prefixes[prefix] = got
+
+    paths = np.array([row for row in prefixes if len(row) == len(questions)], dtype=np.uint8)
+    win, needed = decision_points(compiled, paths, margins)
+    for row, w, need in zip(paths.tolist(), win.tolist(), needed.tolist()):
+        winner = reference_winner(questions, row)
+        assert w == (-1 if winner is None else index[winner])
+        if w < 0:
+            assert need == len(questions)
+            continue
+        # 가장 이른 확정 지점: need 문항에서 확정, 그 전에는 미확정
+        assert prefixes[tuple(row[:need])] == w
+        assert all(prefixes[tuple(row[:t])] is None for t in range(need))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""벡터화 엔진, 정확 계산, 카운터 스트림, 증분 평가를 원래 파이썬 루프/전수 조사와 비교"""
+
+import copy
+import itertools
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import manual_biblical_balance as manual
+from balance.engine import compile_questions, score_answers, winners
+from balance.exact import exact_counts
+from balance.incremental import EvaluationState, sample_uniform_answers
+from balance.parallel import simulate_sharded
+from balance.streaming import simulate_streaming
+from balance.streams import simulate_counter
+from helpers import reference_winner, synthetic_questions
+
+
+def all_answers(questions):
+    return np.array(list(itertools.product(*[range(len(q['options'])) for q in questions])), dtype=np.uint8)
+
+
+def engine_winners(compiled, answers):
+    win = winners(compiled, score_answers(compiled, answers))
+    return [compiled.characters[w] if w >= 0 else None for w in win]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_engine_matches_reference_loop_with_ties(seed):
+    questions = synthetic_questions(7, 5, seed)
+    compiled = compile_questions(questions)
+    answers = all_answers(questions)
+    expected = [reference_winner(questions, row) for row in answers]
+    assert engine_winners(compiled, answers) == expected
+
+
+def test_engine_matches_reference_loop_on_builtin_set():
+    questions = manual.create_biblically_balanced_questions()
+    compiled = compile_questions(questions)
+    answers = sample_uniform_answers(questions, 20000, np.random.default_rng(0)).astype(np.uint8)
+    expected = [reference_winner(questions, row) for row in answers]
+    assert engine_winners(compiled, answers) == expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_seeded_numpy_engine_matches_python_loop(seed):
+    questions = synthetic_questions(9, 6, seed + 10)
+    python = manual.test_balanced_distribution(questions, 3000, engine="python", seed=seed)
+    numpy = manual.test_balanced_distribution(questions, 3000, engine="numpy", seed=seed)
+    assert dict(python) == numpy
+
+
+@pytest.mark.parametrize("seed, suffix_limit", [(0, 16), (1, 64), (2, 4096), (3, 4)])
+def test_exact_counts_match_brute_force(seed, suffix_limit):
+    questions = synthetic_questions(8, 5, seed + 20)
+    compiled = compile_questions(questions)
+    answers = all_answers(questions)
+    expected = Counter(reference_winner(questions, row) for row in answers)
+
+    counts, total = exact_counts(compiled, suffix_limit=suffix_limit)
+    assert total == len(answers)
+    assert {c: int(n) for c, n in zip(compiled.characters, counts) if n} == \
+        {c: n for c, n in expected.items() if c is not None}
+
+
+def test_counter_streams_agree_across_engines_and_chunks():
+    questions = manual.create_biblically_balanced_questions()
+    compiled = compile_questions(questions)
+    trials, seed = 50000, 7
+    base = simulate_counter(compiled, trials, seed)
+
+    assert (simulate_counter(compiled, trials, seed, batch_size=999) == base).all()
+    assert (simulate_counter(compiled, 20000, seed) + simulate_counter(compiled, 30000, seed, start=20000)
+            == base).all()
+    assert (simulate_sharded(compiled, trials, seed, workers=1, shard_trials=12345, counter=True) == base).all()
+    assert (simulate_streaming(compiled, trials, seed, chunk_size=4321, counter=True).counts == base).all()
+    python = manual.test_balanced_distribution(questions, trials, engine="python", seed=seed)
+    assert dict(python) == compiled.to_dict(base)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_preview_matches_full_recompute(seed):
+    questions = synthetic_questions(10, 6, seed + 30, low=1, high=3)
+    characters = compile_questions(questions).characters
+    answers = sample_uniform_answers(questions, 4000, np.random.default_rng(seed))
+    state = EvaluationState(copy.deepcopy(questions), characters, answers)
+    rng = np.random.default_rng(seed + 100)
+
+    for _ in range(25):
+        qi = int(rng.integers(len(questions)))
+        oi = int(rng.integers(len(questions[qi]['options'])))
+        ci = int(rng.integers(len(characters)))
+        value = int(rng.integers(0, 5))
+        edited = copy.deepcopy(state.questions)
+        edited[qi]['options'][oi]['scores'][characters[ci]] = value
+        fresh = EvaluationState(copy.deepcopy(edited), characters, answers)
+        assert (state.preview(qi, oi, ci, value) == fresh.counts).all()
+
+        expected = Counter(reference_winner(edited, row) for row in answers)
+        assert {c: int(n) for c, n in zip(characters, fresh.counts) if n} == \
+            {c: n for c, n in expected.items() if c is not None}
+        state.set_score(qi, oi, ci, value)
+        assert (state.counts == fresh.counts).all()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_set_option_matches_full_recompute(seed):
+    questions = synthetic_questions(8, 5, seed + 160, low=0, high=3)
+    characters = compile_questions(questions).characters
+    answers = sample_uniform_answers(questions, 3000, np.random.default_rng(seed))
+    state = EvaluationState(copy.deepcopy(questions), characters, answers)
+    rng = np.random.default_rng(seed + 200)
+
+    for step in range(30):
+        qi = int(rng.integers(len(questions)))
+        oi = int(rng.integers(len(questions[qi]['options'])))
+        if step % 3 == 2:
+            # 점수 한 칸 편집도 섞어서 set_option 과 번갈아 쓴다
+            ci = int(rng.integers(len(characters)))
+            state.set_score(qi, oi, ci, int(rng.integers(0, 4)))
+        else:
+            # 항목 삭제, 순서 뒤섞기, 새 캐릭터 추가
+            items = list(state.questions[qi]['options'][oi]['scores'].items())
+            kept = [items[i] for i in rng.permutation(len(items))[:int(rng.integers(0, len(items) + 1))]]
+            extra = [c for c in characters if c not in dict(kept)]
+            if extra and rng.random() < 0.5:
+                kept.insert(int(rng.integers(len(kept) + 1)), (extra[int(rng.integers(len(extra)))], 1))
+            state.set_option(qi, oi, dict(kept))
+
+        fresh = EvaluationState(copy.deepcopy(state.questions), characters, answers)
+        assert (state.counts == fresh.counts).all()
+        expected = Counter(reference_winner(state.questions, row) for row in answers)
+        assert state.to_dict() == {c: n for c, n in expected.items() if c is not None}
+        # 갱신된 캐시로 만든 미리보기도 새로 만든 상태와 같다
+        ci = int(rng.integers(len(characters)))
+        assert (state.preview(qi, oi, ci, 2) == fresh.preview(qi, oi, ci, 2)).all()
+
+
+def test_incremental_zero_score_entry_keeps_its_position():
+    # 0점 항목도 점수 맵에 이미 있으므로 점수를 올려도 먼저 등장한 순서가 그대로다
+    questions = [{"options": [{"scores": {"a": 0, "b": 1}}]}, {"options": [{"scores": {}}, {"scores": {}}]}]
+    answers = sample_uniform_answers(questions, 100, np.random.default_rng(0))
+    state = EvaluationState(copy.deepcopy(questions), ["a", "b"], answers)
+    assert state.preview(0, 0, 0, 1).tolist() == [100, 0]
+    state.set_score(0, 0, 0, 1)
+    state.set_option(1, 0, {})
+    assert state.counts.tolist() == [100, 0]
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_seeded_app_policy_matches_first(seed):
+    questions = manual.create_biblically_balanced_questions()
+    first = manual.test_balanced_distribution(questions, 30000, engine="numpy", seed=seed)
+    app = manual.test_balanced_distribution(questions, 30000, engine="numpy", seed=seed, tie_policy="app")
+    assert app == first
+    assert dict(manual.test_balanced_distribution(questions, 30000, engine="python", seed=seed)) == first
+
+
+@pytest.mark.parametrize("policy", ["first", "app", "split", "random"])
+def test_seeded_tie_policies_do_not_depend_on_batch_size(policy):
+    from balance.streams import simulate_counter_ties
+
+    compiled = compile_questions(manual.create_biblically_balanced_questions())
+    base = simulate_counter_ties(compiled, 40000, 5, policy)
+    other = simulate_counter_ties(compiled, 40000, 5, policy, batch_size=777)
+    assert (base.counts == other.counts).all()
+    assert base.tie_trials == other.tie_trials
+    if policy in ("first", "app"):
+        assert (base.counts == simulate_counter(compiled, 40000, 5)).all()
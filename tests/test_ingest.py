@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""응답 로그 집계가 깨진 줄을 이유별로 세고 나머지는 앱 규칙대로 채점하는지"""
+
+import json
+
+import numpy as np
+import pytest
+
+from balance.engine import compile_questions
+from balance.ingest import ingest
+from helpers import reference_winner, synthetic_questions
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_ingest_counts_bad_lines_by_reason(chunk_size):
+    questions = synthetic_questions(4, 3, 100, low=1)
+    compiled = compile_questions(questions)
+    good = [[0, 1, 0, 1], [1, 0, 1, 0], [0, 0, 0, 0], [1, 1, 1, 1]]
+    ids = {str(q['id']): a for q, a in zip(questions, good[1])}
+    lines = [
+        json.dumps(good[0]),
+        json.dumps({"answers": good[2], "winner": "nobody"}),
+        json.dumps({"answerChoices": ids, "resultCharacter": {"id": reference_winner(questions, good[1])}}),
+        json.dumps({"answers": good[3], "winner": "c0"}),
+        "",                                   # 빈 줄은 세지 않는다
+        '{"answers": [0, 1,',                 # json
+        "not json",                           # json
+        json.dumps({"answers": "0101"}),      # format
+        json.dumps([0, 1, 0, True]),          # format (bool)
+        json.dumps([0, 1, 0, 1.0]),           # format (실수)
+        json.dumps([0, 1, 0]),                # incomplete
+        json.dumps([0, 1, 0, 1, 0]),          # incomplete
+        json.dumps({"answerChoices": {"1": 0}}),  # incomplete
+        json.dumps([0, 1, 0, 9]),             # range
+        json.dumps([0, -1, 0, 1]),            # range
+        json.dumps([0, 1, 0, 1 << 70]),       # range (int64 넘침)
+    ]
+    stats = ingest(compiled, lines, chunk_size=chunk_size)
+
+    assert stats.lines == 15
+    assert stats.bad == {"json": 2, "format": 3, "incomplete": 3, "range": 3}
+    assert stats.scored == 4
+    expected = np.zeros(compiled.num_characters, dtype=np.int64)
+    for row in (good[0], good[2], good[1], good[3]):
+        expected[compiled.char_index[reference_winner(questions, row)]] += 1
+    assert (stats.counts == expected).all()
+    assert stats.option_counts.sum() == 4 * len(questions)
+    assert stats.logged == 2  # 모르는 캐릭터 "nobody" 는 빼고
+    assert stats.mismatched == int(reference_winner(questions, good[3]) != "c0")
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""캐릭터별 총점 분포를 전수 조사와 비교"""
+
+import itertools
+from collections import Counter
+
+import pytest
+
+import balance.marginals as marginals
+from balance.data import load_questions
+from balance.marginals import score_marginal
+from helpers import synthetic_questions
+
+
+def brute_force(questions, character):
+    ranges = [range(len(q['options'])) for q in questions]
+    return Counter(sum(q['options'][o]['scores'].get(character, 0) for q, o in zip(questions, row))
+                   for row in itertools.product(*ranges))
+
+
+@pytest.mark.parametrize("low, high", [(0, 2), (-2, 3)])
+def test_marginal_matches_brute_force(low, high):
+    questions = synthetic_questions(7, 4, 50, low=low, high=high)
+    for character in ("c0", "c1", "c2", "c3"):
+        m = score_marginal(questions, character)
+        counted = {m.low + i: int(n) for i, n in enumerate(m.counts) if n}
+        assert counted == dict(brute_force(questions, character))
+
+
+def test_python_int_fallback_matches_int64(monkeypatch):
+    questions = load_questions()
+    expected = [int(n) for n in score_marginal(questions, "moses").counts]
+    monkeypatch.setattr(marginals, "INT64_LIMIT", 1)
+    fallback = score_marginal(questions, "moses")
+    assert fallback.counts.dtype == object
+    assert [int(n) for n in fallback.counts] == expected
+
+
+def test_percentile_and_tail():
+    questions = [{"options": [{"scores": {"a": 0}}, {"scores": {"a": 1}}]}] * 3
+    m = score_marginal(questions, "a")
+    assert [int(n) for n in m.counts] == [1, 3, 3, 1]
+    assert m.percentile(50) == 1
+    assert m.at_least(2) == 0.5
+    assert m.mean() == 1.5
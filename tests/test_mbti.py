@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""MBTI 조회 배열 집계를 시행별 문자열 집계와 비교"""
+
+from collections import Counter
+
+import numpy as np
+
+from balance.adaptive import wilson_interval
+from balance.data import load_questions
+from balance.engine import compile_questions, count_winners, sample_answers, score_answers, winners
+from balance.mbti import AXES, MbtiLookup, aggregate
+
+
+def test_lookup_matches_per_trial_strings():
+    compiled = compile_questions(load_questions())
+    mbti = {c: code for c, code in zip(compiled.characters, ["ISTJ", "INFJ", "ENFP", "ISTJ"] * 8)}
+    del mbti[compiled.characters[-1]]  # 유형 모르는 캐릭터
+    lookup = MbtiLookup(compiled.characters, mbti)
+    win = winners(compiled, score_answers(compiled, sample_answers(compiled, 50000, np.random.default_rng(0))))
+    win[:7] = -1  # 승자 없음
+
+    per_trial = lookup.count_types(win)
+    from_counts = lookup.types_from_counts(count_winners(compiled, win))
+    from_counts[-1] += int((win < 0).sum())
+    assert (per_trial == from_counts).all()
+
+    codes = [mbti.get(compiled.characters[w]) if w >= 0 else None for w in win]
+    typed = Counter(code for code in codes if code)
+    assert dict(zip(lookup.types, per_trial[:-1].tolist())) == {t: typed[t] for t in lookup.types}
+    letters = Counter(letter for code in codes if code for letter in code)
+    axes = lookup.axis_counts(per_trial)
+    assert all(axes[a, s] == letters[letter] for a, axis in enumerate(AXES) for s, letter in enumerate(axis))
+
+    # 캐릭터별 승리 횟수에는 승자 없는 시행이 없으므로 유형 없음은 유형 모르는 캐릭터의 승리뿐이다
+    result = aggregate(lookup, count_winners(compiled, win), len(win))
+    assert result.unassigned == int((win == compiled.num_characters - 1).sum())
+
+
+def test_vectorized_interval_matches_scalar():
+    counts = np.array([0, 3, 500, 1000])
+    low, high = wilson_interval(counts, 1000, 1.96)
+    for i, count in enumerate(counts):
+        assert (low[i], high[i]) == wilson_interval(int(count), 1000, 1.96)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""측정을 켜도 결과가 같고, 단계/카운터와 내보내기 형식이 맞는지"""
+
+import json
+
+import numpy as np
+
+from balance.engine import compile_questions, simulate
+from balance.metrics import NULL_METRICS, STAGES, Metrics
+from helpers import synthetic_questions
+
+
+def test_metrics_record_stages_without_changing_results(tmp_path):
+    compiled = compile_questions(synthetic_questions(8, 5, 200, low=1))
+    calls = []
+    metrics = Metrics(progress=calls.append, interval=0.0)
+    counts = simulate(compiled, 10000, np.random.default_rng(1), batch_size=3000, metrics=metrics)
+    assert (counts == simulate(compiled, 10000, np.random.default_rng(1), 3000, NULL_METRICS)).all()
+
+    assert metrics.counters["trials"] == 10000
+    assert metrics.counters["done"] == metrics.counters["total"] == 10000
+    assert set(metrics.calls) == {"sample", "accumulate", "select"} <= set(STAGES)
+    assert all(n == 4 for n in metrics.calls.values())  # 배치 4개
+    assert len(calls) == 4 and calls[0] is metrics
+
+    path = tmp_path / "run.json"
+    metrics.save(str(path))
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["counters"]["trials"] == 10000 and saved["stages"]["sample"]["calls"] == 4
+
+    path = tmp_path / "run.prom"
+    metrics.save(str(path))
+    text = path.read_text(encoding="utf-8")
+    assert 'balance_stage_calls_total{stage="select"} 4' in text
+    assert "balance_trials_total 10000" in text and "balance_done 10000" in text
+
+
+def test_progress_interval_throttles_callbacks():
+    calls = []
+    metrics = Metrics(progress=calls.append, interval=3600)
+    for done in range(100):
+        metrics.tick(done, 100)
+    assert calls == [] and metrics.counters["done"] == 99
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""최적화기가 편집 예산을 지키고 표본 오차를 늘리지 않는지"""
+
+import pytest
+
+from balance.optimize import optimize, squared_error, uniform_target
+from helpers import synthetic_questions
+
+
+def changed_characters(before, after):
+    """(질문, 선택지) -> 점수가 바뀐 캐릭터 집합"""
+    changed = {}
+    for qi, (q_old, q_new) in enumerate(zip(before, after)):
+        for oi, (o_old, o_new) in enumerate(zip(q_old['options'], q_new['options'])):
+            names = {c for c in set(o_old['scores']) | set(o_new['scores'])
+                     if o_old['scores'].get(c) != o_new['scores'].get(c)}
+            if names:
+                changed[qi, oi] = names
+    return changed
+
+
+@pytest.mark.parametrize("budget", [1, 2, None])
+def test_optimize_respects_budget_and_improves(budget):
+    questions = synthetic_questions(8, 5, 80, low=1, high=4)
+    target = uniform_target(["c0", "c1", "c2", "c3", "c4"])
+    result = optimize(questions, target, trials=4000, seed=3, max_edits_per_option=budget, max_iterations=30)
+
+    assert squared_error(result.after, result.target) <= squared_error(result.before, result.target)
+    assert result.iterations > 0
+    changed = changed_characters(questions, result.questions)
+    if budget is not None:
+        assert all(len(names) <= budget for names in changed.values())
+    assert sum(len(names) for names in changed.values()) == len(result.diff)
+
+    again = optimize(questions, target, trials=4000, seed=3, max_edits_per_option=budget, max_iterations=30)
+    assert again.diff == result.diff
+    assert (again.after == result.after).all()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""샤드 병렬 실행이 워커 수와 상관없이 같은 결과를 내는지"""
+
+import numpy as np
+import pytest
+
+from balance.engine import compile_questions, simulate
+from balance.metrics import Metrics
+from balance.parallel import shard_plan, shard_rng, simulate_sharded
+from helpers import synthetic_questions
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    return compile_questions(synthetic_questions(6, 5, 130, low=1, high=3))
+
+
+@pytest.mark.parametrize("counter", [False, True])
+def test_workers_do_not_change_result(compiled, counter):
+    single = simulate_sharded(compiled, 10000, 42, workers=1, shard_trials=1500, counter=counter)
+    multi = simulate_sharded(compiled, 10000, 42, workers=3, shard_trials=1500, counter=counter)
+    assert (single == multi).all()
+    assert single.sum() == 10000
+
+
+def test_non_counter_shards_use_spawned_streams(compiled):
+    expected = sum(simulate(compiled, n, shard_rng(7, i)) for i, n in shard_plan(5000, 2000))
+    metrics = Metrics()
+    assert (simulate_sharded(compiled, 5000, 7, workers=1, shard_trials=2000, metrics=metrics) == expected).all()
+    assert metrics.counters["shards"] == 3 and metrics.counters["trials"] == 5000
+    assert not (simulate_sharded(compiled, 5000, 8, workers=1, shard_trials=2000) == expected).all()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""상위 k 순위를 점수 맵 전체 정렬(삽입 순서 동점 규칙)과 비교"""
+
+import itertools
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from balance.engine import compile_questions, score_answers, simulate, simulate_ranks, top_ranks
+from helpers import synthetic_questions
+
+
+def reference_ranking(questions, answers):
+    """앱의 getTop3Characters 처럼 점수 맵을 값 내림차순 안정 정렬"""
+    scores = defaultdict(int)
+    for question, oi in zip(questions, answers):
+        for character, score in question['options'][oi]['scores'].items():
+            scores[character] += score
+    return [c for c, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)]
+
+
+@pytest.mark.parametrize("seed, k", [(0, 3), (1, 3), (2, 1), (3, 5), (4, 8)])
+def test_top_ranks_match_full_sort(seed, k):
+    questions = synthetic_questions(6, 5, seed + 140)
+    compiled = compile_questions(questions)
+    paths = list(itertools.product(*[range(len(q['options'])) for q in questions]))
+    ranks = top_ranks(compiled, score_answers(compiled, np.array(paths, dtype=np.uint8)), k)
+    assert ranks.shape == (len(paths), min(k, compiled.num_characters))
+    for row, rank in zip(paths, ranks.tolist()):
+        expected = reference_ranking(questions, row)[:ranks.shape[1]]
+        assert [compiled.characters[c] for c in rank if c >= 0] == expected
+        assert all(c == -1 for c in rank[len(expected):])
+
+
+def test_simulate_ranks_first_rank_is_winner():
+    compiled = compile_questions(synthetic_questions(8, 6, 150, low=1, high=3))
+    result = simulate_ranks(compiled, 20000, np.random.default_rng(5), k=3, batch_size=3000)
+    assert (result.rank_counts[0] == simulate(compiled, 20000, np.random.default_rng(5), 3000)).all()
+    assert (result.rank_counts.sum(axis=1) <= 20000).all()
+    assert (result.top_counts == result.rank_counts.sum(axis=0)).all()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""도달 가능성과 최소 확정 응답을 전수 조사와 비교"""
+
+import itertools
+
+import pytest
+
+from balance.reach import guarantees_win, print_report, solve
+from helpers import reference_winner, synthetic_questions
+
+
+def completions(questions, fixed):
+    ranges = [[fixed[q]] if q in fixed else range(len(question['options'])) for q, question in enumerate(questions)]
+    return itertools.product(*ranges)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_reach_matches_brute_force(seed):
+    questions = synthetic_questions(6, 4, seed + 40, low=1, high=3)
+    reachable = {reference_winner(questions, row) for row in completions(questions, {})}
+
+    for result in solve(questions):
+        assert result.reachable == (result.character in reachable)
+        if not result.reachable:
+            continue
+        assert reference_winner(questions, result.witness) == result.character
+
+        # 고정 응답이면 나머지를 어떻게 골라도 이긴다
+        assert all(reference_winner(questions, row) == result.character
+                   for row in completions(questions, result.fixed))
+        # 최소라고 했으면 더 적은 질문을 고정해서 확정하는 방법이 없다
+        if result.fixed_optimal:
+            for size in range(len(result.fixed)):
+                for picked in itertools.combinations(range(len(questions)), size):
+                    for options in itertools.product(*[range(len(questions[q]['options'])) for q in picked]):
+                        assert not guarantees_win(questions, result.character, dict(zip(picked, options)))
+
+
+def test_report_states_strict_margin_bound(capsys):
+    # a 가 먼저 등장하므로 Q1 만 고정해도 동점이면 a 가 이기지만, 1점 차 기준으로는 두 문항이 필요하다
+    questions = [{"options": [{"scores": {"a": 1, "b": 0}}, {"scores": {"b": 1}}]},
+                 {"options": [{"scores": {"b": 1}}, {"scores": {"a": 1}}]}]
+    assert all(reference_winner(questions, (0, o)) == "a" for o in range(2))
+    a = next(r for r in solve(questions) if r.character == "a")
+    assert len(a.fixed) == 2 and a.fixed_optimal
+    print_report(solve(questions), questions)
+    assert "보수적 기준" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""응답자 모델이 지정한 선택 분포와 규칙대로 응답 행렬을 뽑는지"""
+
+import numpy as np
+import pytest
+
+from balance.engine import compile_questions
+from balance.respondents import MixtureModel, TableModel, UniformModel, model_from_dict, simulate_model
+from helpers import reference_winner, synthetic_questions
+
+N = 200000
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    return compile_questions(synthetic_questions(6, 5, 170, low=1, high=3))
+
+
+def test_table_model_frequencies(compiled):
+    counts = [int(c) for c in compiled.option_counts]
+    qid = str(compiled.questions[2]['id'])
+    model = model_from_dict({"type": "table", "default": [3, 1], "questions": {qid: [0, 0, 1, 1]}})
+    answers = model.sample(compiled, N, np.random.default_rng(0))
+    for qi, p in enumerate(model.probabilities(compiled)):
+        observed = np.bincount(answers[:, qi], minlength=counts[qi]) / N
+        assert observed == pytest.approx(p, abs=0.005)
+        assert (observed[p == 0] == 0).all()  # 가중치 0 인 선택지는 나오지 않는다
+    assert model.probabilities(compiled)[0][:2] == pytest.approx([0.75, 0.25])
+
+
+def test_markov_repeat_and_transition(compiled):
+    counts = compiled.option_counts
+    always = model_from_dict({"type": "markov", "repeat": 1.0}).sample(compiled, 5000, np.random.default_rng(1))
+    for qi in range(1, compiled.num_questions):
+        prev = always[:, qi - 1]
+        fits = prev < counts[qi]
+        assert (always[fits, qi] == prev[fits]).all()
+
+    # 직전 위치가 짝수면 두 번째, 홀수면 첫 번째 선택지로 가는 전이 행렬 (모자란 칸은 0)
+    shift = [[0, 1], [1, 0], [0, 1], [1, 0]]
+    answers = model_from_dict({"type": "markov", "transition": shift}).sample(compiled, 5000, np.random.default_rng(2))
+    for qi in range(1, compiled.num_questions):
+        assert (answers[:, qi] == (answers[:, qi - 1] + 1) % 2).all()
+
+
+def test_mixture_and_deterministic_simulation(compiled):
+    first = TableModel(default=[1, 0, 0, 0])
+    mixture = MixtureModel([("a", 3, first), ("b", 1, UniformModel())])
+    assert np.bincount(mixture.assign(N, np.random.default_rng(3))) / N == pytest.approx([0.75, 0.25], abs=0.005)
+
+    # 한 경로만 고르는 모델이면 모든 시행의 승자가 그 경로의 승자다
+    counts = simulate_model(compiled, first, 1000, np.random.default_rng(4), batch_size=300)
+    winner = reference_winner(compiled.questions, [0] * compiled.num_questions)
+    assert counts[compiled.char_index[winner]] == 1000
+
+
+@pytest.mark.parametrize("spec", [
+    {"type": "nope"},
+    {"type": "markov"},
+    {"type": "markov", "repeat": 1.5},
+    {"type": "mixture", "personas": []},
+])
+def test_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        model_from_dict(spec)
+
+
+def test_invalid_weights(compiled):
+    with pytest.raises(ValueError):
+        TableModel(default=[1, -1]).probabilities(compiled)
+    with pytest.raises(ValueError):
+        TableModel(default=[0, 0]).probabilities(compiled)
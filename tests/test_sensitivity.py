@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""민감도 표의 편집별 변화를 편집한 질문 세트의 재계산과 비교"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from balance.incremental import from_questions
+from balance.sensitivity import sensitivity
+from helpers import synthetic_questions
+
+
+@pytest.mark.parametrize("include_absent, score_range", [(True, None), (False, (1, 2))])
+def test_deltas_match_recompute(include_absent, score_range):
+    questions = synthetic_questions(5, 4, 190, low=0, high=2)
+    result = sensitivity(questions, trials=2000, seed=3, include_absent=include_absent, score_range=score_range)
+    base = from_questions(questions, result.characters, 2000, 3)
+    assert np.allclose(result.base, base.counts / 2000)
+    assert len(result.edits) == len(result.deltas)
+
+    for e, (qi, oi, ci, before, after) in enumerate(result.edits):
+        character = result.characters[ci]
+        scores = questions[qi]['options'][oi]['scores']
+        assert abs(after - before) == 1
+        assert scores.get(character, 0) == before
+        if score_range:
+            assert score_range[0] <= after <= score_range[1]
+        if not include_absent:
+            assert character in scores
+        edited = copy.deepcopy(questions)
+        edited[qi]['options'][oi]['scores'][character] = after
+        fresh = from_questions(edited, result.characters, 2000, 3)
+        assert np.allclose(result.deltas[e], (fresh.counts - base.counts) / 2000)
+
+
+def test_ranked_orders_by_effect():
+    result = sensitivity(synthetic_questions(5, 4, 191, low=1, high=3), trials=2000, seed=0)
+    for character in result.characters:
+        ci = result.characters.index(character)
+        up = result.ranked(character, top=3)
+        down = result.ranked(character, top=3, direction=-1)
+        assert all(result.deltas[e, ci] > 0 for e in up) and all(result.deltas[e, ci] < 0 for e in down)
+        assert [result.deltas[e, ci] for e in up] == sorted((result.deltas[e, ci] for e in up), reverse=True)
+        assert up and result.deltas[up[0], ci] == result.deltas[:, ci].max()
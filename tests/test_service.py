@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""채점 서비스 결과를 앱 규칙(reference_winner)과 비교하고 잘못된 입력을 거르는지"""
+
+import io
+import json
+
+import numpy as np
+import pytest
+
+from balance.engine import compile_questions
+from balance.service import Scorer, serve_stdin
+from helpers import reference_winner, synthetic_questions
+
+
+@pytest.fixture
+def setup():
+    questions = synthetic_questions(5, 4, 70)
+    return questions, Scorer(compile_questions(questions), cache_size=4)
+
+
+def test_scores_match_app_rule(setup):
+    questions, scorer = setup
+    answers = np.random.default_rng(0).integers(0, 2, size=(30, len(questions)))
+    results = scorer.score(answers.tolist())
+    for row, result in zip(answers.tolist(), results):
+        assert result["winner"] == reference_winner(questions, row)
+        totals = {}
+        for question, oi in zip(questions, row):
+            for character, score in question['options'][oi]['scores'].items():
+                totals[character] = totals.get(character, 0) + score
+        assert result["scores"] == totals
+        assert list(result["scores"]) == list(totals)
+    assert scorer.score(answers) == results  # numpy 정수 배열도 받는다
+    assert len(scorer.cache) <= 4
+
+
+@pytest.mark.parametrize("answers, message", [
+    ([[0, 1, 0]], "길이"),
+    ([[0, 1, 0, 1, 9]], "범위"),
+    ([[0, 1, 0, 1, -1]], "범위"),
+    ([[0, 1, 0, 1, 1.7]], "정수"),
+    ([[0, 1, 0, 1, "1"]], "정수"),
+    ([[0, 1, 0, 1, True]], "정수"),
+    (np.zeros((1, 5)), "정수"),
+])
+def test_rejects_invalid_answers(setup, answers, message):
+    _, scorer = setup
+    with pytest.raises(ValueError, match=message):
+        scorer.score(answers)
+    assert scorer.misses == 0
+
+
+def test_stdin_reports_bad_lines_and_continues(setup):
+    _, scorer = setup
+    stdin = io.StringIO('[0, 1, 0, 1, 0]\n[0, 1, 0, 1, 0.5]\n{"answers": [[1, 1, 1, 1, 1]]}\n')
+    stdout = io.StringIO()
+    serve_stdin(scorer, stdin, stdout)
+    lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert "winner" in lines[0]
+    assert "정수" in lines[1]["error"]
+    assert len(lines[2]["results"]) == 1
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""스트리밍 시뮬레이션과 벤치마크 비교 규칙"""
+
+import numpy as np
+import pytest
+
+from balance.benchmark import compare, run_benchmarks, synthetic_questions
+from balance.engine import compile_questions
+from balance.respondents import TableModel, simulate_model
+from balance.streaming import simulate_streaming
+from balance.streams import simulate_counter
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    return compile_questions(synthetic_questions(12, 8, seed=3))
+
+
+def test_counter_stream_ignores_chunk_size(compiled):
+    base = simulate_counter(compiled, 30000, 11)
+    for chunk_size in (1000, 7777, 1 << 16):
+        result = simulate_streaming(compiled, 30000, seed=11, chunk_size=chunk_size, counter=True)
+        assert (result.counts == base).all()
+        assert result.trials == 30000 and result.chunks == -(-30000 // chunk_size)
+
+
+def test_uniform_and_model_chunks(compiled):
+    result = simulate_streaming(compiled, 20000, seed=4, chunk_size=3000, track_memory=True)
+    assert result.counts.sum() == 20000 and result.chunks == 7
+    assert result.memory.traced_peak is not None
+    again = simulate_streaming(compiled, 20000, seed=4, chunk_size=3000)
+    assert (again.counts == result.counts).all()
+
+    # 모델을 주면 청크마다 model.sample 로 뽑으므로 simulate_model 을 같은 배치로 돌린 것과 같다
+    model = TableModel(default=[4, 3, 2, 1])
+    streamed = simulate_streaming(compiled, 9000, seed=5, chunk_size=3000, model=model)
+    assert (streamed.counts == simulate_model(compiled, model, 9000, np.random.default_rng(5), 3000)).all()
+
+    with pytest.raises(ValueError):
+        simulate_streaming(compiled, 10, counter=True)
+    with pytest.raises(ValueError):
+        simulate_streaming(compiled, 10, seed=1, model=model, counter=True)
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {"numpy/x": {"trials_per_second": 1000, "peak_bytes": 100},
+                "exact/x": {"paths_per_second": 50, "wall_seconds": 2.0}}
+    results = {"numpy/x": {"trials_per_second": 850, "peak_bytes": 130},
+               "exact/x": {"paths_per_second": 30, "wall_seconds": 2.3},
+               "new/x": {"trials_per_second": 1}}
+    assert compare(results, baseline, tolerance=0.2) == [
+        ("numpy/x", "peak_bytes", 100, 130),
+        ("exact/x", "paths_per_second", 50, 30),
+    ]
+
+
+def test_small_benchmark_run():
+    names = []
+    results = run_benchmarks(engines=("python", "numpy", "streaming"), synthetic_shape=(6, 5), exact_questions=4,
+                             scale=0.001, progress=names.append)
+    assert list(results) == names
+    assert set(results) == {f"{e}/{s}" for e in ("python", "numpy", "streaming")
+                            for s in ("shipped", "synthetic6x5")} | {"exact/shipped[:4]"}
+    assert results["exact/shipped[:4]"]["paths"] == 4 ** 4
+    assert all(m["trials_per_second"] > 0 for name, m in results.items() if not name.startswith("exact"))
+    assert compare(results, results) == []
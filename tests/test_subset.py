@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""부분 집합 선별 탐색을 같은 표본의 전수 평가와 비교"""
+
+import itertools
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from balance.engine import collect_characters, compile_questions, sample_answers
+from balance.subset import count_candidates, screen, select_subsets
+from helpers import reference_winner, synthetic_questions
+
+TRIALS = 256
+
+
+def exhaustive(questions, k, trials, seed, required=(), forbidden=()):
+    """모든 조합을 같은 응답 표본과 앱 규칙 루프로 평가한 {조합: 오차}"""
+    characters = collect_characters(questions)
+    target = np.full(len(characters), 1 / len(characters))
+    answers = sample_answers(compile_questions(questions, characters), trials, np.random.default_rng(seed)).tolist()
+    errors = {}
+    for picked in itertools.combinations(range(len(questions)), k):
+        if not set(required) <= set(picked) or set(forbidden) & set(picked):
+            continue
+        sub = [questions[q] for q in picked]
+        wins = Counter(reference_winner(sub, [row[q] for q in picked]) for row in answers)
+        rates = np.array([wins[c] for c in characters]) / trials
+        errors[picked] = float(((rates - target) ** 2).sum())
+    return characters, target, errors
+
+
+@pytest.mark.parametrize("required, forbidden", [((), ()), ((2,), (5,))])
+def test_screen_matches_exhaustive(required, forbidden):
+    questions = synthetic_questions(8, 4, 120, low=1)
+    characters, target, errors = exhaustive(questions, 4, TRIALS, 7, required, forbidden)
+    compiled = compile_questions(questions, characters)
+    assert count_candidates(8, 4, required, forbidden) == len(errors)
+
+    # 가지치기 없이 모두 남기면 전수 평가와 순위까지 같다
+    full = screen(compiled, 4, target, TRIALS, 7, required, forbidden, keep=len(errors))
+    assert [c for _, c in full] == sorted(errors, key=lambda c: (errors[c], c))
+    assert all(e == pytest.approx(errors[c]) for e, c in full)
+
+    # 가지치기를 해도 남은 후보의 오차는 표본 전체 기준이고 제약을 지킨다
+    pruned = screen(compiled, 4, target, TRIALS, 7, required, forbidden, keep=3)
+    assert len(pruned) == 3
+    assert [e for e, _ in pruned] == sorted(e for e, _ in pruned)
+    assert all(e == pytest.approx(errors[c]) for e, c in pruned)
+
+
+def test_select_subsets_respects_constraints():
+    questions = synthetic_questions(8, 4, 121, low=1)
+    results, characters, target = select_subsets(questions, 3, required=[1], forbidden=[0], screen_trials=TRIALS,
+                                                 refine_trials=1024, keep=8, top=5)
+    assert len(results) == 5
+    assert [r.error for r in results] == sorted(r.error for r in results)
+    assert all(1 in r.indices and 0 not in r.indices and r.indices == sorted(r.indices) for r in results)
+    assert all(r.rates.sum() == pytest.approx(1) for r in results)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""여러 워커 스윕이 공유 메모리를 깔끔하게 정리하는지 (resource tracker 경고 없음)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import multiprocessing, sys
+multiprocessing.set_start_method(sys.argv[1])
+from balance import data
+from balance.sweep import sweep
+questions = data.load_questions()
+result = sweep({"base": questions, "short": questions[:10]}, {"uniform": None}, 4096, seed=0, workers=3)
+serial = sweep({"base": questions, "short": questions[:10]}, {"uniform": None}, 4096, seed=0, workers=1)
+assert (result.counts == serial.counts).all()
+"""
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn", "forkserver"])
+def test_multi_worker_sweep_stderr_clean(method):
+    if method not in __import__("multiprocessing").get_all_start_methods():
+        pytest.skip(f"{method} 미지원")
+    done = subprocess.run([sys.executable, "-c", SCRIPT, method], cwd=ROOT,
+                          capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr
+    assert done.stderr == ""
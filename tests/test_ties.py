@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""동점 규칙(first/app/split/random)과 공동 1위 집계를 전수 조사와 비교"""
+
+import itertools
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+import manual_biblical_balance as manual
+from balance.engine import TieTally, compile_questions, score_answers, simulate_with_ties
+from helpers import reference_winner, synthetic_questions
+
+
+def enumerate_ties(questions):
+    """모든 응답 경로의 (first 승자, 공동 1위 목록)"""
+    ranges = [range(len(q['options'])) for q in questions]
+    for row in itertools.product(*ranges):
+        scores = defaultdict(int)
+        for question, oi in zip(questions, row):
+            for character, score in question['options'][oi]['scores'].items():
+                scores[character] += score
+        top = max(scores.values()) if scores else None
+        yield row, reference_winner(questions, row), [c for c, v in scores.items() if v == top]
+
+
+def exhaustive(compiled, policy, answers):
+    tally = TieTally(compiled, policy)
+    tally.add(score_answers(compiled, answers), lambda multi: np.random.default_rng(0).random(
+        (int(multi.sum()), compiled.num_characters)))
+    return tally.result(len(answers))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tie_policies_match_enumeration(seed):
+    questions = synthetic_questions(6, 4, seed + 60)
+    compiled = compile_questions(questions)
+    paths = list(enumerate_ties(questions))
+    answers = np.array([row for row, _, _ in paths], dtype=np.uint8)
+    index = compiled.char_index
+
+    first = exhaustive(compiled, "first", answers)
+    app = exhaustive(compiled, "app", answers)
+    assert (app.counts == first.counts).all()
+    expected = np.zeros(compiled.num_characters, dtype=np.int64)
+    for _, winner, _ in paths:
+        if winner is not None:
+            expected[index[winner]] += 1
+    assert (first.counts == expected).all()
+
+    # 공동 1위 시행 수와 캐릭터별 공동 1위 횟수
+    tied_paths = [leaders for _, _, leaders in paths if len(leaders) > 1]
+    assert first.tie_trials == len(tied_paths)
+    tie_counts = np.zeros(compiled.num_characters, dtype=np.int64)
+    shares = np.zeros(compiled.num_characters)
+    for _, _, leaders in paths:
+        for c in leaders:
+            shares[index[c]] += 1 / len(leaders)
+            if len(leaders) > 1:
+                tie_counts[index[c]] += 1
+    assert (first.tie_counts == tie_counts).all()
+    assert np.allclose(first.tie_rates, tie_counts / len(paths))
+
+    # split 은 공동 1위에게 1/k 씩, 합은 승자가 있는 시행 수
+    split = exhaustive(compiled, "split", answers)
+    assert np.allclose(split.counts, shares)
+    assert split.counts.sum() == pytest.approx(sum(1 for _, w, _ in paths if w is not None))
+
+    # random 은 항상 공동 1위 중 하나를 고른다
+    random_result = exhaustive(compiled, "random", answers)
+    assert random_result.counts.sum() == expected.sum()
+
+
+def test_sampled_split_counts_sum_to_trials():
+    compiled = compile_questions(manual.create_biblically_balanced_questions())
+    result = simulate_with_ties(compiled, 50000, np.random.default_rng(1), "split")
+    assert result.counts.sum() == pytest.approx(50000)
+
+
+@pytest.mark.parametrize("engine, policy", [("python", "split"), ("python", "random"),
+                                            ("parallel", "split"), ("bogus", "first"), ("numpy", "bogus")])
+def test_unsupported_engine_or_policy_raises(engine, policy):
+    with pytest.raises(ValueError):
+        manual.test_balanced_distribution(synthetic_questions(3, 3, 0), 10, engine=engine, tie_policy=policy)
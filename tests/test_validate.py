@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""질문 세트 검사 항목별로 문제가 있을 때만 잡히는지"""
+
+import copy
+
+import pytest
+
+from balance.validate import ERROR, WARNING, QuestionIndex, check_questions
+
+CHARACTERS = ["a", "b", "c"]
+
+
+def clean_questions():
+    """어떤 검사에도 걸리지 않는 세트: 선택지마다 합이 같고 캐릭터가 돌아가며 앞선다"""
+    options = [{"scores": {"a": 2, "b": 1}}, {"scores": {"b": 2, "c": 1}}, {"scores": {"c": 2, "a": 1}}]
+    return [{"id": qid, "options": copy.deepcopy(options)} for qid in (1, 2)]
+
+
+def codes(issues):
+    return {(i.severity, i.code) for i in issues}
+
+
+def test_clean_set_has_no_issues():
+    assert check_questions(clean_questions(), CHARACTERS) == []
+
+
+def mutate(edit):
+    questions = clean_questions()
+    edit(questions)
+    return questions
+
+
+@pytest.mark.parametrize("questions, expected", [
+    ({"id": 1}, (ERROR, "format")),
+    (mutate(lambda q: q[0].pop('options')), (ERROR, "format")),
+    (mutate(lambda q: q[0]['options'][1].pop('scores')), (ERROR, "format")),
+    (mutate(lambda q: q[1].update(id=1)), (ERROR, "duplicate-id")),
+    (mutate(lambda q: q[1].update(options=[])), (ERROR, "no-options")),
+    (mutate(lambda q: q[0]['options'][0]['scores'].update(a=1.5)), (ERROR, "score-type")),
+    (mutate(lambda q: q[0]['options'][0]['scores'].update(a=True)), (ERROR, "score-type")),
+    (mutate(lambda q: q[0]['options'][0]['scores'].update(a="2")), (ERROR, "score-type")),
+    (mutate(lambda q: q[0]['options'].append({"scores": {}})), (WARNING, "empty-scores")),
+    (mutate(lambda q: q[0]['options'].append({"scores": {"a": 2}})), (WARNING, "dominated-option")),
+])
+def test_each_check_fires(questions, expected):
+    issues = check_questions(questions, CHARACTERS)
+    assert expected in codes(issues)
+    if expected[0] == ERROR:  # 구조 오류가 있으면 밸런스 검사는 하지 않는다
+        assert all(i.severity == ERROR for i in issues)
+
+
+def test_unknown_and_missing_characters():
+    questions = mutate(lambda q: q[1]['options'][2].update(scores={"C": 2, "a": 1}))
+    issues = check_questions(questions, CHARACTERS + ["d"])
+    unknown = [i for i in issues if i.code == "unknown-character"]
+    assert len(unknown) == 1 and "C" in unknown[0].message and "c 아닌가요" in unknown[0].message
+    assert (unknown[0].question, unknown[0].option) == (2, 2)
+    missing = [i.message for i in issues if i.code == "missing-character"]
+    assert len(missing) == 1 and missing[0].startswith("d ")
+    assert codes(check_questions(questions)) == set()  # 캐릭터 목록이 없으면 ID 는 검사하지 않는다
+
+
+def test_never_wins_and_dominance_on_index():
+    # a 는 최소 2점, b 는 최대 1점 (선택지 합은 같아 지배는 아니다)
+    questions = [{"id": 1, "options": [{"scores": {"a": 3}}, {"scores": {"a": 2, "b": 1}}]}]
+    index = QuestionIndex(questions)
+    assert index.never_wins() == [("b", 1, "a", 2)]
+    assert index.dominated_options() == []
+    assert (WARNING, "never-wins") in codes(check_questions(questions, ["a", "b"]))
+
+    questions[0]['options'][1]['scores'] = {"a": 2}
+    index = QuestionIndex(questions)
+    assert index.dominated_options() == [(0, 0, 1)]
+    # 음수 점수가 새로 생기는 선택지는 지배하지 않는다
+    questions[0]['options'][0]['scores'] = {"a": 5, "b": -1}
+    assert QuestionIndex(questions).dominated_options() == []